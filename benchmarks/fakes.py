@@ -0,0 +1,369 @@
+"""
+In-process fakes for offline benchmarks.
+
+- FakeScmClient: stands in for ScmClient with tag, address, address_group,
+  commit and job endpoints. Every call sleeps for a configurable latency (plus
+  jitter) and fails with a configurable error rate, and the responses are the
+  SDK's own pydantic models, so the tools run their real code paths.
+- ScriptedChatModel: chat model that answers from a script instead of calling
+  Anthropic; the script decides which tool calls to emit for each prompt.
+
+install_fakes() puts both into the workflow's client pool and model cache, so
+get_scm_client() and the agent node pick them up without any other change.
+"""
+
+import asyncio
+import itertools
+import os
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from collections.abc import Callable
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from scm.exceptions import NameNotUniqueError, ObjectNotPresentError, ServerError
+from scm.models.objects import (
+    AddressGroupResponseModel,
+    AddressResponseModel,
+    TagResponseModel,
+)
+from scm.models.operations.candidate_push import CandidatePushResponseModel
+from scm.models.operations.jobs import JobStatusData, JobStatusResponse
+
+# SDK default page size for list()
+PAGE_SIZE = 2500
+
+
+class FakeBackend:
+    """
+    Shared latency, error injection and call accounting of a fake client.
+
+    Attributes:
+        latency: Seconds each API call takes
+        jitter: Extra random latency, up to this many seconds
+        error_rate: Probability (0..1) that a call fails with ServerError
+        calls: Number of calls per endpoint (e.g., "address.create")
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.01,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.calls: Counter = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def call(self, endpoint: str) -> None:
+        """Account for one API call, sleep for its latency and maybe fail."""
+        with self._lock:
+            self.calls[endpoint] += 1
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            failed = self._random.random() < self.error_rate
+        if delay:
+            time.sleep(delay)
+        if failed:
+            raise ServerError(
+                f"Injected failure in {endpoint}",
+                error_code="E003",
+                http_status_code=500,
+            )
+
+    def reset_calls(self) -> None:
+        """Clear the call counters."""
+        with self._lock:
+            self.calls.clear()
+
+
+class FakeService:
+    """
+    One object endpoint (e.g., client.address) backed by an in-memory store.
+
+    Objects are keyed by (folder, name); create() rejects duplicate names the
+    way SCM does.
+    """
+
+    def __init__(self, name: str, model: type, backend: FakeBackend) -> None:
+        self.name = name
+        self.model = model
+        self.backend = backend
+        self.objects: dict[tuple[Optional[str], str], Any] = {}
+        self._lock = threading.Lock()
+
+    def seed(self, folder: str, items: list[dict]) -> None:
+        """Store objects directly, without API calls or latency."""
+        with self._lock:
+            for data in items:
+                obj = self.model(id=uuid.uuid4(), folder=folder, **data)
+                self.objects[(folder, obj.name)] = obj
+
+    def create(self, data: dict) -> Any:
+        self.backend.call(f"{self.name}.create")
+        obj = self.model(id=uuid.uuid4(), **data)
+        with self._lock:
+            key = (obj.folder, obj.name)
+            if key in self.objects:
+                raise NameNotUniqueError(
+                    f"{obj.name} is not a unique name",
+                    error_code="E006",
+                    http_status_code=409,
+                )
+            self.objects[key] = obj
+        return obj
+
+    def fetch(self, name: str, folder: Optional[str] = None, **kwargs: Any) -> Any:
+        self.backend.call(f"{self.name}.fetch")
+        obj = self.objects.get((folder, name))
+        if obj is None:
+            raise ObjectNotPresentError(
+                f"{name} not found", error_code="E005", http_status_code=404
+            )
+        return obj
+
+    def get(self, object_id: Any) -> Any:
+        self.backend.call(f"{self.name}.get")
+        for obj in list(self.objects.values()):
+            if str(obj.id) == str(object_id):
+                return obj
+        raise ObjectNotPresentError(
+            f"{object_id} not found", error_code="E005", http_status_code=404
+        )
+
+    def list(self, folder: Optional[str] = None, **filters: Any) -> list:
+        # Like SCM, folders inherit "Shared" objects unless exact_match is set
+        folders = {folder} if filters.get("exact_match") else {folder, "Shared"}
+        with self._lock:
+            objects = [obj for key, obj in self.objects.items() if key[0] in folders]
+        # One request per page, like the SDK's paginated list()
+        for _ in range(max(-(-len(objects) // PAGE_SIZE), 1)):
+            self.backend.call(f"{self.name}.list")
+        return objects
+
+    def update(self, obj: Any) -> Any:
+        self.backend.call(f"{self.name}.update")
+        with self._lock:
+            for key, stored in self.objects.items():
+                if str(stored.id) == str(obj.id):
+                    # PUT replaces the stored object
+                    updated = self.model(**obj.model_dump(exclude_none=True))
+                    self.objects[key] = updated
+                    return updated
+        raise ObjectNotPresentError(
+            f"{obj.id} not found", error_code="E005", http_status_code=404
+        )
+
+    def delete(self, object_id: Any) -> None:
+        self.backend.call(f"{self.name}.delete")
+        with self._lock:
+            for key, stored in list(self.objects.items()):
+                if str(stored.id) == str(object_id):
+                    del self.objects[key]
+                    return
+        raise ObjectNotPresentError(
+            f"{object_id} not found", error_code="E005", http_status_code=404
+        )
+
+
+class FakeScmClient:
+    """
+    In-process stand-in for ScmClient.
+
+    Commits create a job that finishes ``commit_duration`` seconds later;
+    ``commit(sync=True)`` polls get_job_status() every ``poll_interval`` seconds
+    like the SDK's wait_for_job().
+
+    Attributes:
+        backend: Latency, error injection and call counters
+        tag, address, address_group: Object endpoints
+        commit_duration: Seconds a commit job runs
+        poll_interval: Seconds between job status polls of a sync commit
+    """
+
+    def __init__(
+        self,
+        backend: Optional[FakeBackend] = None,
+        commit_duration: float = 1.0,
+        poll_interval: float = 0.1,
+    ) -> None:
+        self.backend = backend or FakeBackend()
+        self.tag = FakeService("tag", TagResponseModel, self.backend)
+        self.address = FakeService("address", AddressResponseModel, self.backend)
+        self.address_group = FakeService(
+            "address_group", AddressGroupResponseModel, self.backend
+        )
+        self.commit_duration = commit_duration
+        self.poll_interval = poll_interval
+        # Bearer-token mode: nothing for the token refresher to do
+        self.oauth_client = None
+        self._jobs: dict[str, float] = {}
+        self._job_ids = itertools.count(1)
+
+    def commit(
+        self,
+        folders: list[str],
+        description: str,
+        admin: Optional[list[str]] = None,
+        sync: bool = False,
+        timeout: int = 300,
+    ) -> CandidatePushResponseModel:
+        self.backend.call("commit")
+        job_id = str(next(self._job_ids))
+        self._jobs[job_id] = time.monotonic() + self.commit_duration
+        if sync:
+            self.wait_for_job(job_id, timeout=timeout, poll_interval=self.poll_interval)
+        return CandidatePushResponseModel(
+            success=True, job_id=job_id, message="CommitAndPush job enqueued"
+        )
+
+    def wait_for_job(
+        self, job_id: str, timeout: float = 300, poll_interval: float = 10
+    ) -> JobStatusResponse:
+        started = time.monotonic()
+        while True:
+            if time.monotonic() - started > timeout:
+                raise TimeoutError(
+                    f"Job {job_id} did not complete within {timeout} seconds"
+                )
+            status = self.get_job_status(job_id)
+            if status.data[0].status_str == "FIN":
+                return status
+            time.sleep(poll_interval)
+
+    def get_job_status(self, job_id: str) -> JobStatusResponse:
+        self.backend.call("job.status")
+        finishes_at = self._jobs.get(job_id)
+        if finishes_at is None:
+            raise ObjectNotPresentError(
+                f"Job {job_id} not found", error_code="E005", http_status_code=404
+            )
+        done = time.monotonic() >= finishes_at
+        now = datetime.now(timezone.utc)
+        data = JobStatusData(
+            details="",
+            id=job_id,
+            insert_ts=now,
+            job_result="2" if done else "0",
+            job_status="2" if done else "1",
+            job_type="53",
+            last_update=now,
+            owner="benchmark",
+            percent="100" if done else "50",
+            result_i="2" if done else "0",
+            result_str="OK" if done else "PEND",
+            start_ts=now,
+            status_i="2" if done else "1",
+            status_str="FIN" if done else "ACT",
+            type_i="53",
+            type_str="CommitAndPush",
+            uname="benchmark",
+        )
+        return JobStatusResponse(data=[data])
+
+
+# A script maps the latest conversation to the model's next message
+Script = Callable[[list[BaseMessage]], AIMessage]
+
+
+class ScriptedChatModel(BaseChatModel):
+    """
+    Chat model that answers from a script instead of calling an API.
+
+    Attributes:
+        script: Function from the conversation to the next AI message
+        latency: Seconds each call takes (simulated model time)
+    """
+
+    script: Script
+    latency: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "ScriptedChatModel":
+        return self
+
+    def _generate(
+        self, messages: list[BaseMessage], stop: Any = None, **kwargs: Any
+    ) -> ChatResult:
+        if self.latency:
+            time.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=self.script(messages))])
+
+    async def _agenerate(
+        self, messages: list[BaseMessage], stop: Any = None, **kwargs: Any
+    ) -> ChatResult:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=self.script(messages))])
+
+
+def tool_script(plan: Callable[[str], list[dict]]) -> Script:
+    """
+    Build a script that runs the planned tool calls, then answers.
+
+    Args:
+        plan: Function from the user prompt to the tool calls to emit (name and
+            args); an empty list answers directly
+
+    Returns:
+        Script: On a new prompt, emits the planned tool calls; after the tool
+        results, answers with the first line of each result
+    """
+    call_ids = itertools.count(1)
+
+    def script(messages: list[BaseMessage]) -> AIMessage:
+        last = messages[-1]
+        if isinstance(last, HumanMessage):
+            calls = plan(str(last.content))
+            if calls:
+                return AIMessage(
+                    content="",
+                    tool_calls=[
+                        {**call, "id": f"call_{next(call_ids)}"} for call in calls
+                    ],
+                )
+            return AIMessage(content=f"Acknowledged: {last.content}")
+        results = []
+        for message in reversed(messages):
+            if not isinstance(message, ToolMessage):
+                break
+            results.append(str(message.content).splitlines()[0])
+        return AIMessage(content="\n".join(reversed(results)) or "Done.")
+
+    return script
+
+
+def install_fakes(client: FakeScmClient, model: ScriptedChatModel) -> None:
+    """
+    Route the workflow's SCM client and chat models to the fakes.
+
+    The fake client is placed in the client pool under the current credentials
+    and the scripted model in the chat model caches (agent, summaries).
+    """
+    import src.core.client as client_pool
+    import src.main as workflow
+
+    key = (
+        os.getenv("SCM_CLIENT_ID"),
+        os.getenv("SCM_TSG_ID"),
+        client_pool._secret_hash(os.getenv("SCM_CLIENT_SECRET")),
+    )
+    with client_pool._clients_lock:
+        client_pool._clients[key] = client
+
+    tool_names = tuple(tool.name for tool in workflow.tools)
+    with workflow._models_lock:
+        workflow._chat_models[workflow.AGENT_MODEL] = model
+        workflow._bound_models[(workflow.AGENT_MODEL, tool_names)] = model
@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""
+Offline benchmarks for the SCM NLP workflow.
+
+Runs the compiled workflow graph end to end against an in-process fake SCM
+backend and a scripted chat model (see benchmarks/fakes.py), so no SCM or
+Anthropic credentials are needed. Suites:
+
+- batch: one turn that creates N tags, addresses or address groups through the
+  batch tools (N = --sizes, default 10, 100, 1000, 10000)
+- session: a long conversation on one thread, mixing fast-path listings and
+  model-routed tool calls; reports per-turn latency and its drift
+- commit: a sync commit_changes call, polling the job until it finishes
+
+Results are written as JSON (with the git commit) for comparison across
+commits; --compare prints the wall-time change against an earlier file.
+
+Usage:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --suite batch --sizes 10 100 --latency 0.05
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/abc1234.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from langchain_core.messages import HumanMessage, ToolMessage  # noqa: E402
+
+from benchmarks.fakes import (  # noqa: E402
+    FakeBackend,
+    FakeScmClient,
+    ScriptedChatModel,
+    install_fakes,
+    tool_script,
+)
+
+SUITES = ("batch", "session", "commit")
+BATCH_KINDS = ("tag", "address", "address_group")
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+
+# Address groups reference members from a seeded pool of this many addresses
+GROUP_MEMBER_POOL = 50
+
+
+def _git_commit() -> Optional[str]:
+    """Return the short hash of HEAD (with "-dirty" for local changes)."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{commit}-dirty" if dirty else commit
+
+
+def _batch_call(kind: str, folder: str, n: int) -> dict:
+    """Build the batch tool call creating ``n`` objects of ``kind``."""
+    if kind == "tag":
+        items = [{"name": f"bench_tag_{i:05d}", "color": "Blue"} for i in range(n)]
+        return {
+            "name": "tag_create_batch",
+            "args": {"request": {"folder": folder, "tags": items}},
+        }
+    if kind == "address":
+        items = [
+            {
+                "name": f"bench_host_{i:05d}",
+                "ip_netmask": f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}/32",
+            }
+            for i in range(n)
+        ]
+        return {
+            "name": "address_create_batch",
+            "args": {"request": {"folder": folder, "addresses": items}},
+        }
+    items = [
+        {
+            "name": f"bench_group_{i:05d}",
+            "members": [
+                f"bench_member_{(i + j) % GROUP_MEMBER_POOL:02d}" for j in range(3)
+            ],
+        }
+        for i in range(n)
+    ]
+    return {
+        "name": "address_group_create_batch",
+        "args": {"request": {"folder": folder, "groups": items}},
+    }
+
+
+def _plan(prompt: str) -> list[dict]:
+    """
+    Tool calls for the benchmark prompts.
+
+    Prompts are "batch <kind> <folder> <n>", "tag <folder> <name>",
+    "commit <folder>" or anything else (answered without tools).
+    """
+    words = prompt.split()
+    if words[:1] == ["batch"]:
+        kind, folder, n = words[1], words[2], int(words[3])
+        return [_batch_call(kind, folder, n)]
+    if words[:1] == ["tag"]:
+        return [
+            {
+                "name": "tag_create",
+                "args": {"name": words[2], "folder": words[1], "color": "Red"},
+            }
+        ]
+    if words[:1] == ["commit"]:
+        return [
+            {
+                "name": "commit_changes",
+                "args": {"folders": words[1], "description": "bench", "sync": True},
+            }
+        ]
+    return []
+
+
+class Runner:
+    """Runs turns through the compiled graph with the fakes installed."""
+
+    def __init__(self, client: FakeScmClient, use_async: bool = False) -> None:
+        from src.main import get_compiled_app
+
+        self.client = client
+        self.app = get_compiled_app()
+        self.use_async = use_async
+
+    def turn(self, prompt: str, thread_id: str) -> tuple[dict, float]:
+        """Run one turn and return (final state, wall time)."""
+        inputs = {"messages": [HumanMessage(content=prompt)]}
+        config = {
+            "configurable": {"thread_id": thread_id},
+            "recursion_limit": 50,
+        }
+        started = time.perf_counter()
+        if self.use_async:
+            from src.core.aio import run_coroutine
+            from src.main import astream_turn
+
+            result = run_coroutine(astream_turn(self.app, inputs, config))
+        else:
+            result = self.app.invoke(inputs, config=config)
+        return result, time.perf_counter() - started
+
+
+def _turn_tool_messages(messages: list) -> list[ToolMessage]:
+    """Tool messages of the latest turn."""
+    found = []
+    for message in reversed(messages):
+        if isinstance(message, HumanMessage):
+            break
+        if isinstance(message, ToolMessage):
+            found.append(message)
+    return found
+
+
+def bench_batch(runner: Runner, sizes: list[int]) -> list[dict]:
+    """Batch creates of every kind at every size."""
+    results = []
+    for kind in BATCH_KINDS:
+        for n in sizes:
+            folder = f"bench-{kind}-{n}"
+            if kind == "address_group":
+                runner.client.address.seed(
+                    folder,
+                    [
+                        {
+                            "name": f"bench_member_{i:02d}",
+                            "ip_netmask": f"10.255.0.{i}/32",
+                        }
+                        for i in range(GROUP_MEMBER_POOL)
+                    ],
+                )
+            runner.client.backend.reset_calls()
+            result, wall = runner.turn(
+                f"batch {kind} {folder} {n}", f"batch-{kind}-{n}"
+            )
+
+            artifact = (
+                next(
+                    (m.artifact for m in _turn_tool_messages(result["messages"])), None
+                )
+                or {}
+            )
+            results.append(
+                {
+                    "suite": "batch",
+                    "name": f"{kind}_create_batch[{n}]",
+                    "params": {"kind": kind, "n": n},
+                    "wall_time": round(wall, 4),
+                    "metrics": {
+                        "items_per_second": round(n / wall, 1) if wall else None,
+                        **artifact.get("counts", {}),
+                    },
+                    "api_calls": dict(runner.client.backend.calls),
+                }
+            )
+            _report(results[-1])
+    return results
+
+
+def bench_session(runner: Runner, turns: int) -> list[dict]:
+    """One long conversation: fast-path listings and model-routed tool calls."""
+    folder = "bench-session"
+    runner.client.tag.seed(folder, [{"name": "seed", "color": "Red"}])
+    runner.client.backend.reset_calls()
+
+    timings = []
+    started = time.perf_counter()
+    result: dict[str, Any] = {}
+    for i in range(turns):
+        if i % 3 == 2:
+            prompt = f"List all tags in {folder}"
+        else:
+            prompt = f"tag {folder} session_tag_{i:05d}"
+        result, wall = runner.turn(prompt, "bench-session")
+        timings.append(wall)
+    wall = time.perf_counter() - started
+
+    decile = max(turns // 10, 1)
+    metrics = {
+        "turns": turns,
+        "p50": round(statistics.median(timings), 4),
+        "p95": round(sorted(timings)[max(int(0.95 * turns) - 1, 0)], 4),
+        "max": round(max(timings), 4),
+        "first_decile_avg": round(statistics.mean(timings[:decile]), 4),
+        "last_decile_avg": round(statistics.mean(timings[-decile:]), 4),
+        "messages_in_state": len(result.get("messages", [])),
+    }
+    row = {
+        "suite": "session",
+        "name": f"session[{turns}]",
+        "params": {"turns": turns},
+        "wall_time": round(wall, 4),
+        "metrics": metrics,
+        "api_calls": dict(runner.client.backend.calls),
+    }
+    _report(row)
+    return [row]
+
+
+def bench_commit(runner: Runner, durations: list[float]) -> list[dict]:
+    """Sync commits of jobs running for each duration."""
+    results = []
+    for duration in durations:
+        runner.client.commit_duration = duration
+        runner.client.backend.reset_calls()
+        result, wall = runner.turn("commit bench-commit", f"commit-{duration}")
+        outputs = _turn_tool_messages(result["messages"])
+        row = {
+            "suite": "commit",
+            "name": f"commit_sync[{duration}s]",
+            "params": {
+                "job_duration": duration,
+                "poll_interval": runner.client.poll_interval,
+            },
+            "wall_time": round(wall, 4),
+            "metrics": {
+                "succeeded": bool(outputs)
+                and not str(outputs[0].content).startswith("❌"),
+                "overhead": round(wall - duration, 4),
+                "status_polls": runner.client.backend.calls["job.status"],
+            },
+            "api_calls": dict(runner.client.backend.calls),
+        }
+        results.append(row)
+        _report(row)
+    return results
+
+
+def _report(row: dict) -> None:
+    """Print one result line."""
+    metrics = ", ".join(f"{k}={v}" for k, v in row["metrics"].items())
+    print(f"  {row['name']:<36} {row['wall_time']:>9.3f}s  {metrics}")
+
+
+def compare(results: list[dict], baseline_path: Path) -> None:
+    """Print the wall-time change of every result present in the baseline."""
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    previous = {row["name"]: row for row in baseline["results"]}
+    print(f"\nCompared with {baseline_path} ({baseline['meta'].get('commit')}):")
+    for row in results:
+        old = previous.get(row["name"])
+        if old is None or not old["wall_time"]:
+            continue
+        change = (row["wall_time"] - old["wall_time"]) / old["wall_time"]
+        print(
+            f"  {row['name']:<36} {old['wall_time']:>9.3f}s → "
+            f"{row['wall_time']:>9.3f}s  ({change:+.1%})"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--suite",
+        choices=SUITES,
+        action="append",
+        help="Suite to run (repeatable, default: all)",
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_SIZES),
+        help="Batch sizes (default: 10 100 1000 10000)",
+    )
+    parser.add_argument(
+        "--turns", type=int, default=200, help="Session length in turns"
+    )
+    parser.add_argument(
+        "--commit-durations",
+        type=float,
+        nargs="+",
+        default=[0.5, 2.0],
+        help="Commit job durations in seconds",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=0.1,
+        help="Seconds between job status polls",
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.01, help="Seconds per SCM API call"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="Extra random latency per call"
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="Probability that an SCM API call fails",
+    )
+    parser.add_argument(
+        "--model-latency",
+        type=float,
+        default=0.0,
+        help="Seconds per scripted model call",
+    )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Run turns with astream on the shared event loop",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument(
+        "--out",
+        type=Path,
+        help="Results file (default: benchmarks/results/<commit>.json)",
+    )
+    parser.add_argument(
+        "--compare", type=Path, help="Earlier results file to compare with"
+    )
+    args = parser.parse_args()
+
+    # Batch journals of this run must not resume batches of an earlier run
+    os.environ["SCM_JOURNAL_DIR"] = tempfile.mkdtemp(prefix="scm-bench-journals-")
+
+    commit = _git_commit()
+    client = FakeScmClient(
+        FakeBackend(args.latency, args.jitter, args.error_rate, args.seed),
+        poll_interval=args.poll_interval,
+    )
+    install_fakes(
+        client,
+        ScriptedChatModel(script=tool_script(_plan), latency=args.model_latency),
+    )
+    runner = Runner(client, use_async=args.use_async)
+
+    suites = args.suite or list(SUITES)
+    results = []
+    for suite in suites:
+        print(f"⏱️  {suite}")
+        if suite == "batch":
+            results += bench_batch(runner, args.sizes)
+        elif suite == "session":
+            results += bench_session(runner, args.turns)
+        else:
+            results += bench_commit(runner, args.commit_durations)
+
+    out = (
+        args.out
+        or PROJECT_ROOT / "benchmarks" / "results" / f"{commit or 'local'}.json"
+    )
+    out.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": {
+                key: value
+                for key, value in vars(args).items()
+                if key not in ("out", "compare")
+            },
+        },
+        "results": results,
+    }
+    out.write_text(json.dumps(payload, indent=2, default=str) + "\n", encoding="utf-8")
+    print(f"\n✅ Wrote {len(results)} results to {out}")
+
+    if args.compare:
+        compare(results, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark scm-agent CLI startup time.
+
+Runs `python -m src.cli --version` several times in fresh interpreters and
+fails if the median wall time exceeds the threshold, or if the agent stack
+(LangGraph, LangChain, the SCM SDK) is imported just to print the version.
+
+Usage:
+    python scripts/bench_cli_startup.py
+    python scripts/bench_cli_startup.py --runs 10 --threshold 0.5
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Modules that must not be imported by light commands
+HEAVY_MODULES = [
+    "src.main",
+    "langgraph",
+    "langchain_core",
+    "langchain_anthropic",
+    "langsmith",
+    "scm",
+]
+
+IMPORT_CHECK = f"""
+import sys
+from src.cli.app import app
+loaded = [m for m in {HEAVY_MODULES!r} if m in sys.modules]
+print(",".join(loaded))
+"""
+
+
+def time_version(runs: int) -> list[float]:
+    """Time `--version` in fresh interpreters."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", "src.cli", "--version"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            check=True,
+        )
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def heavy_imports() -> list[str]:
+    """Return heavy modules imported by loading the CLI app."""
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_CHECK],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return [m for m in result.stdout.strip().split(",") if m]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark scm-agent startup time")
+    parser.add_argument(
+        "--runs", type=int, default=5, help="Number of runs (default: 5)"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.75,
+        help="Maximum median seconds for --version (default: 0.75)",
+    )
+    args = parser.parse_args()
+
+    timings = time_version(args.runs)
+    median = statistics.median(timings)
+    print(
+        f"scm-agent --version: median {median:.3f}s, "
+        f"min {min(timings):.3f}s, max {max(timings):.3f}s ({args.runs} runs)"
+    )
+
+    failed = False
+
+    loaded = heavy_imports()
+    if loaded:
+        print(f"❌ CLI app imports heavy modules at startup: {', '.join(loaded)}")
+        failed = True
+
+    if median > args.threshold:
+        print(f"❌ Startup regressed: {median:.3f}s > {args.threshold:.3f}s threshold")
+        failed = True
+
+    if not failed:
+        print("✅ Startup time within threshold")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,6 +14,16 @@ Features:
 __version__ = "0.1.0"
 __author__ = "Calvin Remsburg"
 
-from src.main import get_compiled_app, main
-
 __all__ = ["get_compiled_app", "main"]
+
+
+def __getattr__(name: str):
+    """Import the workflow on first use so light entry points (e.g. --version) stay fast."""
+    if name in __all__:
+        import importlib
+
+        workflow = importlib.import_module("src.main")
+        for export in __all__:
+            globals()[export] = getattr(workflow, export)
+        return globals()[name]
+    raise AttributeError(f"module 'src' has no attribute '{name}'")
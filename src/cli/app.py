@@ -15,11 +15,13 @@ console = Console()
 
 # Import subcommands
 from src.cli.commands.run import run_workflow  # noqa: E402
+from src.cli.commands.serve import serve_api  # noqa: E402
 from src.cli.commands.studio import launch_studio  # noqa: E402
 from src.cli.commands.tools import list_tools  # noqa: E402
 
 # Register subcommands
 app.command(name="run")(run_workflow)
+app.command(name="serve")(serve_api)
 app.command(name="studio")(launch_studio)
 app.command(name="tools")(list_tools)
 
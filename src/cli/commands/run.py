@@ -2,17 +2,19 @@
 Run command - Execute the LangGraph workflow.
 """
 
+import time
+from collections.abc import Callable
 from pathlib import Path
 from typing import Optional
 
 import typer
-from langchain_core.messages import HumanMessage
-from langsmith import uuid7
 from rich.console import Console
 from rich.panel import Panel
 
 from src.core.config import validate_environment
-from src.main import get_compiled_app
+
+# The workflow stack (LangGraph, LangChain, SCM SDK) is imported inside the
+# functions that need it so other CLI commands start quickly.
 
 console = Console()
 
@@ -40,6 +42,22 @@ def run_workflow(
         dir_okay=False,
         readable=True,
     ),
+    jsonl: Optional[Path] = typer.Option(
+        None,
+        "--jsonl",
+        help="Execute JSONL request records (prompt, optional thread_id and options)",
+        exists=True,
+        file_okay=True,
+        dir_okay=False,
+        readable=True,
+    ),
+    out: Optional[Path] = typer.Option(
+        None,
+        "--out",
+        "-o",
+        help="Write one JSONL result per --jsonl record as it finishes",
+        dir_okay=False,
+    ),
     thread_id: Optional[str] = typer.Option(
         None,
         "--thread-id",
@@ -54,6 +72,70 @@ def run_workflow(
         min=1,
         max=200,
     ),
+    prompt_cache: bool = typer.Option(
+        False,
+        "--prompt-cache",
+        help="Cache the system prompt and tool schemas (Anthropic prompt caching)",
+    ),
+    history_budget: Optional[int] = typer.Option(
+        None,
+        "--history-budget",
+        help="Token budget for conversation history before older turns are summarized (0 disables)",
+        min=0,
+    ),
+    details: bool = typer.Option(
+        False,
+        "--details",
+        "-d",
+        help="Print full per-object results of batch tools",
+    ),
+    fast_path: bool = typer.Option(
+        True,
+        "--fast-path/--no-fast-path",
+        help="Answer simple list/show/job-status requests without calling the model",
+    ),
+    checkpoint_db: Optional[Path] = typer.Option(
+        None,
+        "--checkpoint-db",
+        help="SQLite file for persistent conversation checkpoints (resume with --thread-id)",
+        dir_okay=False,
+    ),
+    parallel: Optional[int] = typer.Option(
+        None,
+        "--parallel",
+        "-P",
+        help="Run file instructions or JSONL records concurrently, at most N at a time",
+        min=1,
+    ),
+    use_async: bool = typer.Option(
+        False,
+        "--async",
+        help="Run turns with astream on a shared event loop (JSONL records run as asyncio tasks)",
+    ),
+    stream: bool = typer.Option(
+        True,
+        "--stream/--no-stream",
+        help="Print model tokens and tool calls as they happen instead of a spinner",
+    ),
+    profile: bool = typer.Option(
+        False,
+        "--profile",
+        help="Time graph nodes, model calls, tools and SCM requests; print a report",
+    ),
+    profile_out: Optional[Path] = typer.Option(
+        None,
+        "--profile-out",
+        help="Write the raw profile spans to a JSONL file (implies --profile)",
+        dir_okay=False,
+    ),
+    resume: bool = typer.Option(
+        False,
+        "--resume",
+        help=(
+            "Finish this thread's interrupted turn first; batches continue from "
+            "their journal (needs --thread-id and --checkpoint-db)"
+        ),
+    ),
 ):
     """
     Execute the SCM NLP workflow.
@@ -64,6 +146,7 @@ def run_workflow(
     • Interactive mode (-i): Conversational interface
     • Prompt mode (-p): Single command execution
     • File mode (-f): Batch execution from file
+    • JSONL mode (--jsonl): Request records in, result records out
 
     Examples:
 
@@ -78,18 +161,55 @@ def run_workflow(
     \b
         # File input
         scm-agent run --file tasks.txt
+
+    \b
+        # Prompt caching with per-turn token report
+        scm-agent run --interactive --prompt-cache
+
+    \b
+        # Independent lines in parallel (@after N: and @sequential ... @end
+        # control ordering)
+        scm-agent run --file reports.txt --parallel 4
+
+    \b
+        # JSONL requests, 8 at a time, results streamed as they finish
+        scm-agent run --jsonl requests.jsonl --out results.jsonl --parallel 8
+
+    \b
+        # Hundreds of concurrent JSONL sessions on one event loop
+        scm-agent run --jsonl requests.jsonl --out results.jsonl --async -P 200
+
+    \b
+        # Where did the time go? Per-turn breakdown plus p50/p95/max tables
+        scm-agent run -f tasks.txt --profile --profile-out spans.jsonl
+
+    \b
+        # Persistent session, resumable after a restart
+        scm-agent run -i --checkpoint-db ~/.scm-agent/checkpoints.db -t my-session
+
+    \b
+        # Finish a batch interrupted by Ctrl+C or a crash, then keep chatting
+        scm-agent run --resume -i --checkpoint-db ~/.scm-agent/checkpoints.db -t my-session
     """
     # Validate that exactly one mode is selected
-    modes = sum([interactive, prompt is not None, file is not None])
-    if modes == 0:
+    modes = sum([interactive, prompt is not None, file is not None, jsonl is not None])
+    if modes == 0 and not resume:
         console.print(
-            "[red]Error:[/red] Must specify one execution mode: --interactive, --prompt, or --file"
+            "[red]Error:[/red] Must specify one execution mode: --interactive, --prompt, --file, or --jsonl"
         )
         console.print("\nRun [cyan]scm-agent run --help[/cyan] for more information")
         raise typer.Exit(code=1)
     elif modes > 1:
         console.print("[red]Error:[/red] Only one execution mode can be used at a time")
         raise typer.Exit(code=1)
+    if (jsonl is None) != (out is None):
+        console.print("[red]Error:[/red] --jsonl and --out must be used together")
+        raise typer.Exit(code=1)
+    if resume and (thread_id is None or jsonl is not None):
+        console.print(
+            "[red]Error:[/red] --resume needs --thread-id and cannot be used with --jsonl"
+        )
+        raise typer.Exit(code=1)
 
     # Validate environment
     try:
@@ -103,28 +223,304 @@ def run_workflow(
 
     # Get compiled app
     try:
-        app = get_compiled_app()
+        from src.main import get_compiled_app, get_fast_path_intent
+
+        app = get_compiled_app(str(checkpoint_db) if checkpoint_db else None)
+        if use_async and not jsonl:
+            app = _AsyncGraph(app)
     except Exception as e:
         console.print(f"[red]Failed to initialize workflow:[/red] {e}")
         raise typer.Exit(code=1)
 
+    config = _build_config(
+        thread_id, recursion_limit, prompt_cache, history_budget, fast_path
+    )
+    recorder = None
+    if profile or profile_out:
+        from src.core.profiling import SpanRecorder
+
+        recorder = SpanRecorder()
+        config["callbacks"] = [recorder]
+    # Concurrent turns interleave their spans, so they only get the session report
+    turn_profile = recorder is not None and not (file and parallel)
+    profiled = 0
+    stats = {
+        "fast_path_turns": 0,
+        "fast_path_time": 0.0,
+        "agent_turns": 0,
+        "agent_time": 0.0,
+        "first_output": [],
+    }
+
+    def report(
+        result: dict, elapsed: float, first_output: Optional[float] = None
+    ) -> None:
+        """Record turn timing and print optional extras after the reply."""
+        nonlocal profiled
+        if first_output is not None:
+            stats["first_output"].append(first_output)
+        if get_fast_path_intent(result["messages"]):
+            stats["fast_path_turns"] += 1
+            stats["fast_path_time"] += elapsed
+            console.print(f"[dim]⚡ Fast path ({elapsed:.2f}s, no model call)[/dim]")
+        else:
+            stats["agent_turns"] += 1
+            stats["agent_time"] += elapsed
+        if details:
+            _print_details(result)
+        if prompt_cache:
+            _print_usage(result)
+        if turn_profile:
+            _print_turn_profile(recorder.spans[profiled:], elapsed)
+            profiled = len(recorder.spans)
+
     # Execute based on mode
     try:
+        if resume:
+            _resume_interrupted(app, config, report)
         if interactive:
-            _run_interactive(app, thread_id, recursion_limit)
+            _run_interactive(app, config, report, stream)
         elif prompt:
-            _run_prompt(app, prompt, thread_id, recursion_limit)
+            _run_prompt(app, prompt, config, report, stream)
         elif file:
-            _run_file(app, file, thread_id, recursion_limit)
+            _run_file(app, file, config, report, parallel, stream)
+        elif jsonl:
+            _run_jsonl(app, jsonl, out, config, parallel or 4, use_async)
     except KeyboardInterrupt:
+        _print_session_stats(stats)
+        if recorder is not None:
+            _print_profile(recorder.spans, profile_out)
         console.print("\n\n[yellow]👋 Interrupted by user. Goodbye![/yellow]")
         raise typer.Exit(code=0)
     except Exception as e:
         console.print(f"\n[red]Error:[/red] {type(e).__name__}: {e}")
         raise typer.Exit(code=1)
 
+    _print_session_stats(stats)
+    if recorder is not None:
+        _print_profile(recorder.spans, profile_out)
+
+
+def _build_config(
+    thread_id: Optional[str],
+    recursion_limit: int,
+    prompt_cache: bool,
+    history_budget: Optional[int] = None,
+    fast_path: bool = True,
+) -> dict:
+    """Build the graph run config for a session."""
+    from langsmith import uuid7
+
+    return {
+        "configurable": {
+            "thread_id": thread_id or str(uuid7()),
+            "prompt_caching": prompt_cache,
+            "history_token_budget": history_budget,
+            "fast_path": fast_path,
+        },
+        "recursion_limit": recursion_limit,
+    }
+
+
+class _AsyncGraph:
+    """Compiled app whose invoke() runs the turn with astream on the shared loop."""
+
+    def __init__(self, app):
+        self.app = app
+        self.checkpointer = app.checkpointer
+
+    def invoke(self, inputs: dict, config: dict) -> dict:
+        from src.core.aio import run_coroutine
+        from src.main import astream_turn
+
+        return run_coroutine(astream_turn(self.app, inputs, config))
 
-def _run_interactive(app, thread_id: Optional[str], recursion_limit: int):
+    def stream(self, inputs: dict, config: dict, stream_mode):
+        from src.core.aio import iterate_async
+
+        return iterate_async(
+            self.app.astream(inputs, config=config, stream_mode=stream_mode)
+        )
+
+
+def _invoke(app, text: str, config: dict) -> dict:
+    """Run one user turn through the graph."""
+    from langchain_core.messages import HumanMessage
+
+    return app.invoke({"messages": [HumanMessage(content=text)]}, config=config)
+
+
+def _turn(
+    app,
+    text: str,
+    config: dict,
+    stream: bool,
+    label: str = "[bold cyan]Assistant:[/bold cyan]",
+    status: str = "[bold cyan]🤖 Processing your request...",
+) -> tuple[dict, float, Optional[float]]:
+    """
+    Run one user turn and print the reply.
+
+    With streaming, tokens and tool calls are printed as they happen; otherwise
+    a spinner is shown until the reply is complete.
+
+    Returns:
+        (final graph state, elapsed seconds, seconds to first output or None)
+    """
+    started = time.perf_counter()
+    if stream:
+        from src.cli.streaming import stream_turn
+
+        result, first_output = stream_turn(app, text, config, console, label, status)
+        return result, time.perf_counter() - started, first_output
+
+    with console.status(status, spinner="earth"):
+        result = _invoke(app, text, config)
+    console.print(f"{label} {result['messages'][-1].content}")
+    return result, time.perf_counter() - started, None
+
+
+def _resume_interrupted(app, config: dict, report: Callable[..., None]) -> None:
+    """
+    Finish the thread's interrupted turn, if it has one.
+
+    A turn interrupted during tool calls is checkpointed after the model
+    requested them, so resuming re-runs those tool calls with the same
+    arguments; batch tools then pick up their journal and re-issue only the
+    outstanding items.
+    """
+    graph = getattr(app, "app", app)
+    state = graph.get_state(config)
+    if not state.next:
+        console.print("[dim]Nothing to resume in this thread[/dim]\n")
+        return
+
+    console.print(
+        f"[bold cyan]Resuming interrupted turn[/bold cyan] "
+        f"[dim]({', '.join(state.next)})[/dim]\n"
+    )
+    started = time.perf_counter()
+    with console.status("[bold cyan]🤖 Resuming...", spinner="earth"):
+        result = app.invoke(None, config=config)
+    console.print(f"[bold cyan]Assistant:[/bold cyan] {result['messages'][-1].content}")
+    report(result, time.perf_counter() - started)
+    console.print()
+
+
+def _print_session_stats(stats: dict) -> None:
+    """Print time to first output, fast-path hit rate and latency saved."""
+    lines = []
+    first_output = stats["first_output"]
+    if first_output:
+        lines.append(
+            f"Time to first output: {sum(first_output) / len(first_output):.2f}s avg, "
+            f"{max(first_output):.2f}s max over {len(first_output)} turns"
+        )
+
+    turns = stats["fast_path_turns"] + stats["agent_turns"]
+    hits = stats["fast_path_turns"]
+    if hits:
+        line = f"Fast path: {hits}/{turns} turns ({hits / turns:.0%})"
+        if stats["agent_turns"]:
+            # Estimate savings against the average model-routed turn of this session
+            avg_agent = stats["agent_time"] / stats["agent_turns"]
+            avg_fast = stats["fast_path_time"] / hits
+            line += f", ~{max(avg_agent - avg_fast, 0) * hits:.1f}s saved"
+        lines.append(line)
+
+    if lines:
+        console.print("\n[dim]" + "\n".join(lines) + "[/dim]")
+
+
+def _print_turn_profile(spans: list, elapsed: float) -> None:
+    """Print where the time of the latest turn went."""
+    from rich.table import Table
+
+    from src.core.profiling import summarize_spans
+
+    table = Table(
+        title=f"⏱  Turn profile ({elapsed:.2f}s)",
+        title_justify="left",
+        title_style="dim",
+        show_header=False,
+        box=None,
+        padding=(0, 1),
+        style="dim",
+    )
+    table.add_column("Kind", style="dim")
+    table.add_column("Name", style="dim cyan")
+    table.add_column("Count", justify="right", style="dim")
+    table.add_column("Total", justify="right", style="dim")
+    for row in summarize_spans(spans):
+        table.add_row(
+            row["kind"], row["name"], f"{row['count']}×", f"{row['total']:.2f}s"
+        )
+    console.print(table)
+
+
+def _print_profile(spans: list, out_path: Optional[Path] = None) -> None:
+    """Print p50/p95/max latency per node, model, tool and SCM request."""
+    from rich.table import Table
+
+    from src.core.profiling import summarize_spans, write_spans
+
+    rows = summarize_spans(spans)
+    if rows:
+        table = Table(
+            title="Latency profile",
+            show_header=True,
+            header_style="bold magenta",
+            border_style="dim",
+        )
+        table.add_column("Kind")
+        table.add_column("Name", style="cyan")
+        for column in ("Count", "Errors", "p50", "p95", "Max", "Total"):
+            table.add_column(column, justify="right")
+        for row in rows:
+            table.add_row(
+                row["kind"],
+                row["name"],
+                str(row["count"]),
+                str(row["errors"]) if row["errors"] else "",
+                f"{row['p50']:.3f}s",
+                f"{row['p95']:.3f}s",
+                f"{row['max']:.3f}s",
+                f"{row['total']:.2f}s",
+            )
+        console.print()
+        console.print(table)
+
+    if out_path is not None:
+        count = write_spans(spans, out_path)
+        console.print(f"[dim]Wrote {count} spans to {out_path}[/dim]")
+
+
+def _print_details(result: dict) -> None:
+    """Print the full per-object output of batch tools run in the latest turn."""
+    from src.core.results import BatchResult
+    from src.main import get_turn_artifacts
+
+    for artifact in get_turn_artifacts(result["messages"]):
+        if "items" in artifact:
+            detail = BatchResult.from_dict(artifact).detail()
+            console.print(Panel(detail, border_style="dim"))
+
+
+def _print_usage(result: dict) -> None:
+    """Print cached versus uncached input tokens for the latest turn."""
+    from src.main import get_turn_usage
+
+    usage = get_turn_usage(result["messages"])
+    console.print(
+        f"[dim]Tokens: {usage['input_tokens']} in "
+        f"({usage['cache_read']} cache read, {usage['cache_creation']} cache write, "
+        f"{usage['uncached_input']} uncached), {usage['output_tokens']} out[/dim]"
+    )
+
+
+def _run_interactive(
+    app, config: dict, report: Callable[..., None], stream: bool = True
+):
     """Run in interactive mode."""
     console.print(
         Panel.fit(
@@ -135,14 +531,8 @@ def _run_interactive(app, thread_id: Optional[str], recursion_limit: int):
         )
     )
 
-    tid = thread_id or str(uuid7())
-    console.print(f"\n[dim]Session ID:[/dim] {tid}")
-    console.print(f"[dim]Recursion Limit:[/dim] {recursion_limit}\n")
-
-    config = {
-        "configurable": {"thread_id": tid},
-        "recursion_limit": recursion_limit,
-    }
+    console.print(f"\n[dim]Session ID:[/dim] {config['configurable']['thread_id']}")
+    console.print(f"[dim]Recursion Limit:[/dim] {config['recursion_limit']}\n")
 
     while True:
         try:
@@ -156,16 +546,7 @@ def _run_interactive(app, thread_id: Optional[str], recursion_limit: int):
                 continue
 
             console.print()
-            with console.status(
-                "[bold cyan]🤖 Processing your request...", spinner="earth"
-            ):
-                result = app.invoke(
-                    {"messages": [HumanMessage(content=user_input)]},
-                    config=config,
-                )
-                final_message = result["messages"][-1]
-
-            console.print("[bold cyan]Assistant:[/bold cyan]", final_message.content)
+            report(*_turn(app, user_input, config, stream))
             console.print()
 
         except KeyboardInterrupt:
@@ -175,27 +556,29 @@ def _run_interactive(app, thread_id: Optional[str], recursion_limit: int):
             continue
 
 
-def _run_prompt(app, prompt_text: str, thread_id: Optional[str], recursion_limit: int):
+def _run_prompt(
+    app,
+    prompt_text: str,
+    config: dict,
+    report: Callable[..., None],
+    stream: bool = True,
+):
     """Run single prompt."""
     console.print(f"[bold cyan]Processing:[/bold cyan] {prompt_text}\n")
+    report(*_turn(app, prompt_text, config, stream))
 
-    config = {
-        "configurable": {"thread_id": thread_id or str(uuid7())},
-        "recursion_limit": recursion_limit,
-    }
-
-    with console.status("[bold cyan]🤖 Processing your request...", spinner="earth"):
-        result = app.invoke(
-            {"messages": [HumanMessage(content=prompt_text)]},
-            config=config,
-        )
-        final_message = result["messages"][-1]
-
-    console.print(f"\n[bold cyan]Assistant:[/bold cyan] {final_message.content}")
 
-
-def _run_file(app, file_path: Path, thread_id: Optional[str], recursion_limit: int):
+def _run_file(
+    app,
+    file_path: Path,
+    config: dict,
+    report: Callable[..., None],
+    parallel: Optional[int] = None,
+    stream: bool = True,
+):
     """Run instructions from file."""
+    from src.core.instructions import flatten_instructions, parse_instructions
+
     console.print(f"[bold cyan]Processing instructions from:[/bold cyan] {file_path}\n")
 
     # Read file content
@@ -209,40 +592,205 @@ def _run_file(app, file_path: Path, thread_id: Optional[str], recursion_limit: i
         console.print("[red]Error:[/red] File is empty")
         raise typer.Exit(code=1)
 
-    config = {
-        "configurable": {"thread_id": thread_id or str(uuid7())},
-        "recursion_limit": recursion_limit,
-    }
-
     # Parse instructions
-    lines = [line.strip() for line in content.split("\n") if line.strip()]
+    try:
+        units = parse_instructions(content)
+    except ValueError as e:
+        console.print(f"[red]Invalid instruction file:[/red] {e}")
+        raise typer.Exit(code=1)
+    lines = flatten_instructions(units)
+
+    if not lines:
+        console.print("[red]Error:[/red] File has no instructions")
+        raise typer.Exit(code=1)
 
-    if len(lines) == 1:
+    if parallel and len(lines) > 1:
+        _run_file_parallel(app, units, len(lines), config, report, parallel)
+    elif len(lines) == 1:
         # Single instruction
         console.print(f"[dim]Instruction:[/dim] {lines[0]}\n")
-        with console.status(
-            "[bold cyan]🤖 Processing your request...", spinner="earth"
-        ):
-            result = app.invoke(
-                {"messages": [HumanMessage(content=lines[0])]},
-                config=config,
-            )
-            final_message = result["messages"][-1]
-        console.print(f"\n[bold cyan]Assistant:[/bold cyan] {final_message.content}")
+        report(*_turn(app, lines[0], config, stream))
     else:
         # Multiple instructions
         console.print(f"[dim]Found {len(lines)} instructions[/dim]\n")
 
         for i, instruction in enumerate(lines, 1):
             console.print(f"[bold cyan][{i}/{len(lines)}][/bold cyan] {instruction}")
+            report(
+                *_turn(
+                    app,
+                    instruction,
+                    config,
+                    stream,
+                    label="[green]✅[/green]",
+                    status=f"[bold cyan]🤖 Processing instruction {i}/{len(lines)}...",
+                )
+            )
+            console.print()
+
 
-            with console.status(
-                f"[bold cyan]🤖 Processing instruction {i}/{len(lines)}...",
-                spinner="earth",
-            ):
-                result = app.invoke(
-                    {"messages": [HumanMessage(content=instruction)]},
-                    config=config,
+def _run_file_parallel(
+    app,
+    units: list,
+    total: int,
+    config: dict,
+    report: Callable[..., None],
+    parallel: int,
+):
+    """Run instruction units concurrently and print results in input order."""
+    from src.core.instructions import DependencyError, run_instructions
+
+    base_thread = config["configurable"]["thread_id"]
+    console.print(
+        f"[dim]Found {total} instructions in {len(units)} independent units, "
+        f"running up to {parallel} at a time[/dim]\n"
+    )
+
+    def run_line(text: str, unit_number: int) -> dict:
+        # Each unit is its own conversation
+        unit_config = {
+            **config,
+            "configurable": {
+                **config["configurable"],
+                "thread_id": f"{base_thread}-{unit_number}",
+            },
+        }
+        return _invoke(app, text, unit_config)
+
+    started = time.perf_counter()
+    done = failed = 0
+    line_time = 0.0
+    with console.status(
+        f"[bold cyan]🤖 Processing {total} instructions...", spinner="earth"
+    ) as status:
+        for outcome in run_instructions(units, run_line, parallel):
+            instruction = outcome.instruction
+            done += 1
+            line_time += outcome.elapsed
+            status.update(
+                f"[bold cyan]🤖 Processing instructions ({done}/{total} done)..."
+            )
+            console.print(
+                f"[bold cyan][{instruction.number}/{total}][/bold cyan] "
+                f"{instruction.text}"
+            )
+            if isinstance(outcome.error, DependencyError):
+                failed += 1
+                console.print(f"[yellow]⏭️  {outcome.error}[/yellow]\n")
+            elif outcome.error is not None:
+                failed += 1
+                console.print(
+                    f"[red]❌ {type(outcome.error).__name__}: {outcome.error}[/red] "
+                    f"[dim]({outcome.elapsed:.2f}s)[/dim]\n"
+                )
+            else:
+                final_message = outcome.result["messages"][-1]
+                console.print(
+                    f"[green]✅[/green] {final_message.content} "
+                    f"[dim]({outcome.elapsed:.2f}s)[/dim]"
                 )
-                final_message = result["messages"][-1]
-            console.print(f"[green]✅[/green] {final_message.content}\n")
+                report(outcome.result, outcome.elapsed)
+                console.print()
+
+    elapsed = time.perf_counter() - started
+    console.print(
+        f"[dim]{total - failed}/{total} instructions succeeded in {elapsed:.2f}s "
+        f"({line_time:.2f}s of instruction time)[/dim]"
+    )
+
+
+def _run_jsonl(
+    app,
+    in_path: Path,
+    out_path: Path,
+    config: dict,
+    workers: int,
+    use_async: bool = False,
+):
+    """Run JSONL request records and stream one result line per record."""
+    import json
+
+    from langchain_core.messages import HumanMessage
+    from langsmith import uuid7
+
+    from src.core.aio import iterate_async
+    from src.core.jsonl import (
+        astream_records,
+        read_records,
+        record_config,
+        stream_records,
+    )
+    from src.main import astream_turn, describe_turn
+
+    console.print(
+        f"[bold cyan]Processing requests from:[/bold cyan] {in_path} "
+        f"[dim]({workers} at a time{', async' if use_async else ''})[/dim]\n"
+    )
+
+    def run_record(record: dict) -> dict:
+        # Records without a thread_id are one-off conversations; drop their
+        # checkpoints once done so memory stays flat on large inputs.
+        thread_id = record.get("thread_id")
+        ephemeral = thread_id is None
+        if ephemeral:
+            thread_id = str(uuid7())
+        try:
+            result = _invoke(
+                app, record["prompt"], record_config(record, config, thread_id)
+            )
+        finally:
+            if ephemeral:
+                app.checkpointer.delete_thread(thread_id)
+
+        return {"thread_id": thread_id, **describe_turn(result["messages"])}
+
+    async def arun_record(record: dict) -> dict:
+        thread_id = record.get("thread_id")
+        ephemeral = thread_id is None
+        if ephemeral:
+            thread_id = str(uuid7())
+        try:
+            result = await astream_turn(
+                app,
+                {"messages": [HumanMessage(content=record["prompt"])]},
+                record_config(record, config, thread_id),
+            )
+        finally:
+            if ephemeral:
+                await app.checkpointer.adelete_thread(thread_id)
+
+        return {"thread_id": thread_id, **describe_turn(result["messages"])}
+
+    if use_async:
+        results = iterate_async(
+            astream_records(read_records(in_path), arun_record, workers)
+        )
+    else:
+        results = stream_records(read_records(in_path), run_record, workers)
+
+    started = time.perf_counter()
+    ok = failed = 0
+    with (
+        out_path.open("w", encoding="utf-8") as out,
+        console.status(
+            "[bold cyan]🤖 Processing requests...", spinner="earth"
+        ) as status,
+    ):
+        for result in results:
+            out.write(json.dumps(result, ensure_ascii=False, default=str) + "\n")
+            out.flush()
+            if result["status"] == "ok":
+                ok += 1
+            else:
+                failed += 1
+            status.update(
+                f"[bold cyan]🤖 Processing requests ({ok} ok, {failed} failed)..."
+            )
+
+    elapsed = time.perf_counter() - started
+    total = ok + failed
+    rate = total / elapsed if elapsed else 0.0
+    console.print(
+        f"[green]✅[/green] {total} records: {ok} ok, {failed} failed "
+        f"in {elapsed:.2f}s ({rate:.1f}/s) → {out_path}"
+    )
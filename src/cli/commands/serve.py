@@ -0,0 +1,155 @@
+"""
+Serve command - Run the workflow as a local HTTP API.
+"""
+
+from pathlib import Path
+from typing import Optional
+
+import typer
+from rich.console import Console
+from rich.panel import Panel
+
+from src.core.config import validate_environment
+
+console = Console()
+
+
+def serve_api(
+    port: int = typer.Option(
+        8765,
+        "--port",
+        "-p",
+        help="Port to listen on (localhost only)",
+        min=1024,
+        max=65535,
+    ),
+    max_concurrency: int = typer.Option(
+        16,
+        "--max-concurrency",
+        "-c",
+        help="Maximum number of requests running the graph at once",
+        min=1,
+    ),
+    checkpoint_db: Optional[Path] = typer.Option(
+        None,
+        "--checkpoint-db",
+        help="SQLite file for persistent conversation checkpoints",
+        dir_okay=False,
+    ),
+    recursion_limit: int = typer.Option(
+        50,
+        "--recursion-limit",
+        "-r",
+        help="Maximum recursion depth for graph execution",
+        min=1,
+        max=200,
+    ),
+    prompt_cache: bool = typer.Option(
+        False,
+        "--prompt-cache",
+        help="Cache the system prompt and tool schemas (Anthropic prompt caching)",
+    ),
+    use_async: bool = typer.Option(
+        False,
+        "--async",
+        help="Run requests with astream on one shared event loop",
+    ),
+    warm: bool = typer.Option(
+        True,
+        "--warm/--no-warm",
+        help="Authenticate to SCM at startup instead of on the first request",
+    ),
+):
+    """
+    Serve the SCM NLP workflow over a local HTTP API.
+
+    The graph is compiled once and the SCM client pool and folder caches stay
+    warm between requests. The server listens on 127.0.0.1 only and requires
+    the bearer token it prints at startup (set SCM_SERVER_TOKEN to choose it).
+
+    Examples:
+
+    \b
+        # Start the server
+        scm-agent serve --port 8765
+
+    \b
+        # Run a prompt on a thread
+        curl -s localhost:8765/v1/threads/texas/messages \\
+            -H "Authorization: Bearer $TOKEN" -H "Content-Type: application/json" \\
+            -d '{"prompt": "List all tags in Texas"}'
+
+    \b
+        # Stream graph updates as NDJSON
+        curl -sN localhost:8765/v1/messages \\
+            -H "Authorization: Bearer $TOKEN" -H "Content-Type: application/json" \\
+            -d '{"prompt": "Create tags A and B in Texas", "stream": true}'
+    """
+    try:
+        validate_environment()
+    except Exception as e:
+        console.print(f"[red]Configuration Error:[/red] {e}")
+        console.print(
+            "\n[yellow]Tip:[/yellow] Check your .env file or environment variables"
+        )
+        raise typer.Exit(code=1)
+
+    try:
+        from src.core import get_scm_client
+        from src.main import get_compiled_app
+        from src.server import LOOPBACK_HOST, AgentServer
+
+        app = get_compiled_app(str(checkpoint_db) if checkpoint_db else None)
+    except Exception as e:
+        console.print(f"[red]Failed to initialize workflow:[/red] {e}")
+        raise typer.Exit(code=1)
+
+    if warm:
+        try:
+            get_scm_client()
+        except Exception as e:
+            # Not fatal: the first request authenticates again and reports errors
+            console.print(f"[yellow]SCM warm-up failed:[/yellow] {e}")
+
+    base_config = {
+        "configurable": {
+            "prompt_caching": prompt_cache,
+            "history_token_budget": None,
+            "fast_path": True,
+        },
+        "recursion_limit": recursion_limit,
+    }
+
+    try:
+        server = AgentServer(
+            app,
+            base_config,
+            port,
+            max_concurrency=max_concurrency,
+            use_async=use_async,
+        )
+    except OSError as e:
+        console.print(f"[red]Cannot listen on port {port}:[/red] {e}")
+        raise typer.Exit(code=1)
+
+    console.print(
+        Panel.fit(
+            "[bold cyan]SCM NLP Assistant[/bold cyan]\n"
+            f"Serving on http://{LOOPBACK_HOST}:{port}\n"
+            f"Token: {server.token}\n\n"
+            "[dim]POST /v1/messages, /v1/threads/{id}/messages · "
+            "GET /health, /v1/threads/{id} · DELETE /v1/threads/{id}\n"
+            "Ctrl+C to stop[/dim]",
+            border_style="cyan",
+        )
+    )
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        console.print("\n[yellow]👋 Shutting down[/yellow]")
+    finally:
+        server.server_close()
+        close = getattr(app.checkpointer, "close", None)
+        if close is not None:
+            close()
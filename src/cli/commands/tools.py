@@ -66,12 +66,42 @@ def list_tools(
                 "params": "addresses: list, folder: str",
                 "example": "Create 5 addresses with IPs 10.0.1.1/32 through 10.0.1.5/32 in Texas",
             },
+            {
+                "name": "address_create_range",
+                "description": "Create addresses for an IP range or CIDR block",
+                "params": "folder, start + end or cidr, name_template, description_template, tag",
+                "example": "Create addresses web_01..web_20 for 10.0.1.1 through 10.0.1.20 in Texas",
+            },
             {
                 "name": "address_group_create_batch",
                 "description": "Create multiple address groups in batch",
                 "params": "groups: list, folder: str",
                 "example": "Create address groups for web, app, and db tiers in Texas",
             },
+            {
+                "name": "address_tag_bulk",
+                "description": "Add/remove tags on every address matching a selector",
+                "params": "folder, name_pattern / has_tag / cidr, add_tags, remove_tags",
+                "example": "Add Production tag to all web_* addresses in Texas",
+            },
+            {
+                "name": "object_delete_batch",
+                "description": "Delete groups, addresses and tags in reference order",
+                "params": "folder, address_groups, addresses, tags (names or globs)",
+                "example": "Delete the web_servers group and all web_* addresses in Texas",
+            },
+            {
+                "name": "folder_plan",
+                "description": "Preview changes to reach a desired folder state",
+                "params": "folder, tags, addresses, groups, prune",
+                "example": "What would change if Texas should have exactly these objects?",
+            },
+            {
+                "name": "folder_apply",
+                "description": "Create, update and prune objects to match a desired state",
+                "params": "folder, tags, addresses, groups, prune",
+                "example": "Make Texas match this spec and remove anything not in it",
+            },
         ],
         "tags": [
             {
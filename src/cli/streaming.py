@@ -0,0 +1,198 @@
+"""
+Live rendering of a graph turn in the terminal.
+
+stream_turn() runs one user turn with LangGraph streaming and renders it as it
+happens: model tokens are printed as they arrive ("messages" stream mode), tool
+calls are shown when they start and finish with their duration (via a callback
+handler, so parallel tool calls are timed individually), and fast-path answers
+are printed from the node update ("updates" stream mode). The spinner is shown
+only until the first output.
+"""
+
+import threading
+import time
+from typing import Any, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from rich.console import Console
+from rich.markup import escape
+
+
+def _content_text(content: Any) -> str:
+    """Extract displayable text from message content (string or content blocks)."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(
+            block.get("text", "")
+            for block in content
+            if isinstance(block, dict) and block.get("type") == "text"
+        )
+    return ""
+
+
+class TurnRenderer:
+    """
+    Prints one turn's tokens and tool events as they happen.
+
+    Attributes:
+        first_output: Seconds from the start of the turn to the first token or
+            tool event (None until something is shown)
+    """
+
+    def __init__(
+        self,
+        console: Console,
+        label: str = "[bold cyan]Assistant:[/bold cyan]",
+        status: str = "[bold cyan]🤖 Processing your request...",
+    ) -> None:
+        self.console = console
+        self.label = label
+        self.first_output: Optional[float] = None
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._status = console.status(status, spinner="earth")
+        self._status.start()
+        self._at_line_start = True
+        self._text_since_tools = False
+        self._tools: dict[UUID, tuple[str, float]] = {}
+
+    def _output(self) -> None:
+        """Stop the spinner and print the label on the first output."""
+        if self.first_output is None:
+            self.first_output = time.perf_counter() - self._started
+            self._status.stop()
+            self.console.print(f"{self.label} ", end="")
+            self._at_line_start = False
+
+    def _newline(self) -> None:
+        if not self._at_line_start:
+            self.console.print()
+            self._at_line_start = True
+
+    def token(self, text: str) -> None:
+        """Print streamed model text."""
+        if not text:
+            return
+        with self._lock:
+            self._output()
+            self.console.print(text, end="", markup=False, highlight=False)
+            self._at_line_start = text.endswith("\n")
+            self._text_since_tools = True
+
+    def tool_start(self, run_id: UUID, name: str) -> None:
+        """Show a tool call starting."""
+        with self._lock:
+            self._output()
+            self._newline()
+            self._tools[run_id] = (name, time.perf_counter())
+            self.console.print(f"  [dim]🔧 {escape(name)} ...[/dim]")
+            self._text_since_tools = False
+
+    def tool_end(self, run_id: UUID, failed: bool = False) -> None:
+        """Show a tool call finishing with its duration."""
+        with self._lock:
+            name, started = self._tools.pop(run_id, ("tool", time.perf_counter()))
+            icon = "[red]❌[/red]" if failed else "[green]✅[/green]"
+            self.console.print(
+                f"  {icon} [dim]{escape(name)} ({time.perf_counter() - started:.2f}s)"
+                "[/dim]"
+            )
+            self._at_line_start = True
+
+    def finish(self, final_message: Optional[BaseMessage]) -> None:
+        """Print the final answer if it was not streamed, and end the line."""
+        with self._lock:
+            if not self._text_since_tools and final_message is not None:
+                self._output()
+                self._newline()
+                text = _content_text(final_message.content)
+                self.console.print(text, markup=False, highlight=False)
+                self._at_line_start = True
+            self._status.stop()
+            self._newline()
+
+    def stop(self) -> None:
+        """Stop the spinner (e.g., when the turn failed)."""
+        self._status.stop()
+
+
+class _ToolEvents(BaseCallbackHandler):
+    """Callback handler forwarding tool start and end events to a renderer."""
+
+    def __init__(self, renderer: TurnRenderer) -> None:
+        self.renderer = renderer
+
+    def on_tool_start(
+        self, serialized: dict, input_str: str, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        name = (serialized or {}).get("name") or kwargs.get("name") or "tool"
+        self.renderer.tool_start(run_id, name)
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        content = getattr(output, "content", output)
+        failed = getattr(output, "status", None) == "error" or (
+            isinstance(content, str) and content.startswith("❌")
+        )
+        self.renderer.tool_end(run_id, failed=failed)
+
+    def on_tool_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self.renderer.tool_end(run_id, failed=True)
+
+
+def stream_turn(
+    app,
+    text: str,
+    config: dict,
+    console: Console,
+    label: str = "[bold cyan]Assistant:[/bold cyan]",
+    status: str = "[bold cyan]🤖 Processing your request...",
+) -> tuple[dict, Optional[float]]:
+    """
+    Run one user turn with streaming output.
+
+    Args:
+        app: Compiled workflow app (or any object with a compatible stream())
+        text: User message
+        config: Run config
+        console: Console to render to
+        label: Markup printed before the answer
+        status: Spinner text shown until the first output
+
+    Returns:
+        (final graph state, seconds to first output or None)
+    """
+    renderer = TurnRenderer(console, label, status)
+    run_config = {
+        **config,
+        "callbacks": [*(config.get("callbacks") or []), _ToolEvents(renderer)],
+    }
+    inputs = {"messages": [HumanMessage(content=text)]}
+
+    result: Optional[dict] = None
+    try:
+        for mode, chunk in app.stream(
+            inputs, config=run_config, stream_mode=["messages", "updates", "values"]
+        ):
+            if mode == "messages":
+                message, metadata = chunk
+                if metadata.get("langgraph_node") == "agent" and isinstance(
+                    message, AIMessage
+                ):
+                    renderer.token(_content_text(message.content))
+            elif mode == "updates":
+                # Fast-path answers come from a node update, not the model
+                update = chunk.get("fast_path") or {}
+                for message in update.get("messages", [])[-1:]:
+                    renderer.token(_content_text(message.content))
+            else:
+                result = chunk
+    finally:
+        renderer.stop()
+
+    renderer.finish(result["messages"][-1] if result else None)
+    return result, renderer.first_output
@@ -3,11 +3,27 @@ Core module for SCM NLP Workflow.
 
 This module contains fundamental components:
 - State management (AgentState)
-- SCM client initialization
+- SCM client pooling and token refresh
 - Configuration management
 """
 
-from src.core.client import get_scm_client
-from src.core.state import AgentState
+__all__ = ["get_scm_client", "reset_scm_clients", "AgentState"]
 
-__all__ = ["get_scm_client", "AgentState"]
+# Exports load lazily: src.core.client pulls in the SCM SDK and src.core.state
+# pulls in LangGraph, which light CLI commands should not pay for.
+_EXPORTS = {
+    "get_scm_client": "src.core.client",
+    "reset_scm_clients": "src.core.client",
+    "AgentState": "src.core.state",
+}
+
+
+def __getattr__(name: str):
+    """Import exported names from their submodule on first use."""
+    if name in _EXPORTS:
+        import importlib
+
+        value = getattr(importlib.import_module(_EXPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module 'src.core' has no attribute '{name}'")
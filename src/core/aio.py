@@ -0,0 +1,107 @@
+"""
+Shared event loop for async graph execution.
+
+The CLI and the HTTP server are thread-based, but async graph runs (ainvoke,
+astream) should share one event loop so many sessions multiplex onto it instead
+of each holding a thread for the full model and API latency. This module runs
+that loop in a daemon thread and bridges to it from synchronous code:
+
+- run_coroutine(): run a coroutine on the loop and wait for its result
+- iterate_async(): consume an async iterator as a regular iterator
+"""
+
+import asyncio
+import queue
+import threading
+from collections.abc import AsyncIterable, Coroutine, Iterator
+from typing import Any, Optional, TypeVar
+
+T = TypeVar("T")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get or start the shared background event loop (singleton pattern).
+
+    Returns:
+        asyncio.AbstractEventLoop: Loop running forever in the "scm-event-loop"
+        daemon thread
+    """
+    global _loop
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever, name="scm-event-loop", daemon=True
+                ).start()
+                _loop = loop
+    return _loop
+
+
+def run_coroutine(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a coroutine on the shared loop and block until it finishes.
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        The coroutine's result (its exception is re-raised here)
+
+    Example:
+        >>> result = run_coroutine(app.ainvoke(inputs, config=config))
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, get_event_loop())
+    try:
+        return future.result()
+    except BaseException:
+        # Interrupted or failed: make sure the task does not keep running
+        future.cancel()
+        raise
+
+
+def iterate_async(aiterable: AsyncIterable[T]) -> Iterator[T]:
+    """
+    Iterate an async iterable on the shared loop from synchronous code.
+
+    Items are handed over as soon as the loop produces them. Closing the returned
+    iterator early cancels the async iteration.
+
+    Args:
+        aiterable: Async iterable (e.g., app.astream(...))
+
+    Yields:
+        Items of ``aiterable`` in order
+
+    Example:
+        >>> for chunk in iterate_async(app.astream(inputs, config=config)):
+        ...     print(chunk)
+    """
+    handoff: queue.Queue[tuple[str, Any]] = queue.Queue()
+
+    async def pump() -> None:
+        try:
+            async for item in aiterable:
+                handoff.put(("item", item))
+        except BaseException as e:
+            handoff.put(("error", e))
+            raise
+        finally:
+            handoff.put(("done", None))
+
+    future = asyncio.run_coroutine_threadsafe(pump(), get_event_loop())
+    try:
+        while True:
+            kind, value = handoff.get()
+            if kind == "item":
+                yield value
+            elif kind == "error":
+                raise value
+            else:
+                return
+    finally:
+        future.cancel()
@@ -0,0 +1,245 @@
+"""
+Persistent, size-bounded conversation checkpoints.
+
+The default in-memory checkpointer keeps every checkpoint of every thread for the
+life of the process. PrunedSqliteSaver stores checkpoints in a WAL-mode SQLite
+database instead, keeps only the most recent checkpoints of each thread, and
+reclaims the freed pages from a background thread:
+
+- SCM_CHECKPOINT_DB: database path used when --checkpoint-db is not given
+- SCM_CHECKPOINT_KEEP: checkpoints kept per thread (default: 20)
+- SCM_CHECKPOINT_VACUUM_INTERVAL: seconds between vacuum passes (default: 300)
+"""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+from collections.abc import AsyncIterator, Sequence
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+)
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from src.core.config import get_config
+
+logger = logging.getLogger(__name__)
+
+# Checkpoint ids are time-ordered, so the K-th newest id is the retention cutoff.
+# When a thread has fewer than K checkpoints the subquery is NULL and nothing is
+# deleted.
+_PRUNE_CHECKPOINTS_SQL = """
+DELETE FROM checkpoints
+WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id < (
+    SELECT checkpoint_id FROM checkpoints
+    WHERE thread_id = ? AND checkpoint_ns = ?
+    ORDER BY checkpoint_id DESC LIMIT 1 OFFSET ?
+)
+"""
+_PRUNE_WRITES_SQL = """
+DELETE FROM writes
+WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id < (
+    SELECT checkpoint_id FROM checkpoints
+    WHERE thread_id = ? AND checkpoint_ns = ?
+    ORDER BY checkpoint_id ASC LIMIT 1
+)
+"""
+
+
+class PrunedSqliteSaver(SqliteSaver):
+    """
+    SQLite checkpointer that keeps only the last ``keep_last`` checkpoints per thread.
+
+    Older checkpoints and their pending writes are deleted as each new checkpoint is
+    saved, so the database grows with the number of threads rather than the number
+    of turns. A daemon thread periodically returns freed pages to the filesystem
+    and truncates the write-ahead log. The async methods run the sync ones in a
+    worker thread, so the same checkpointer serves ainvoke/astream.
+
+    Attributes:
+        keep_last: Checkpoints kept per thread and namespace
+        vacuum_interval: Seconds between background vacuum passes (0 disables)
+    """
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        keep_last: int = 20,
+        vacuum_interval: float = 300,
+    ) -> None:
+        super().__init__(conn)
+        self.keep_last = max(keep_last, 1)
+        self.vacuum_interval = vacuum_interval
+        self._vacuum_stop = threading.Event()
+        self._vacuum_thread: Optional[threading.Thread] = None
+
+    def setup(self) -> None:
+        """Create the tables, enabling incremental auto-vacuum on new databases."""
+        if self.is_setup:
+            return
+        # auto_vacuum only takes effect before the first table is created
+        self.conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        super().setup()
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Save a checkpoint, then drop the thread's checkpoints beyond ``keep_last``."""
+        saved_config = super().put(config, checkpoint, metadata, new_versions)
+        self.prune(
+            saved_config["configurable"]["thread_id"],
+            saved_config["configurable"]["checkpoint_ns"],
+        )
+        return saved_config
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """Async get_tuple(), run in a worker thread."""
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        """Async list(), run in a worker thread."""
+        checkpoints = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for checkpoint in checkpoints:
+            yield checkpoint
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Async put(), run in a worker thread."""
+        return await asyncio.to_thread(
+            self.put, config, checkpoint, metadata, new_versions
+        )
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Async put_writes(), run in a worker thread."""
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        """Async delete_thread(), run in a worker thread."""
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    def prune(self, thread_id: str, checkpoint_ns: str = "") -> None:
+        """
+        Delete all but the newest ``keep_last`` checkpoints of a thread.
+
+        Args:
+            thread_id: Conversation thread ID
+            checkpoint_ns: Checkpoint namespace (default: root graph)
+        """
+        key = (str(thread_id), checkpoint_ns)
+        with self.cursor() as cur:
+            cur.execute(_PRUNE_CHECKPOINTS_SQL, (*key, *key, self.keep_last - 1))
+            if cur.rowcount:
+                cur.execute(_PRUNE_WRITES_SQL, (*key, *key))
+
+    def vacuum(self) -> None:
+        """Return freed pages to the filesystem and truncate the write-ahead log."""
+        with self.cursor() as cur:
+            cur.execute("PRAGMA incremental_vacuum")
+            cur.fetchall()
+        with self.cursor(transaction=False) as cur:
+            cur.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            cur.fetchall()
+
+    def _vacuum_loop(self) -> None:
+        """Background loop that vacuums the database until stopped."""
+        while not self._vacuum_stop.wait(self.vacuum_interval):
+            try:
+                self.vacuum()
+            except Exception as e:
+                logger.warning("Checkpoint vacuum failed: %s: %s", type(e).__name__, e)
+
+    def start_vacuum(self) -> None:
+        """Start the background vacuum thread if it is not already running."""
+        if self.vacuum_interval <= 0:
+            return
+        if self._vacuum_thread is not None and self._vacuum_thread.is_alive():
+            return
+        self._vacuum_stop.clear()
+        self._vacuum_thread = threading.Thread(
+            target=self._vacuum_loop, name="scm-checkpoint-vacuum", daemon=True
+        )
+        self._vacuum_thread.start()
+
+    def close(self) -> None:
+        """Stop the vacuum thread, vacuum once more and close the connection."""
+        self._vacuum_stop.set()
+        if self._vacuum_thread is not None:
+            self._vacuum_thread.join(timeout=5)
+            self._vacuum_thread = None
+        try:
+            self.vacuum()
+        finally:
+            self.conn.close()
+
+
+def open_checkpointer(
+    path: Union[str, Path],
+    keep_last: Optional[int] = None,
+    vacuum_interval: Optional[float] = None,
+) -> PrunedSqliteSaver:
+    """
+    Open (or create) a pruned SQLite checkpoint database.
+
+    Args:
+        path: Database file path (parent directories are created)
+        keep_last: Checkpoints kept per thread (default: SCM_CHECKPOINT_KEEP or 20)
+        vacuum_interval: Seconds between vacuum passes
+            (default: SCM_CHECKPOINT_VACUUM_INTERVAL or 300, 0 disables)
+
+    Returns:
+        PrunedSqliteSaver: Ready-to-use checkpointer with its vacuum thread running
+
+    Example:
+        >>> checkpointer = open_checkpointer("~/.scm-agent/checkpoints.db")
+        >>> app = graph.compile(checkpointer=checkpointer)
+    """
+    if keep_last is None:
+        keep_last = int(get_config("SCM_CHECKPOINT_KEEP", default="20"))
+    if vacuum_interval is None:
+        vacuum_interval = float(
+            get_config("SCM_CHECKPOINT_VACUUM_INTERVAL", default="300")
+        )
+
+    path = Path(path).expanduser()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # The connection is shared by the graph and the vacuum thread; SqliteSaver
+    # serializes access with its own lock.
+    conn = sqlite3.connect(str(path), check_same_thread=False)
+    checkpointer = PrunedSqliteSaver(
+        conn, keep_last=keep_last, vacuum_interval=vacuum_interval
+    )
+    checkpointer.setup()
+    checkpointer.start_vacuum()
+    return checkpointer
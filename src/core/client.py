@@ -1,24 +1,124 @@
 """
 SCM client initialization and management.
 
-Provides factory function for creating Strata Cloud Manager (SCM) client instances
-with credentials loaded from environment variables.
+Provides a process-wide pool of Strata Cloud Manager (SCM) client instances with
+credentials loaded from environment variables. Clients are created once per set of
+credentials and shared by every tool call, so the OAuth token exchange and HTTP
+session are reused instead of being rebuilt on each request. A background thread
+refreshes tokens shortly before they expire.
 """
 
+import hashlib
+import logging
 import os
+import threading
+import time
+from typing import Optional
 
 from scm.client import ScmClient
 
+from src.core.config import get_config
+from src.core.profiling import instrument_scm_client
+
+logger = logging.getLogger(__name__)
+
+# Pooled clients keyed by (client_id, tsg_id, secret hash)
+_clients: dict[tuple[Optional[str], Optional[str], str], ScmClient] = {}
+_clients_lock = threading.Lock()
+
+_refresher: Optional[threading.Thread] = None
+_refresher_stop = threading.Event()
+
+
+def _token_expires_soon(client: ScmClient, buffer: int) -> bool:
+    """Return True if the client's OAuth token expires within ``buffer`` seconds."""
+    oauth_client = getattr(client, "oauth_client", None)
+    if oauth_client is None:
+        # Bearer token mode - nothing to refresh
+        return False
+
+    token = getattr(oauth_client.session, "token", None) or {}
+    if not token:
+        return True
+    return time.time() >= token.get("expires_at", 0) - buffer
+
+
+def refresh_scm_clients(buffer: Optional[int] = None) -> int:
+    """
+    Refresh the token of every pooled client that is close to expiry.
+
+    Args:
+        buffer: Seconds before expiry at which a token is refreshed
+            (default: SCM_TOKEN_REFRESH_BUFFER or 300)
+
+    Returns:
+        Number of clients whose token was refreshed
+
+    Example:
+        >>> refresh_scm_clients(buffer=600)
+        1
+    """
+    if buffer is None:
+        buffer = int(get_config("SCM_TOKEN_REFRESH_BUFFER", default="300"))
+
+    with _clients_lock:
+        clients = list(_clients.values())
+
+    refreshed = 0
+    for client in clients:
+        if not _token_expires_soon(client, buffer):
+            continue
+        try:
+            client.oauth_client.refresh_token()
+            refreshed += 1
+        except Exception as e:
+            # The SDK refreshes on demand if the token actually expires,
+            # so a failed refresh-ahead is logged and retried on the next tick.
+            logger.warning("SCM token refresh failed: %s: %s", type(e).__name__, e)
+    return refreshed
+
+
+def _secret_hash(secret: Optional[str]) -> str:
+    """Digest of the client secret, so a rotated secret gets a new pooled client."""
+    return hashlib.sha256((secret or "").encode()).hexdigest()
+
+
+def _refresh_loop(interval: float) -> None:
+    """Background loop that refreshes pooled tokens until stopped."""
+    while not _refresher_stop.wait(interval):
+        refresh_scm_clients()
+
+
+def _ensure_refresher() -> None:
+    """Start the background token refresher if it is not already running."""
+    global _refresher
+    if _refresher is not None and _refresher.is_alive():
+        return
+
+    interval = float(get_config("SCM_TOKEN_REFRESH_INTERVAL", default="60"))
+    _refresher_stop.clear()
+    _refresher = threading.Thread(
+        target=_refresh_loop,
+        args=(interval,),
+        name="scm-token-refresher",
+        daemon=True,
+    )
+    _refresher.start()
+
 
 def get_scm_client() -> ScmClient:
     """
-    Initialize and return an SCM client instance.
+    Return the pooled SCM client instance, creating it on first use.
 
     Loads credentials from environment variables:
     - SCM_CLIENT_ID: Service account client ID
     - SCM_CLIENT_SECRET: Service account secret
     - SCM_TSG_ID: Tenant Service Group ID
 
+    The client is shared across threads and tool calls. Changing credentials in the
+    environment yields a separate pooled client for the new tenant; a rotated
+    SCM_CLIENT_SECRET replaces the client built with the old secret.
+
     Returns:
         ScmClient: Authenticated SCM client ready for API calls
 
@@ -29,8 +129,47 @@ def get_scm_client() -> ScmClient:
         >>> client = get_scm_client()
         >>> tags = client.tag.list(folder="Texas")
     """
-    return ScmClient(
-        client_id=os.getenv("SCM_CLIENT_ID"),
-        client_secret=os.getenv("SCM_CLIENT_SECRET"),
-        tsg_id=os.getenv("SCM_TSG_ID"),
-    )
+    client_id = os.getenv("SCM_CLIENT_ID")
+    tsg_id = os.getenv("SCM_TSG_ID")
+    client_secret = os.getenv("SCM_CLIENT_SECRET")
+    key = (client_id, tsg_id, _secret_hash(client_secret))
+
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    with _clients_lock:
+        # Another thread may have authenticated while we waited for the lock
+        client = _clients.get(key)
+        if client is None:
+            client = ScmClient(
+                client_id=client_id,
+                client_secret=client_secret,
+                tsg_id=tsg_id,
+            )
+            instrument_scm_client(client)
+            # Drop clients of the same tenant built with a previous secret
+            for stale in [k for k in _clients if k[:2] == key[:2]]:
+                del _clients[stale]
+            _clients[key] = client
+        _ensure_refresher()
+    return client
+
+
+def reset_scm_clients() -> None:
+    """
+    Drop all pooled clients and stop the background token refresher.
+
+    The next call to get_scm_client() authenticates again. Useful after rotating
+    credentials or in tests.
+
+    Example:
+        >>> reset_scm_clients()
+    """
+    global _refresher
+    _refresher_stop.set()
+    if _refresher is not None:
+        _refresher.join(timeout=5)
+    with _clients_lock:
+        _clients.clear()
+        _refresher = None
@@ -0,0 +1,182 @@
+"""
+Bounded-concurrency execution engine for batch tools.
+
+Batch tools hand a per-item function and their items to run_batch(), which runs
+them on a shared worker pool and returns one outcome per item in input order.
+arun_batch() is the asyncio variant: it fans the items out with asyncio.gather
+and runs each one on the same pool. Two limits apply to both:
+
+- SCM_BATCH_WORKERS: size of the process-wide worker pool (default: 8)
+- SCM_TENANT_CONCURRENCY: maximum in-flight API calls per tenant across all
+  concurrent batches (default: 4)
+"""
+
+import asyncio
+import contextvars
+import threading
+import weakref
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, NamedTuple, Optional
+
+from src.core.config import get_config
+
+
+class BatchOutcome(NamedTuple):
+    """
+    Result of running one batch item.
+
+    Attributes:
+        item: The input item
+        result: Return value of the item function (None if it raised)
+        error: Exception raised by the item function (None on success)
+    """
+
+    item: Any
+    result: Any
+    error: Optional[BaseException]
+
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+_tenant_limits: dict[str, threading.BoundedSemaphore] = {}
+_tenant_limits_lock = threading.Lock()
+
+# asyncio semaphores are bound to one event loop, so they are kept per loop
+_async_tenant_limits: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def get_batch_pool() -> ThreadPoolExecutor:
+    """
+    Get or create the shared batch worker pool (singleton pattern).
+
+    Returns:
+        ThreadPoolExecutor: Pool sized by SCM_BATCH_WORKERS
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                workers = int(get_config("SCM_BATCH_WORKERS", default="8"))
+                _pool = ThreadPoolExecutor(
+                    max_workers=max(workers, 1), thread_name_prefix="scm-batch"
+                )
+    return _pool
+
+
+def _tenant_limit(tenant: str) -> threading.BoundedSemaphore:
+    """Return the semaphore capping concurrent API calls for a tenant."""
+    with _tenant_limits_lock:
+        limit = _tenant_limits.get(tenant)
+        if limit is None:
+            limit = threading.BoundedSemaphore(_tenant_size())
+            _tenant_limits[tenant] = limit
+        return limit
+
+
+def _tenant_size() -> int:
+    """Return the per-tenant concurrency cap."""
+    return max(int(get_config("SCM_TENANT_CONCURRENCY", default="4")), 1)
+
+
+def _async_tenant_limit(tenant: str) -> asyncio.Semaphore:
+    """Return the running loop's semaphore capping fan-out for a tenant."""
+    limits = _async_tenant_limits.setdefault(asyncio.get_running_loop(), {})
+    limit = limits.get(tenant)
+    if limit is None:
+        limit = limits[tenant] = asyncio.Semaphore(_tenant_size())
+    return limit
+
+
+def run_batch(
+    func: Callable[[Any], Any],
+    items: Sequence[Any],
+    tenant: Optional[str] = None,
+) -> list[BatchOutcome]:
+    """
+    Run ``func`` on every item with bounded concurrency.
+
+    Exceptions raised by ``func`` are captured per item, so one failing item never
+    aborts the rest of the batch.
+
+    Args:
+        func: Function applied to each item
+        items: Items to process
+        tenant: Tenant key for the concurrency cap (default: SCM_TSG_ID)
+
+    Returns:
+        list[BatchOutcome]: One outcome per item, in the same order as ``items``
+
+    Example:
+        >>> outcomes = run_batch(lambda cfg: client.tag.create(cfg), configs)
+        >>> failed = [o for o in outcomes if o.error]
+    """
+    if tenant is None:
+        tenant = get_config("SCM_TSG_ID", default="default")
+    limit = _tenant_limit(tenant)
+
+    def _run(item: Any) -> BatchOutcome:
+        with limit:
+            try:
+                return BatchOutcome(item, func(item), None)
+            except Exception as e:
+                return BatchOutcome(item, None, e)
+
+    # Small batches are not worth the thread handoff
+    if len(items) <= 1:
+        return [_run(item) for item in items]
+
+    # Each item runs in a copy of the caller's context, so the run config (and
+    # with it callbacks such as the profiler) is visible to the item function
+    futures = [
+        get_batch_pool().submit(contextvars.copy_context().run, _run, item)
+        for item in items
+    ]
+    return [future.result() for future in futures]
+
+
+async def arun_batch(
+    func: Callable[[Any], Any],
+    items: Sequence[Any],
+    tenant: Optional[str] = None,
+) -> list[BatchOutcome]:
+    """
+    Async variant of run_batch().
+
+    Items are fanned out with asyncio.gather under a per-tenant semaphore, so
+    only the capped number of items occupy a worker at a time and the event loop
+    stays free for other sessions. ``func`` is synchronous (the SCM SDK is) and
+    runs on the shared batch pool under the same tenant cap as run_batch().
+
+    Args:
+        func: Function applied to each item
+        items: Items to process
+        tenant: Tenant key for the concurrency cap (default: SCM_TSG_ID)
+
+    Returns:
+        list[BatchOutcome]: One outcome per item, in the same order as ``items``
+
+    Example:
+        >>> outcomes = await arun_batch(lambda cfg: client.tag.create(cfg), configs)
+    """
+    if tenant is None:
+        tenant = get_config("SCM_TSG_ID", default="default")
+    thread_limit = _tenant_limit(tenant)
+    async_limit = _async_tenant_limit(tenant)
+    loop = asyncio.get_running_loop()
+
+    def _run(item: Any) -> BatchOutcome:
+        with thread_limit:
+            try:
+                return BatchOutcome(item, func(item), None)
+            except Exception as e:
+                return BatchOutcome(item, None, e)
+
+    async def _arun(item: Any) -> BatchOutcome:
+        async with async_limit:
+            return await loop.run_in_executor(
+                get_batch_pool(), contextvars.copy_context().run, _run, item
+            )
+
+    return list(await asyncio.gather(*(_arun(item) for item in items)))
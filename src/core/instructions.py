@@ -0,0 +1,240 @@
+"""
+Instruction files and parallel execution of their lines.
+
+An instruction file holds one natural-language instruction per line. Two
+directives control how lines may run in parallel (--parallel N):
+
+- ``@after 1,3: <instruction>`` waits for instructions 1 and 3 to finish first
+- ``@sequential`` ... ``@end`` groups lines into a block that runs in order on one
+  conversation thread
+
+Instructions are numbered from 1 in file order, ignoring blank and directive
+lines. Every other line, and every block, is an independent unit that runs on its
+own conversation thread. Without --parallel the directives are stripped and all
+instructions run in order, as before.
+"""
+
+import queue
+import re
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, NamedTuple, Optional
+
+_AFTER = re.compile(r"^@after\s+(\d+(?:\s*,\s*\d+)*)\s*:\s*(.+)$", re.IGNORECASE)
+_BLOCK_START = "@sequential"
+_BLOCK_END = "@end"
+
+
+class Instruction(NamedTuple):
+    """
+    One instruction line.
+
+    Attributes:
+        number: 1-based instruction number
+        text: Instruction text sent to the agent
+        after: Numbers of instructions that must finish first
+    """
+
+    number: int
+    text: str
+    after: tuple[int, ...] = ()
+
+
+class InstructionUnit(NamedTuple):
+    """
+    Instructions that run in order on one conversation thread.
+
+    Attributes:
+        number: Number of the unit's first instruction (used as its ID)
+        instructions: Instructions in execution order
+        after: Instructions outside the unit that must finish first
+    """
+
+    number: int
+    instructions: list[Instruction]
+    after: frozenset[int]
+
+
+class LineOutcome(NamedTuple):
+    """
+    Result of running one instruction.
+
+    Attributes:
+        instruction: The instruction
+        result: Return value of the line function (None if it failed or was skipped)
+        error: Exception raised, or DependencyError if the line was skipped
+        elapsed: Wall time in seconds
+    """
+
+    instruction: Instruction
+    result: Any
+    error: Optional[BaseException]
+    elapsed: float
+
+
+class DependencyError(Exception):
+    """Raised for a line skipped because an instruction it depends on failed."""
+
+    pass
+
+
+def parse_instructions(content: str) -> list[InstructionUnit]:
+    """
+    Parse instruction file content into independently runnable units.
+
+    Args:
+        content: File content
+
+    Returns:
+        list[InstructionUnit]: Units in file order
+
+    Raises:
+        ValueError: If a directive is malformed or @after refers to a later
+            or unknown instruction (so dependencies can never form a cycle)
+
+    Example:
+        >>> units = parse_instructions("List tags in Texas\\n@after 1: Commit Texas")
+        >>> [unit.after for unit in units]
+        [frozenset(), frozenset({1})]
+    """
+    units: list[InstructionUnit] = []
+    block: Optional[list[Instruction]] = None
+    number = 0
+
+    def add_unit(instructions: list[Instruction]) -> None:
+        numbers = {instruction.number for instruction in instructions}
+        after = {n for i in instructions for n in i.after} - numbers
+        units.append(
+            InstructionUnit(instructions[0].number, instructions, frozenset(after))
+        )
+
+    for raw_line in content.splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+
+        directive = line.lower()
+        if directive == _BLOCK_START:
+            if block is not None:
+                raise ValueError("@sequential blocks cannot be nested")
+            block = []
+            continue
+        if directive == _BLOCK_END:
+            if block is None:
+                raise ValueError("@end without a matching @sequential")
+            if block:
+                add_unit(block)
+            block = None
+            continue
+
+        number += 1
+        after: tuple[int, ...] = ()
+        match = _AFTER.match(line)
+        if match:
+            after = tuple(int(n) for n in match.group(1).split(","))
+            line = match.group(2).strip()
+            invalid = [n for n in after if not 1 <= n < number]
+            if invalid:
+                raise ValueError(
+                    f"Instruction {number}: @after must refer to earlier instructions "
+                    f"(got {', '.join(map(str, invalid))})"
+                )
+        elif directive.startswith("@"):
+            raise ValueError(f"Instruction {number}: unknown directive '{line}'")
+
+        instruction = Instruction(number, line, after)
+        if block is not None:
+            block.append(instruction)
+        else:
+            add_unit([instruction])
+
+    # An unterminated block runs to the end of the file
+    if block:
+        add_unit(block)
+    return units
+
+
+def run_instructions(
+    units: list[InstructionUnit],
+    run_line: Callable[[str, int], Any],
+    max_parallel: int,
+) -> Iterator[LineOutcome]:
+    """
+    Run instruction units concurrently, yielding outcomes in instruction order.
+
+    A unit starts once every instruction it depends on has succeeded; if one of them
+    failed, the unit's lines are skipped. Within a unit, a failed line skips the
+    lines after it. Outcomes are yielded as soon as all earlier instructions are
+    done, so callers can print results in input order while later lines still run.
+
+    Args:
+        units: Units from parse_instructions()
+        run_line: Function called with (instruction text, unit number)
+        max_parallel: Maximum number of units running at once
+
+    Yields:
+        LineOutcome: One per instruction, in instruction order
+
+    Example:
+        >>> for outcome in run_instructions(units, invoke, max_parallel=4):
+        ...     print(outcome.instruction.number, f"{outcome.elapsed:.1f}s")
+    """
+    total = sum(len(unit.instructions) for unit in units)
+    finished: queue.Queue[LineOutcome] = queue.Queue()
+    outcomes: dict[int, LineOutcome] = {}
+    pending = list(units)
+
+    def run_unit(unit: InstructionUnit) -> None:
+        failed: Optional[int] = None
+        for instruction in unit.instructions:
+            if failed is not None:
+                error = DependencyError(f"skipped, instruction {failed} failed")
+                finished.put(LineOutcome(instruction, None, error, 0.0))
+                continue
+            started = time.perf_counter()
+            try:
+                result = run_line(instruction.text, unit.number)
+                error = None
+            except Exception as e:
+                result, error = None, e
+                failed = instruction.number
+            elapsed = time.perf_counter() - started
+            finished.put(LineOutcome(instruction, result, error, elapsed))
+
+    def start_ready(pool: ThreadPoolExecutor) -> None:
+        for unit in list(pending):
+            if not unit.after.issubset(outcomes):
+                continue
+            pending.remove(unit)
+            failed = sorted(n for n in unit.after if outcomes[n].error is not None)
+            if not failed:
+                pool.submit(run_unit, unit)
+                continue
+            error = DependencyError(
+                f"skipped, instruction {', '.join(map(str, failed))} failed"
+            )
+            for instruction in unit.instructions:
+                finished.put(LineOutcome(instruction, None, error, 0.0))
+
+    next_number = 1
+    pool = ThreadPoolExecutor(
+        max_workers=max(max_parallel, 1), thread_name_prefix="scm-instructions"
+    )
+    try:
+        start_ready(pool)
+        while next_number <= total:
+            outcome = finished.get()
+            outcomes[outcome.instruction.number] = outcome
+            start_ready(pool)
+            while next_number in outcomes:
+                yield outcomes[next_number]
+                next_number += 1
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def flatten_instructions(units: list[InstructionUnit]) -> list[str]:
+    """Return the instruction texts of all units in instruction order."""
+    instructions = [i for unit in units for i in unit.instructions]
+    return [i.text for i in sorted(instructions, key=lambda i: i.number)]
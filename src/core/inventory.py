@@ -0,0 +1,220 @@
+"""
+Folder inventory snapshots for SCM objects.
+
+A snapshot is one paginated ``list()`` of a single object type in a single folder,
+held as a name-keyed index. Batch tools use it for every existence check instead of
+calling ``fetch()`` once per object, and record the objects they create so the
+index stays accurate for the rest of the batch.
+
+A folder listing also returns the objects the folder inherits from its parent
+folders (e.g., tags defined in "Shared"). Snapshots keep them, since they are
+valid references for tags and group members, but tell them apart from the
+folder's own objects: own() lists only objects defined in the folder, and
+inherited_from() names the parent folder of an inherited object. Objects are
+only ever changed or deleted through own().
+
+Snapshots are cached per client for a short time (SCM_SNAPSHOT_TTL seconds,
+default 60) so consecutive tool calls in one agent turn share the same listing.
+Tools that modify objects outside a batch call invalidate_folder_snapshot().
+
+Since child folders inherit from their parents, a write to one folder can change
+the snapshots of others. The folder hierarchy is not known locally, so
+recording a write in a snapshot (add() or discard()) drops the cached snapshots
+of the same object type in every other folder, and single-object tools
+invalidate the object type in all folders.
+"""
+
+import threading
+import time
+import weakref
+from collections.abc import Iterable, Iterator
+from typing import Any, Optional
+
+from scm.client import ScmClient
+
+from src.core.config import get_config
+
+# Object types supported by snapshots (ScmClient service attribute names)
+SNAPSHOT_OBJECT_TYPES = ("tag", "address", "address_group")
+
+
+class FolderSnapshot:
+    """
+    Name-keyed index of one SCM object type as visible in one folder.
+
+    Holds the folder's own objects and the objects it inherits from parent
+    folders.
+
+    Attributes:
+        object_type: SCM service name (e.g., "address")
+        folder: Folder the snapshot was listed from
+        created_at: Monotonic timestamp of the listing
+    """
+
+    def __init__(
+        self,
+        object_type: str,
+        folder: str,
+        objects: Iterable[Any],
+        client: Optional[ScmClient] = None,
+    ):
+        self.object_type = object_type
+        self.folder = folder
+        self.created_at = time.monotonic()
+        self._objects = {obj.name: obj for obj in objects}
+        self._lock = threading.Lock()
+        # Client whose cache holds the snapshot (weak, like the cache itself)
+        self._client = weakref.ref(client) if client is not None else None
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._objects
+
+    def __len__(self) -> int:
+        return len(self._objects)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(list(self._objects.values()))
+
+    def get(self, name: str) -> Optional[Any]:
+        """Return the object with this name, or None if it is not in the folder."""
+        return self._objects.get(name)
+
+    def names(self) -> set[str]:
+        """Return the set of object names in the snapshot (own and inherited)."""
+        return set(self._objects)
+
+    def own(self) -> list[Any]:
+        """Return the objects defined in the folder itself (not inherited)."""
+        return [obj for obj in self if self._owner(obj) == self.folder]
+
+    def inherited_from(self, name: str) -> Optional[str]:
+        """Return the parent folder an object is inherited from (None if own or absent)."""
+        obj = self._objects.get(name)
+        if obj is None:
+            return None
+        owner = self._owner(obj)
+        return None if owner == self.folder else owner
+
+    def _owner(self, obj: Any) -> str:
+        """Folder (or snippet) that defines the object."""
+        return (
+            getattr(obj, "folder", self.folder)
+            or getattr(obj, "snippet", None)
+            or "unknown"
+        )
+
+    def missing(self, names: Iterable[str]) -> set[str]:
+        """Return the subset of ``names`` not present in the snapshot."""
+        return set(names) - self._objects.keys()
+
+    def add(self, obj: Any) -> None:
+        """Record an object created or updated after the snapshot was taken."""
+        with self._lock:
+            self._objects[obj.name] = obj
+        self._invalidate_other_folders()
+
+    def discard(self, name: str) -> None:
+        """Forget an object deleted after the snapshot was taken."""
+        with self._lock:
+            self._objects.pop(name, None)
+        self._invalidate_other_folders()
+
+    def _invalidate_other_folders(self) -> None:
+        """Drop cached snapshots of this type in other folders (they may inherit the change)."""
+        client = self._client() if self._client is not None else None
+        if client is not None:
+            invalidate_folder_snapshot(client, self.object_type, exclude=self.folder)
+
+    def is_fresh(self, ttl: float) -> bool:
+        """Return True if the snapshot is younger than ``ttl`` seconds."""
+        return time.monotonic() - self.created_at < ttl
+
+
+# Cached snapshots: client -> {(object_type, folder): FolderSnapshot}
+_snapshots: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_snapshots_lock = threading.Lock()
+
+
+def get_folder_snapshot(
+    client: ScmClient, object_type: str, folder: str, refresh: bool = False
+) -> FolderSnapshot:
+    """
+    Return a snapshot of the objects of ``object_type`` visible in ``folder``.
+
+    The snapshot includes objects inherited from parent folders; use
+    FolderSnapshot.own() for the objects defined in ``folder`` itself.
+
+    Args:
+        client: SCM client to list objects with
+        object_type: One of SNAPSHOT_OBJECT_TYPES ("tag", "address", "address_group")
+        folder: SCM folder name (e.g., "Texas")
+        refresh: Ignore any cached snapshot and list the folder again
+
+    Returns:
+        FolderSnapshot: Name-keyed index of the folder's own and inherited objects
+
+    Raises:
+        ValueError: If object_type is not supported
+
+    Example:
+        >>> addresses = get_folder_snapshot(client, "address", "Texas")
+        >>> "web_server_01" in addresses
+        True
+    """
+    if object_type not in SNAPSHOT_OBJECT_TYPES:
+        raise ValueError(
+            f"Unsupported snapshot object type '{object_type}'. "
+            f"Expected one of: {', '.join(SNAPSHOT_OBJECT_TYPES)}"
+        )
+
+    ttl = float(get_config("SCM_SNAPSHOT_TTL", default="60"))
+    key = (object_type, folder)
+
+    with _snapshots_lock:
+        cached = _snapshots.get(client, {}).get(key)
+    if cached is not None and not refresh and cached.is_fresh(ttl):
+        return cached
+
+    # list() pages through the folder internally; without exact_match it also
+    # returns inherited objects, which the snapshot keeps for reference checks
+    snapshot = FolderSnapshot(
+        object_type, folder, getattr(client, object_type).list(folder=folder), client
+    )
+
+    with _snapshots_lock:
+        _snapshots.setdefault(client, {})[key] = snapshot
+    return snapshot
+
+
+def invalidate_folder_snapshot(
+    client: ScmClient,
+    object_type: Optional[str] = None,
+    folder: Optional[str] = None,
+    exclude: Optional[str] = None,
+) -> None:
+    """
+    Drop cached snapshots so the next lookup lists the folder again.
+
+    Args:
+        client: SCM client the snapshots belong to
+        object_type: Only drop snapshots of this type (default: all types)
+        folder: Only drop snapshots of this folder (default: all folders)
+        exclude: Keep the snapshots of this folder
+
+    Example:
+        >>> # After creating an address in Texas (its child folders inherit it)
+        >>> invalidate_folder_snapshot(client, "address")
+    """
+    with _snapshots_lock:
+        cached = _snapshots.get(client)
+        if not cached:
+            return
+        for key in list(cached):
+            cached_type, cached_folder = key
+            if object_type is not None and cached_type != object_type:
+                continue
+            if folder is not None and cached_folder != folder:
+                continue
+            if cached_folder == exclude:
+                continue
+            del cached[key]
@@ -0,0 +1,135 @@
+"""
+Append-only journals of completed batch items.
+
+A batch writes one JSON line per confirmed item (created, existed, updated,
+...) as it goes, so an interrupted batch (Ctrl+C, a crash, a storm of 429s)
+can be resumed: the rerun re-issues only the outstanding items and takes the
+confirmed ones from the journal without checking them against SCM again.
+
+Journals are keyed by a batch id derived from the conversation thread and the
+batch request (see batch_id()). The thread's checkpoint keeps the tool call
+that started the batch, so resuming the interrupted turn, or asking for the
+same batch again in the thread, finds the journal. A journal is removed once
+its batch finishes without failures, and ignored (and removed) once it has not
+been written to for SCM_JOURNAL_MAX_AGE seconds. Batches that run outside a
+conversation thread are not journaled.
+
+- SCM_JOURNAL_DIR: journal directory (default: ~/.scm-agent/journals)
+- SCM_JOURNAL_MAX_AGE: seconds a journal stays usable (default: 86400; 0
+  keeps journals until their batch completes)
+- SCM_BATCH_JOURNAL: set to "false" to disable journaling (default: true)
+"""
+
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from src.core.config import get_config
+from src.core.results import FAILED, ItemOutcome
+
+
+def journaling_enabled() -> bool:
+    """Return True unless SCM_BATCH_JOURNAL is "false"."""
+    return get_config("SCM_BATCH_JOURNAL", default="true").lower() == "true"
+
+
+def batch_id(thread_id: Optional[str], title: str, folder: str, items: list) -> str:
+    """
+    Derive a stable batch id from the thread and the batch request.
+
+    Args:
+        thread_id: Conversation thread the batch runs in (None outside a graph run)
+        title: Operation title (e.g., "Batch address creation")
+        folder: SCM folder the batch runs in
+        items: Pydantic item configs or SCM objects of the batch
+
+    Returns:
+        A 20-character hex id; the same thread and request give the same id
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([thread_id, title, folder]).encode())
+    for item in items:
+        digest.update(item.model_dump_json().encode())
+    return digest.hexdigest()[:20]
+
+
+def _ends_with_newline(path: Path) -> bool:
+    with path.open("rb") as journal:
+        journal.seek(-1, 2)
+        return journal.read(1) == b"\n"
+
+
+class BatchJournal:
+    """
+    Append-only JSONL journal of one batch's confirmed items.
+
+    Thread-safe: batch workers record outcomes concurrently. Every line is
+    flushed as it is written, so a crash loses at most the line being written
+    (a torn last line is ignored when the journal is read back).
+
+    Attributes:
+        batch_id: Id of the batch
+        path: Journal file
+    """
+
+    def __init__(self, batch_id: str, directory: Optional[str] = None) -> None:
+        directory = directory or get_config(
+            "SCM_JOURNAL_DIR", default="~/.scm-agent/journals"
+        )
+        self.batch_id = batch_id
+        self.path = Path(directory).expanduser() / f"{batch_id}.jsonl"
+        self._lock = threading.Lock()
+        self._file: Optional[Any] = None
+
+    def is_expired(self) -> bool:
+        """Return True if the journal was last written more than SCM_JOURNAL_MAX_AGE ago."""
+        max_age = float(get_config("SCM_JOURNAL_MAX_AGE", default="86400"))
+        return max_age > 0 and time.time() - self.path.stat().st_mtime > max_age
+
+    def completed(self) -> dict[str, ItemOutcome]:
+        """Return the confirmed outcomes recorded so far, by item name."""
+        if not self.path.exists():
+            return {}
+        if self.is_expired():
+            # The folder may have changed in any way since; start the batch over
+            self.path.unlink(missing_ok=True)
+            return {}
+        outcomes = {}
+        with self.path.open(encoding="utf-8") as journal:
+            for line in journal:
+                try:
+                    outcome = ItemOutcome(**json.loads(line))
+                except (ValueError, TypeError):
+                    continue
+                outcomes[outcome.name] = outcome
+        return outcomes
+
+    def record(self, outcome: ItemOutcome) -> None:
+        """Append a confirmed outcome (failed outcomes are not recorded)."""
+        if outcome.status == FAILED:
+            return
+        line = json.dumps(outcome.to_dict()) + "\n"
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = self.path.open("a+", encoding="utf-8")
+                # Terminate a line torn by a crash so the new lines stay readable
+                if self._file.tell() and not _ends_with_newline(self.path):
+                    self._file.write("\n")
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self) -> None:
+        """Close the journal file (it stays on disk for a resume)."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def remove(self) -> None:
+        """Close and delete the journal once the batch no longer needs resuming."""
+        self.close()
+        self.path.unlink(missing_ok=True)
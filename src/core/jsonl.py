@@ -0,0 +1,313 @@
+"""
+Streaming JSONL request runner.
+
+Each input line is one request record:
+
+    {"prompt": "List all tags in Texas", "id": "r1", "thread_id": "texas",
+     "options": {"fast_path": false, "recursion_limit": 30}}
+
+Only ``prompt`` is required. Records run on a bounded worker pool and one result
+line is written per record as soon as it finishes, so results arrive in
+completion order; ``line`` and ``id`` tie each result back to its record. Input
+is read lazily and at most a fixed window of records is in flight, so memory use
+does not grow with the size of the file. Records that share a thread_id run one
+after another, in file order. astream_records() is the asyncio variant, running
+records as tasks on one event loop.
+"""
+
+import asyncio
+import json
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Optional, Union
+
+# Per-record options and the run config key each one sets
+RECORD_OPTIONS = {
+    "prompt_cache": "prompt_caching",
+    "history_budget": "history_token_budget",
+    "fast_path": "fast_path",
+    "recursion_limit": "recursion_limit",
+}
+
+
+class RecordError(ValueError):
+    """Raised when an input line is not a valid request record."""
+
+    pass
+
+
+def parse_record(line: str) -> dict:
+    """
+    Parse and validate one JSONL request record.
+
+    Args:
+        line: One line of the input file
+
+    Returns:
+        dict: The record
+
+    Raises:
+        RecordError: If the line is not a JSON object with a non-empty prompt,
+            or has unknown options
+    """
+    try:
+        record = json.loads(line)
+    except json.JSONDecodeError as e:
+        raise RecordError(f"Invalid JSON: {e}") from e
+    return validate_record(record)
+
+
+def validate_record(record: Any) -> dict:
+    """
+    Validate a decoded request record.
+
+    Args:
+        record: Decoded JSON value
+
+    Returns:
+        dict: The record
+
+    Raises:
+        RecordError: If the record is not an object with a non-empty prompt,
+            or has unknown options
+    """
+    if not isinstance(record, dict):
+        raise RecordError("Record must be a JSON object")
+    prompt = record.get("prompt")
+    if not isinstance(prompt, str) or not prompt.strip():
+        raise RecordError("Record needs a non-empty 'prompt' string")
+    thread_id = record.get("thread_id")
+    if thread_id is not None and not isinstance(thread_id, str):
+        raise RecordError("'thread_id' must be a string")
+
+    options = record.get("options") or {}
+    if not isinstance(options, dict):
+        raise RecordError("'options' must be a JSON object")
+    unknown = sorted(set(options) - set(RECORD_OPTIONS))
+    if unknown:
+        raise RecordError(f"Unknown options: {', '.join(unknown)}")
+    return record
+
+
+def read_records(
+    path: Union[str, Path],
+) -> Iterator[tuple[int, Union[dict, RecordError]]]:
+    """
+    Lazily read request records from a JSONL file.
+
+    Args:
+        path: Input file path
+
+    Yields:
+        (line number, record) pairs; invalid lines yield a RecordError instead of
+        a record. Blank lines are skipped.
+    """
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield number, parse_record(line)
+            except RecordError as e:
+                yield number, e
+
+
+def _new_result(number: int, record: dict) -> dict:
+    """Start the result of a record before it runs."""
+    return {
+        "line": number,
+        "id": record.get("id"),
+        "thread_id": record.get("thread_id"),
+        "status": "ok",
+    }
+
+
+def _invalid_result(number: int, error: RecordError) -> dict:
+    """Build the result of a line that is not a valid record."""
+    return {
+        "line": number,
+        "id": None,
+        "thread_id": None,
+        "status": "error",
+        "error": str(error),
+        "wall_time": 0.0,
+    }
+
+
+def stream_records(
+    records: Iterable[tuple[int, Union[dict, RecordError]]],
+    run_record: Callable[[dict], dict],
+    workers: int,
+) -> Iterator[dict]:
+    """
+    Run records concurrently and yield one result per record as it finishes.
+
+    Args:
+        records: (line number, record) pairs from read_records()
+        run_record: Runs one record and returns the result fields to report
+            (e.g., final_message, tool_calls, usage)
+        workers: Maximum number of records running at once
+
+    Yields:
+        dict: Result with line, id, thread_id, status ("ok" or "error"),
+        the fields returned by run_record, wall_time and error
+
+    Example:
+        >>> with open("results.jsonl", "w") as out:
+        ...     for result in stream_records(read_records("in.jsonl"), run, 4):
+        ...         out.write(json.dumps(result) + "\n")
+    """
+    workers = max(workers, 1)
+    # Keep the pool busy without reading the whole file ahead
+    max_in_flight = workers * 2
+    in_flight: dict[Future, Optional[str]] = {}
+    last_by_thread: dict[str, Future] = {}
+
+    def run(number: int, record: dict, previous: Optional[Future]) -> dict:
+        # Records of one thread run in file order; the previous one was submitted
+        # first, so it is already running or done on this FIFO pool.
+        if previous is not None:
+            previous.result()
+        started = time.perf_counter()
+        result = _new_result(number, record)
+        try:
+            result.update(run_record(record))
+            result["error"] = None
+        except Exception as e:
+            result["status"] = "error"
+            result["error"] = f"{type(e).__name__}: {e}"
+        result["wall_time"] = round(time.perf_counter() - started, 3)
+        return result
+
+    def collect(done: set[Future]) -> Iterator[dict]:
+        for future in done:
+            thread_id = in_flight.pop(future)
+            if thread_id is not None and last_by_thread.get(thread_id) is future:
+                del last_by_thread[thread_id]
+            yield future.result()
+
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scm-jsonl")
+    try:
+        for number, record in records:
+            if isinstance(record, RecordError):
+                yield _invalid_result(number, record)
+                continue
+
+            thread_id = record.get("thread_id")
+            previous = last_by_thread.get(thread_id) if thread_id else None
+            future = pool.submit(run, number, record, previous)
+            in_flight[future] = thread_id
+            if thread_id:
+                last_by_thread[thread_id] = future
+
+            if len(in_flight) >= max_in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                yield from collect(done)
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            yield from collect(done)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def astream_records(
+    records: Iterable[tuple[int, Union[dict, RecordError]]],
+    arun_record: Callable[[dict], Awaitable[dict]],
+    concurrency: int,
+) -> AsyncIterator[dict]:
+    """
+    Async variant of stream_records().
+
+    Records run as tasks on the current event loop, so ``concurrency`` can be in
+    the hundreds without a thread per record. The same in-flight window and
+    per-thread ordering apply.
+
+    Args:
+        records: (line number, record) pairs from read_records()
+        arun_record: Coroutine function that runs one record
+        concurrency: Maximum number of records running at once
+
+    Yields:
+        dict: Result per record, as in stream_records()
+    """
+    concurrency = max(concurrency, 1)
+    max_in_flight = concurrency * 2
+    running = asyncio.Semaphore(concurrency)
+    in_flight: dict[asyncio.Task, Optional[str]] = {}
+    last_by_thread: dict[str, asyncio.Task] = {}
+
+    async def run(number: int, record: dict, previous: Optional[asyncio.Task]) -> dict:
+        if previous is not None:
+            await asyncio.wait([previous])
+        async with running:
+            started = time.perf_counter()
+            result = _new_result(number, record)
+            try:
+                result.update(await arun_record(record))
+                result["error"] = None
+            except Exception as e:
+                result["status"] = "error"
+                result["error"] = f"{type(e).__name__}: {e}"
+            result["wall_time"] = round(time.perf_counter() - started, 3)
+            return result
+
+    def collect(done: set[asyncio.Task]) -> list[dict]:
+        results = []
+        for task in done:
+            thread_id = in_flight.pop(task)
+            if thread_id is not None and last_by_thread.get(thread_id) is task:
+                del last_by_thread[thread_id]
+            results.append(task.result())
+        return results
+
+    try:
+        for number, record in records:
+            if isinstance(record, RecordError):
+                yield _invalid_result(number, record)
+                continue
+
+            thread_id = record.get("thread_id")
+            previous = last_by_thread.get(thread_id) if thread_id else None
+            task = asyncio.create_task(run(number, record, previous))
+            in_flight[task] = thread_id
+            if thread_id:
+                last_by_thread[thread_id] = task
+
+            if len(in_flight) >= max_in_flight:
+                done, _ = await asyncio.wait(in_flight, return_when=FIRST_COMPLETED)
+                for result in collect(done):
+                    yield result
+
+        while in_flight:
+            done, _ = await asyncio.wait(in_flight, return_when=FIRST_COMPLETED)
+            for result in collect(done):
+                yield result
+    finally:
+        for task in in_flight:
+            task.cancel()
+
+
+def record_config(record: dict, base_config: dict, thread_id: str) -> dict:
+    """
+    Build the graph run config for a record from the session defaults.
+
+    Args:
+        record: Request record
+        base_config: Session run config (from the CLI flags)
+        thread_id: Conversation thread for the record
+
+    Returns:
+        dict: Run config with the record's options applied
+    """
+    configurable = {**base_config["configurable"], "thread_id": thread_id}
+    config = {**base_config, "configurable": configurable}
+    for option, value in (record.get("options") or {}).items():
+        key = RECORD_OPTIONS[option]
+        if key == "recursion_limit":
+            config[key] = value
+        else:
+            configurable[key] = value
+    return config
@@ -0,0 +1,325 @@
+"""
+Desired-state planning for folder objects.
+
+build_plan() compares a desired set of tags, addresses and address groups for
+one folder with the folder's snapshots and returns the minimal list of
+create/update/delete actions (a Plan). Objects that already match produce no
+action, so applying an unchanged spec costs only the snapshot listings.
+
+Desired objects are dicts in SCM field names (e.g., an address group's members
+are ``static``). Only the fields a spec sets are compared (see DIFF_FIELDS):
+tag and member lists are compared as sets, and IPs are normalized first, so
+"10.0.1.1" matches "10.0.1.1/32".
+
+Example:
+    >>> plan = build_plan("Texas", {"tag": [{"name": "prod", "color": "Red"}]}, snapshots)
+    >>> print(plan.summary())
+    Plan for 'Texas': 1 to create, 0 to update, 0 to delete, 0 unchanged
+    Estimated API calls: 4 (3 listings + 1 changes)
+    + tag: prod
+"""
+
+import ipaddress
+from typing import Any, NamedTuple, Optional
+
+from src.core.inventory import FolderSnapshot
+from src.core.results import compact_names
+
+# Plan actions
+CREATE = "create"
+UPDATE = "update"
+DELETE = "delete"
+
+# Object types in apply order (deletes run in reverse)
+PLAN_ORDER = ("tag", "address", "address_group")
+OBJECT_LABELS = {"tag": "tag", "address": "address", "address_group": "address group"}
+
+# Fields compared per object type
+DIFF_FIELDS = {
+    "tag": ("color", "comments"),
+    "address": ("ip_netmask", "description", "tag"),
+    "address_group": ("static", "description", "tag"),
+}
+
+# Fields of which an object holds exactly one (setting one clears the others)
+_EXCLUSIVE_FIELDS = {
+    "address": ("ip_netmask", "ip_range", "ip_wildcard", "fqdn"),
+    "address_group": ("static", "dynamic"),
+}
+
+_SET_FIELDS = ("tag", "static")
+
+_ACTION_MARKS = {CREATE: "+", UPDATE: "~", DELETE: "-"}
+
+
+class PlanAction(NamedTuple):
+    """
+    One planned change.
+
+    Attributes:
+        action: CREATE, UPDATE or DELETE
+        object_type: "tag", "address" or "address_group"
+        name: Object name
+        config: Full desired config (CREATE) or the changed fields (UPDATE)
+        current: Existing object (UPDATE and DELETE)
+        error: Why the action cannot be applied (None if it can)
+    """
+
+    action: str
+    object_type: str
+    name: str
+    config: dict
+    current: Any = None
+    error: Optional[str] = None
+
+    def describe(self) -> str:
+        """Name with the changed fields of an update (e.g., "web_01 (tag)")."""
+        if self.action == UPDATE and self.config:
+            return f"{self.name} ({', '.join(self.config)})"
+        return self.name
+
+
+def _normalize(field: str, value: Any) -> Any:
+    """Comparable form of a field value."""
+    if value in (None, ""):
+        return None
+    if field in _SET_FIELDS:
+        return frozenset(value) or None
+    if field == "ip_netmask":
+        try:
+            return ipaddress.ip_interface(value)
+        except ValueError:
+            return value
+    return value
+
+
+def diff_object(object_type: str, desired: dict, current: Any) -> dict:
+    """
+    Return the fields of ``desired`` that differ from the existing object.
+
+    Args:
+        object_type: "tag", "address" or "address_group"
+        desired: Desired config in SCM field names
+        current: Existing SCM object
+
+    Returns:
+        dict: Changed fields with their desired values (empty if in sync)
+    """
+    return {
+        field: desired[field]
+        for field in DIFF_FIELDS[object_type]
+        if field in desired
+        and _normalize(field, desired[field])
+        != _normalize(field, getattr(current, field, None))
+    }
+
+
+def updated_object(action: PlanAction) -> Any:
+    """
+    Build the object to send for an UPDATE action.
+
+    The existing object is copied with the changed fields applied; setting one
+    of a set of exclusive fields (e.g., ``ip_netmask`` on an FQDN address)
+    clears the others.
+    """
+    data = action.current.model_dump(exclude_none=True)
+    exclusive = _EXCLUSIVE_FIELDS.get(action.object_type, ())
+    if any(field in exclusive for field in action.config):
+        for field in exclusive:
+            data.pop(field, None)
+    data.update(action.config)
+    return type(action.current)(**data)
+
+
+class Plan:
+    """
+    Minimal set of changes that brings a folder to its desired state.
+
+    Attributes:
+        folder: SCM folder the plan is for
+        actions: Planned actions in apply order
+        unchanged: Names of desired objects already in sync, per object type
+        listings: Folder listings the plan was built from
+    """
+
+    def __init__(
+        self,
+        folder: str,
+        actions: list[PlanAction],
+        unchanged: dict[str, list[str]],
+        listings: int,
+    ) -> None:
+        self.folder = folder
+        self.actions = actions
+        self.unchanged = unchanged
+        self.listings = listings
+
+    def of(self, action: str, object_type: Optional[str] = None) -> list[PlanAction]:
+        """Valid actions of one kind (and object type)."""
+        return [
+            a
+            for a in self.actions
+            if a.action == action
+            and a.error is None
+            and (object_type is None or a.object_type == object_type)
+        ]
+
+    @property
+    def invalid(self) -> list[PlanAction]:
+        """Actions that cannot be applied."""
+        return [a for a in self.actions if a.error is not None]
+
+    @property
+    def changes(self) -> int:
+        """Number of valid actions (one API call each)."""
+        return sum(a.error is None for a in self.actions)
+
+    @property
+    def api_calls(self) -> int:
+        """Estimated API calls to build and apply the plan."""
+        return self.listings + self.changes
+
+    def waves(self) -> list[list[PlanAction]]:
+        """
+        Creates and updates grouped into waves that can each run concurrently.
+
+        Tags come before addresses and addresses before groups; groups nested in
+        groups created by the same plan wait for a later wave.
+        """
+        waves = []
+        for object_type in PLAN_ORDER:
+            pending = self.of(CREATE, object_type) + self.of(UPDATE, object_type)
+            while pending:
+                names = {a.name for a in pending}
+                ready = [
+                    a
+                    for a in pending
+                    if not names.intersection(a.config.get("static") or [])
+                ] or pending
+                waves.append(ready)
+                done = {id(a) for a in ready}
+                pending = [a for a in pending if id(a) not in done]
+        return waves
+
+    def summary(self, max_items: int = 20) -> str:
+        """Size-bounded plan description for the model."""
+        unchanged = sum(len(names) for names in self.unchanged.values())
+        lines = [
+            f"Plan for '{self.folder}': {len(self.of(CREATE))} to create, "
+            f"{len(self.of(UPDATE))} to update, {len(self.of(DELETE))} to delete, "
+            f"{unchanged} unchanged",
+            f"Estimated API calls: {self.api_calls} ({self.listings} listings + "
+            f"{self.changes} changes)",
+        ]
+        for action in (CREATE, UPDATE, DELETE):
+            for object_type in PLAN_ORDER:
+                names = [a.describe() for a in self.of(action, object_type)]
+                if names:
+                    lines.append(
+                        f"{_ACTION_MARKS[action]} {OBJECT_LABELS[object_type]}: "
+                        f"{compact_names(names, max_items)}"
+                    )
+        for action in self.invalid:
+            lines.append(
+                f"⚠️  {OBJECT_LABELS[action.object_type]} {action.name}: {action.error}"
+            )
+        if not self.changes and not self.invalid:
+            lines.append("✅ Folder already matches the desired state")
+        return "\n".join(lines)
+
+    def to_dict(self) -> dict:
+        """
+        Return the machine-readable form of the plan.
+
+        Returns:
+            Dictionary with folder, api_calls, listings, actions (action,
+            object_type, name, changed fields and error) and unchanged names
+        """
+        return {
+            "folder": self.folder,
+            "api_calls": self.api_calls,
+            "listings": self.listings,
+            "actions": [
+                {
+                    "action": a.action,
+                    "object_type": a.object_type,
+                    "name": a.name,
+                    **({"fields": sorted(a.config)} if a.action == UPDATE else {}),
+                    **({"error": a.error} if a.error else {}),
+                }
+                for a in self.actions
+            ],
+            "unchanged": self.unchanged,
+        }
+
+
+def build_plan(
+    folder: str,
+    desired: dict[str, list[dict]],
+    snapshots: dict[str, FolderSnapshot],
+    prune: bool = False,
+) -> Plan:
+    """
+    Diff the desired objects of a folder against its snapshots.
+
+    Args:
+        folder: SCM folder name
+        desired: Desired configs per object type (SCM field names)
+        snapshots: Folder snapshot per object type; every type in PLAN_ORDER
+            is expected. Inherited objects count as existing but are never
+            updated or pruned
+        prune: Also delete objects of the folder that the spec does not list
+
+    Returns:
+        Plan: Actions in apply order (creates/updates by PLAN_ORDER, then
+        deletes in reverse order)
+    """
+    existing = {
+        object_type: {obj.name: obj for obj in snapshots[object_type]}
+        for object_type in PLAN_ORDER
+    }
+    desired_names = {
+        object_type: {config["name"] for config in desired.get(object_type, [])}
+        for object_type in PLAN_ORDER
+    }
+    known_members = (
+        existing["address"].keys()
+        | existing["address_group"].keys()
+        | desired_names["address"]
+        | desired_names["address_group"]
+    )
+
+    actions = []
+    unchanged: dict[str, list[str]] = {}
+    for object_type in PLAN_ORDER:
+        for config in desired.get(object_type, []):
+            name = config["name"]
+            error = None
+            missing = [m for m in config.get("static") or [] if m not in known_members]
+            if missing:
+                error = f"missing members {', '.join(missing)}"
+
+            current = existing[object_type].get(name)
+            if current is None:
+                actions.append(
+                    PlanAction(CREATE, object_type, name, config, error=error)
+                )
+                continue
+            changes = diff_object(object_type, config, current)
+            if not changes:
+                unchanged.setdefault(object_type, []).append(name)
+                continue
+            parent = snapshots[object_type].inherited_from(name)
+            if parent:
+                error = f"defined in parent folder '{parent}'"
+            actions.append(
+                PlanAction(UPDATE, object_type, name, changes, current, error)
+            )
+
+    if prune:
+        for object_type in reversed(PLAN_ORDER):
+            for obj in snapshots[object_type].own():
+                if obj.name not in desired_names[object_type]:
+                    actions.append(PlanAction(DELETE, object_type, obj.name, {}, obj))
+
+    return Plan(folder, actions, unchanged, len(snapshots))
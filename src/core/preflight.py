@@ -0,0 +1,213 @@
+"""
+Pre-flight validation of batch payloads.
+
+preflight() checks a whole batch in one pass before any API call, so problems
+that would otherwise come back one SCM round trip at a time are all reported
+together:
+
+- names: SCM length limits and allowed characters per object type
+- duplicate names inside the batch, and duplicate addresses (compared after
+  normalization, so "10.0.1.1" and "10.0.1.1/32" are the same address)
+- IPs: parsed with ``ipaddress`` (rejects values like "999.1.1.1/40") and
+  normalized to "address/prefix" form
+- tag colors: checked against the SDK's color list
+- tag references: checked against the folder's tag index
+- description and comment lengths
+
+Example:
+    >>> configs, problems = preflight("address", request.addresses, tag_names)
+    >>> if problems:
+    ...     return format_problems("Batch address creation", problems, len(configs))
+"""
+
+import ipaddress
+import re
+from collections.abc import Collection, Sequence
+from typing import Any, NamedTuple, Optional
+
+from scm.models.objects.tag import Colors
+from scm.utils.tag_colors import normalize_color_name
+
+from src.core.results import compact_names
+
+# Object type -> (maximum name length, allowed characters), as enforced by SCM
+NAME_RULES = {
+    "tag": (127, r"a-zA-Z0-9_ .\-\[\]&():"),
+    "address": (63, r"a-zA-Z0-9_ .\-"),
+    "address_group": (63, r"a-zA-Z0-9_ .\-"),
+}
+_NAME_PATTERNS = {
+    object_type: re.compile(f"[^{chars}]")
+    for object_type, (_, chars) in NAME_RULES.items()
+}
+_ALLOWED_CHARS = {
+    "tag": "letters, digits, spaces and _ . - [ ] & ( ) :",
+    "address": "letters, digits, spaces and _ . -",
+    "address_group": "letters, digits, spaces and _ . -",
+}
+
+# Maximum length of descriptions and tag comments
+MAX_TEXT_LENGTH = 1023
+
+
+class Problem(NamedTuple):
+    """
+    One pre-flight finding.
+
+    Attributes:
+        index: 1-based position of the item in the batch
+        name: Item name
+        message: What is wrong (e.g., "unknown tags: Prod")
+    """
+
+    index: int
+    name: str
+    message: str
+
+
+def check_name(object_type: str, name: str) -> Optional[str]:
+    """Return why ``name`` is not a valid SCM name for the type (None if it is)."""
+    max_length, _ = NAME_RULES[object_type]
+    if not name.strip():
+        return "name is empty"
+    if len(name) > max_length:
+        return f"name is {len(name)} characters, more than {max_length}"
+    invalid = sorted(set(_NAME_PATTERNS[object_type].findall(name)))
+    if invalid:
+        return (
+            f"name has invalid characters {' '.join(repr(c) for c in invalid)} "
+            f"(allowed: {_ALLOWED_CHARS[object_type]})"
+        )
+    return None
+
+
+def normalize_ip_netmask(value: str) -> str:
+    """
+    Parse an IP address or network and return it as "address/prefix".
+
+    Args:
+        value: IPv4 or IPv6 address, with or without a prefix length
+
+    Returns:
+        Normalized value (e.g., "10.0.1.1" -> "10.0.1.1/32")
+
+    Raises:
+        ValueError: If the value is not a valid address or network
+    """
+    try:
+        return str(ipaddress.ip_interface(value.strip()))
+    except ValueError:
+        raise ValueError(f"'{value}' is not a valid IP address or network") from None
+
+
+def preflight(
+    object_type: str,
+    configs: Sequence[Any],
+    known_tags: Optional[Collection[str]] = None,
+) -> tuple[list, list[Problem]]:
+    """
+    Validate every item of a batch in one pass.
+
+    Args:
+        object_type: "tag", "address" or "address_group"
+        configs: Pydantic item configs of the batch
+        known_tags: Tag names available in the folder; tag references are not
+            checked when None
+
+    Returns:
+        Tuple of (configs with normalized values, every problem found)
+    """
+    checked = []
+    problems = []
+    names: dict[str, int] = {}
+    values: dict[str, tuple[int, str]] = {}
+
+    for index, config in enumerate(configs, 1):
+        name = config.name
+        messages = []
+
+        message = check_name(object_type, name)
+        if message:
+            messages.append(message)
+        if name in names:
+            messages.append(f"duplicate name (also item {names[name]})")
+        else:
+            names[name] = index
+
+        update = {}
+        if object_type == "address":
+            try:
+                value = normalize_ip_netmask(config.ip_netmask)
+            except ValueError:
+                # Generic message so items with bad IPs are grouped together
+                messages.append("ip_netmask is not a valid IP address or network")
+            else:
+                update["ip_netmask"] = value
+                if value in values:
+                    first_index, first_name = values[value]
+                    messages.append(
+                        f"duplicate address {value} (also item {first_index}, "
+                        f"{first_name})"
+                    )
+                else:
+                    values[value] = (index, name)
+
+        if object_type == "tag":
+            if Colors.from_normalized_name(normalize_color_name(config.color)) is None:
+                messages.append(f"unknown color '{config.color}'")
+
+        for field in ("description", "comments"):
+            text = getattr(config, field, None) or ""
+            if len(text) > MAX_TEXT_LENGTH:
+                messages.append(
+                    f"{field} is {len(text)} characters, more than {MAX_TEXT_LENGTH}"
+                )
+
+        if known_tags is not None:
+            unknown = [
+                tag
+                for tag in getattr(config, "tag", None) or []
+                if tag not in known_tags
+            ]
+            if unknown:
+                messages.append(f"unknown tags: {', '.join(unknown)}")
+
+        problems += [Problem(index, name, message) for message in messages]
+        checked.append(config.model_copy(update=update) if update else config)
+
+    return checked, problems
+
+
+def format_problems(
+    title: str, problems: list[Problem], total: int, max_lines: int = 30
+) -> str:
+    """
+    Describe pre-flight problems compactly, grouping items with the same problem.
+
+    Args:
+        title: Operation title (e.g., "Batch address creation")
+        problems: Problems from preflight()
+        total: Number of items in the batch
+        max_lines: Maximum number of distinct problems to list
+
+    Returns:
+        Error text for the model, listing every kind of problem with the items
+        it affects (e.g., "web_001..web_950: unknown tags: Prod")
+    """
+    by_message: dict[str, list[str]] = {}
+    for problem in problems:
+        by_message.setdefault(problem.message, []).append(
+            problem.name or f"#{problem.index}"
+        )
+
+    items = len({problem.index for problem in problems})
+    lines = [
+        f"❌ {title} failed pre-flight validation: {len(problems)} problems in "
+        f"{items} of {total} items. Nothing was sent to SCM; fix the items and "
+        f"retry the whole batch."
+    ]
+    for message, names in list(by_message.items())[:max_lines]:
+        lines.append(f"• {compact_names(names, max_items=5)}: {message}")
+    if len(by_message) > max_lines:
+        lines.append(f"• ... ({len(by_message) - max_lines} more kinds of problems)")
+    return "\n".join(lines)
@@ -0,0 +1,296 @@
+"""
+Latency instrumentation for graph runs.
+
+SpanRecorder is a LangChain callback handler that records wall time for every
+graph node, chat model call and tool invocation of the runs it is attached to.
+SCM HTTP requests are recorded by a response hook on the pooled clients'
+sessions (see instrument_scm_client()), which finds the recorder through the
+run config of the tool making the request. Every span is tagged with the
+conversation thread_id and the graph step it ran in.
+
+Example:
+    >>> recorder = SpanRecorder()
+    >>> app.invoke(inputs, config={**config, "callbacks": [recorder]})
+    >>> summarize_spans(recorder.spans)
+"""
+
+import json
+import math
+import re
+import threading
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any, NamedTuple, Optional, Union
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.runnables.config import var_child_runnable_config
+
+# Object ids in SCM URLs, collapsed so requests aggregate per endpoint
+_URL_ID = re.compile(
+    r"/[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.IGNORECASE
+)
+
+SPAN_KINDS = ("node", "model", "tool", "scm")
+
+
+class Span(NamedTuple):
+    """
+    One timed operation.
+
+    Attributes:
+        kind: "node", "model", "tool" or "scm"
+        name: Node name, model name, tool name or "METHOD /path" of the request
+        thread_id: Conversation thread the operation ran in (None if unknown)
+        step: Graph step the operation ran in (None if unknown)
+        start: Start time (epoch seconds)
+        duration: Wall time in seconds
+        status: "ok" or "error" (the HTTP status code for scm spans)
+    """
+
+    kind: str
+    name: str
+    thread_id: Optional[str]
+    step: Optional[int]
+    start: float
+    duration: float
+    status: str
+
+
+class SpanRecorder(BaseCallbackHandler):
+    """
+    Callback handler that records node, model, tool and SCM request spans.
+
+    The recorder is thread-safe and can be shared by concurrent runs; spans of
+    different runs are told apart by thread_id.
+
+    Attributes:
+        spans: Finished spans in completion order
+    """
+
+    def __init__(self) -> None:
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+        # run_id -> (kind, name, thread_id, step, start epoch, start perf_counter)
+        self._open: dict[UUID, tuple] = {}
+
+    def _start(
+        self, run_id: UUID, kind: str, name: str, metadata: Optional[dict]
+    ) -> None:
+        metadata = metadata or {}
+        with self._lock:
+            self._open[run_id] = (
+                kind,
+                name,
+                metadata.get("thread_id"),
+                metadata.get("langgraph_step"),
+                time.time(),
+                time.perf_counter(),
+            )
+
+    def _end(self, run_id: UUID, status: str = "ok") -> None:
+        finished = time.perf_counter()
+        with self._lock:
+            opened = self._open.pop(run_id, None)
+            if opened is None:
+                return
+            kind, name, thread_id, step, start, started = opened
+            self.spans.append(
+                Span(kind, name, thread_id, step, start, finished - started, status)
+            )
+
+    def add(self, span: Span) -> None:
+        """Record a span measured elsewhere (e.g., an SCM request)."""
+        with self._lock:
+            self.spans.append(span)
+
+    # Graph nodes: the outermost chain run named after the node of its task
+
+    def on_chain_start(
+        self,
+        serialized: dict,
+        inputs: Any,
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        metadata: Optional[dict] = None,
+        **kwargs: Any,
+    ) -> None:
+        node = (metadata or {}).get("langgraph_node")
+        if node is None or kwargs.get("name") != node:
+            return
+        if parent_run_id in self._open and self._open[parent_run_id][0] == "node":
+            return
+        self._start(run_id, "node", node, metadata)
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id)
+
+    def on_chain_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._end(run_id, "error")
+
+    # Chat model calls
+
+    def on_chat_model_start(
+        self,
+        serialized: dict,
+        messages: list,
+        *,
+        run_id: UUID,
+        metadata: Optional[dict] = None,
+        **kwargs: Any,
+    ) -> None:
+        name = (metadata or {}).get("ls_model_name") or kwargs.get("name") or "model"
+        self._start(run_id, "model", name, metadata)
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id)
+
+    def on_llm_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._end(run_id, "error")
+
+    # Tool invocations
+
+    def on_tool_start(
+        self,
+        serialized: dict,
+        input_str: str,
+        *,
+        run_id: UUID,
+        metadata: Optional[dict] = None,
+        **kwargs: Any,
+    ) -> None:
+        name = (serialized or {}).get("name") or kwargs.get("name") or "tool"
+        self._start(run_id, "tool", name, metadata)
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        content = getattr(output, "content", output)
+        failed = getattr(output, "status", None) == "error" or (
+            isinstance(content, str) and content.startswith("❌")
+        )
+        self._end(run_id, "error" if failed else "ok")
+
+    def on_tool_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._end(run_id, "error")
+
+
+def _active_recorders() -> tuple[list[SpanRecorder], dict]:
+    """Return the recorders attached to the current run and its metadata."""
+    config = var_child_runnable_config.get() or {}
+    callbacks = config.get("callbacks")
+    handlers = getattr(callbacks, "handlers", callbacks) or []
+    recorders = [h for h in handlers if isinstance(h, SpanRecorder)]
+    return recorders, config.get("metadata") or {}
+
+
+def _record_response(response: Any, *args: Any, **kwargs: Any) -> None:
+    """requests response hook that records the request as an scm span."""
+    recorders, metadata = _active_recorders()
+    if not recorders:
+        return
+    request = response.request
+    path = _URL_ID.sub("/{id}", request.path_url.split("?", 1)[0])
+    duration = response.elapsed.total_seconds()
+    span = Span(
+        "scm",
+        f"{request.method} {path}",
+        metadata.get("thread_id"),
+        metadata.get("langgraph_step"),
+        time.time() - duration,
+        duration,
+        str(response.status_code),
+    )
+    for recorder in recorders:
+        recorder.add(span)
+
+
+def instrument_scm_client(client: Any) -> None:
+    """
+    Record the client's HTTP requests in the SpanRecorder of the calling run.
+
+    Requests made outside a recorded run cost one context lookup. Instrumenting
+    a client twice has no further effect.
+
+    Args:
+        client: ScmClient (or any object with a requests ``session``)
+    """
+    session = getattr(client, "session", None)
+    hooks = getattr(session, "hooks", None)
+    if hooks is None:
+        return
+    response_hooks = hooks.setdefault("response", [])
+    if _record_response not in response_hooks:
+        response_hooks.append(_record_response)
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of ``values`` (``fraction`` between 0 and 1)."""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+
+def summarize_spans(spans: Iterable[Span]) -> list[dict]:
+    """
+    Aggregate spans per kind and name.
+
+    Args:
+        spans: Spans to aggregate
+
+    Returns:
+        list[dict]: One row per (kind, name) with count, errors, total, p50, p95
+        and max seconds, ordered by kind and then by total time (largest first)
+
+    Example:
+        >>> summarize_spans(recorder.spans)[0]
+        {'kind': 'node', 'name': 'agent', 'count': 3, 'errors': 0, 'total': 4.2, ...}
+    """
+    groups: dict[tuple[str, str], list[Span]] = {}
+    for span in spans:
+        groups.setdefault((span.kind, span.name), []).append(span)
+
+    rows = []
+    for (kind, name), group in groups.items():
+        durations = [span.duration for span in group]
+        rows.append(
+            {
+                "kind": kind,
+                "name": name,
+                "count": len(group),
+                "errors": sum(
+                    span.status == "error" or span.status.startswith(("4", "5"))
+                    for span in group
+                ),
+                "total": sum(durations),
+                "p50": percentile(durations, 0.5),
+                "p95": percentile(durations, 0.95),
+                "max": max(durations),
+            }
+        )
+    rows.sort(key=lambda row: (SPAN_KINDS.index(row["kind"]), -row["total"]))
+    return rows
+
+
+def write_spans(spans: Iterable[Span], path: Union[str, Path]) -> int:
+    """
+    Write spans to a JSONL file, one object per span.
+
+    Args:
+        spans: Spans to write
+        path: Output file (overwritten)
+
+    Returns:
+        Number of spans written
+    """
+    count = 0
+    with Path(path).open("w", encoding="utf-8") as out:
+        for span in spans:
+            out.write(json.dumps(span._asdict(), default=str) + "\n")
+            count += 1
+    return count
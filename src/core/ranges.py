@@ -0,0 +1,165 @@
+"""
+Local expansion of IP range specs into address objects.
+
+A request such as "addresses for 10.0.1.1 through 10.0.1.20" is sent by the
+model as one compact spec (start/end or CIDR plus naming and description
+templates) and expanded here with ``ipaddress``, so the model's output does not
+grow with the number of addresses. Templates are ``str.format`` strings with:
+
+- ``{ip}``: the address (e.g., "10.0.1.7")
+- ``{ip_dashed}``: the address with dashes (e.g., "10-0-1-7")
+- ``{index}``: 1-based position in the range (supports format specs, e.g.,
+  ``{index:03d}``)
+
+SCM_RANGE_MAX_ADDRESSES caps the size of one expansion (default: 10000).
+"""
+
+import ipaddress
+from typing import Optional
+
+from src.core.config import get_config
+
+TEMPLATE_FIELDS = ("ip", "ip_dashed", "index")
+
+
+def expand_ip_range(
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    cidr: Optional[str] = None,
+    max_addresses: Optional[int] = None,
+) -> list[ipaddress.IPv4Address]:
+    """
+    Expand an inclusive start/end range or a CIDR block to IPv4 addresses.
+
+    CIDR blocks expand to their usable host addresses (network and broadcast
+    addresses are left out, except for /31 and /32).
+
+    Args:
+        start: First address of the range (with ``end``)
+        end: Last address of the range, inclusive
+        cidr: Network to expand instead of start/end (e.g., "10.0.2.0/28")
+        max_addresses: Largest allowed expansion
+            (default: SCM_RANGE_MAX_ADDRESSES or 10000)
+
+    Returns:
+        list[IPv4Address]: Addresses in ascending order
+
+    Raises:
+        ValueError: If the spec is incomplete, invalid, not IPv4, reversed or
+            larger than ``max_addresses``
+
+    Example:
+        >>> [str(ip) for ip in expand_ip_range("10.0.1.1", "10.0.1.3")]
+        ['10.0.1.1', '10.0.1.2', '10.0.1.3']
+    """
+    if max_addresses is None:
+        max_addresses = int(get_config("SCM_RANGE_MAX_ADDRESSES", default="10000"))
+
+    if cidr:
+        if start or end:
+            raise ValueError("Give either cidr or start/end, not both")
+        network = ipaddress.ip_network(cidr.strip(), strict=False)
+        if network.version != 4:
+            raise ValueError(f"Only IPv4 ranges are supported, got {cidr}")
+        count = network.num_addresses
+        if network.prefixlen < 31:
+            count -= 2
+        _check_size(count, max_addresses)
+        return list(network.hosts())
+
+    if not (start and end):
+        raise ValueError("Give a cidr or both start and end addresses")
+    first = ipaddress.ip_address(start.strip())
+    last = ipaddress.ip_address(end.strip())
+    if first.version != 4 or last.version != 4:
+        raise ValueError(f"Only IPv4 ranges are supported, got {start} - {end}")
+    if last < first:
+        raise ValueError(f"Range end {last} is before its start {first}")
+    _check_size(int(last) - int(first) + 1, max_addresses)
+    return [ipaddress.IPv4Address(value) for value in range(int(first), int(last) + 1)]
+
+
+def _check_size(count: int, max_addresses: int) -> None:
+    if count > max_addresses:
+        raise ValueError(
+            f"Range has {count} addresses, more than the limit of {max_addresses}"
+        )
+
+
+def render_template(template: str, ip: ipaddress.IPv4Address, index: int) -> str:
+    """
+    Fill a name or description template for one address.
+
+    Args:
+        template: ``str.format`` template using TEMPLATE_FIELDS
+        ip: Address being named
+        index: 1-based position of the address in its range
+
+    Returns:
+        The rendered string
+
+    Raises:
+        ValueError: If the template uses an unknown field or is malformed
+    """
+    try:
+        return template.format(
+            ip=str(ip), ip_dashed=str(ip).replace(".", "-"), index=index
+        )
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError) as e:
+        # e.g. "{ip.x}" (AttributeError) or "{index[0]}" (TypeError)
+        raise ValueError(
+            f"Invalid template {template!r}: {e}. "
+            f"Available fields: {', '.join(TEMPLATE_FIELDS)}"
+        ) from e
+
+
+def expand_address_range(
+    name_template: str,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    cidr: Optional[str] = None,
+    description_template: str = "",
+    max_addresses: Optional[int] = None,
+) -> list[dict]:
+    """
+    Expand a range spec into address object configs.
+
+    Args:
+        name_template: Template for object names (e.g., "web_{index:02d}")
+        start: First address of the range (with ``end``)
+        end: Last address of the range, inclusive
+        cidr: Network to expand instead of start/end
+        description_template: Template for descriptions (empty for none)
+        max_addresses: Largest allowed expansion
+
+    Returns:
+        list[dict]: One dict per address with name, ip_netmask (/32) and
+        description
+
+    Raises:
+        ValueError: If the spec or a template is invalid, or the templates
+            give two addresses the same name
+
+    Example:
+        >>> expand_address_range("web_{index:02d}", start="10.0.1.1", end="10.0.1.2")
+        [{'name': 'web_01', 'ip_netmask': '10.0.1.1/32', 'description': ''},
+         {'name': 'web_02', 'ip_netmask': '10.0.1.2/32', 'description': ''}]
+    """
+    addresses = []
+    seen = set()
+    for index, ip in enumerate(expand_ip_range(start, end, cidr, max_addresses), 1):
+        name = render_template(name_template, ip, index)
+        if name in seen:
+            raise ValueError(
+                f"Name template {name_template!r} gives more than one address the "
+                f"name {name!r}; use {{ip}}, {{ip_dashed}} or {{index}}"
+            )
+        seen.add(name)
+        addresses.append(
+            {
+                "name": name,
+                "ip_netmask": f"{ip}/32",
+                "description": render_template(description_template, ip, index),
+            }
+        )
+    return addresses
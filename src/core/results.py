@@ -0,0 +1,256 @@
+"""
+Typed batch results and their compact formatting.
+
+Batch tools can touch thousands of objects. Each item ends as an ItemOutcome
+(e.g., created, existed or failed, with the object id or the error), and a
+BatchResult groups them by status once. From that one structure come:
+
+- summary(): the size-bounded text sent back to the model (counts, name ranges
+  such as "web_001..web_950", and the first few failures)
+- detail(): the full per-object listing shown by the CLI (--details)
+- to_dict(): the machine-readable form kept as the tool artifact and reported
+  by the JSONL runner and the HTTP server
+"""
+
+import re
+from typing import Any, NamedTuple, Optional
+
+_NUMBERED_NAME = re.compile(r"^(.*?)(\d+)$")
+
+
+def compact_names(names: list[str], max_items: int = 20) -> str:
+    """
+    Collapse names with consecutive numeric suffixes into ranges.
+
+    Args:
+        names: Object names in batch order
+        max_items: Maximum number of names or ranges to list
+
+    Returns:
+        Comma-separated names and ranges, with a count of anything left out
+
+    Example:
+        >>> compact_names(["web_001", "web_002", "web_003", "db"])
+        'web_001..web_003, db'
+    """
+    parts = []
+    run_start = run_end = None
+    run_prefix, run_width, run_number = None, 0, 0
+    # Zero-padded runs (web_01) keep their width; unpadded runs (n9, n10) grow
+    run_padded = False
+
+    def close_run():
+        if run_start is None:
+            return
+        if run_start == run_end:
+            parts.append(run_start)
+        else:
+            parts.append(f"{run_start}..{run_end}")
+
+    for name in names:
+        match = _NUMBERED_NAME.match(name)
+        if match:
+            prefix, digits = match.groups()
+            number = int(digits)
+            same_format = (
+                len(digits) == run_width if run_padded else digits == str(number)
+            )
+            if (
+                run_start is not None
+                and prefix == run_prefix
+                and same_format
+                and number == run_number + 1
+            ):
+                run_end, run_number = name, number
+                continue
+            close_run()
+            run_start = run_end = name
+            run_prefix, run_width, run_number = prefix, len(digits), number
+            run_padded = digits != str(number)
+        else:
+            close_run()
+            run_start = None
+            parts.append(name)
+    close_run()
+
+    if len(parts) > max_items:
+        hidden = len(parts) - max_items
+        return ", ".join(parts[:max_items]) + f", ... ({hidden} more)"
+    return ", ".join(parts)
+
+
+# Item statuses
+CREATED = "created"
+EXISTED = "existed"
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+DELETED = "deleted"
+SKIPPED = "skipped"
+FAILED = "failed"
+
+# Statuses reported by each kind of batch, in summary order
+STATUSES = (CREATED, EXISTED, FAILED)
+UPDATE_STATUSES = (UPDATED, UNCHANGED, FAILED)
+DELETE_STATUSES = (DELETED, SKIPPED, FAILED)
+APPLY_STATUSES = (CREATED, UPDATED, UNCHANGED, DELETED, SKIPPED, FAILED)
+
+# Status -> (count label, icon)
+STATUS_LABELS = {
+    CREATED: ("created", "✅"),
+    EXISTED: ("already existed", "⏭️ "),
+    UPDATED: ("updated", "✅"),
+    UNCHANGED: ("unchanged", "⏭️ "),
+    DELETED: ("deleted", "🗑️ "),
+    SKIPPED: ("skipped", "⏭️ "),
+    FAILED: ("failed", "❌"),
+}
+
+# Statuses whose reason (the outcome's info) is part of the model summary
+_SUMMARY_WITH_INFO = (SKIPPED,)
+
+
+class ItemOutcome(NamedTuple):
+    """
+    Outcome of one batch item.
+
+    Attributes:
+        name: Object name
+        status: One of the item statuses (e.g., CREATED, EXISTED or FAILED)
+        id: Object id (when known)
+        info: Short description shown after the name (e.g., "10.0.1.10/32")
+        error: Error message (failed items only)
+    """
+
+    name: str
+    status: str
+    id: Optional[str] = None
+    info: str = ""
+    error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        """Return the outcome as a dict without empty fields."""
+        return {key: value for key, value in self._asdict().items() if value}
+
+
+class BatchResult:
+    """
+    Per-item outcomes of one batch operation, grouped by status.
+
+    Attributes:
+        title: Operation title (e.g., "Batch address creation")
+        folder: SCM folder the batch ran in
+        outcomes: Outcomes in request order
+        statuses: Statuses the operation reports, in summary order
+            (STATUSES for creation, UPDATE_STATUSES for updates,
+            DELETE_STATUSES for deletion, APPLY_STATUSES for desired state)
+        by_status: Outcomes per status
+    """
+
+    def __init__(
+        self,
+        title: str,
+        folder: str,
+        outcomes: list[ItemOutcome],
+        statuses: tuple[str, ...] = STATUSES,
+    ) -> None:
+        self.title = title
+        self.folder = folder
+        self.outcomes = outcomes
+        self.statuses = statuses
+        self.by_status: dict[str, list[ItemOutcome]] = {s: [] for s in statuses}
+        for outcome in outcomes:
+            self.by_status[outcome.status].append(outcome)
+
+    @property
+    def counts(self) -> dict[str, int]:
+        """Number of items per status."""
+        return {status: len(items) for status, items in self.by_status.items()}
+
+    def _header(self) -> str:
+        counts = ", ".join(
+            f"{count} {STATUS_LABELS[status][0]}"
+            for status, count in self.counts.items()
+        )
+        return f"{self.title}: {counts}"
+
+    def summary(self, max_failures: int = 10) -> str:
+        """
+        Size-bounded summary for the model.
+
+        Args:
+            max_failures: Maximum number of failures to list individually
+
+        Returns:
+            Summary with counts, compacted name ranges (with reasons for skipped
+            items) and the first failures
+        """
+        groups = [
+            (
+                f"{STATUS_LABELS[status][1]} {STATUS_LABELS[status][0].capitalize()}",
+                [
+                    (
+                        f"{outcome.name} ({outcome.info})"
+                        if status in _SUMMARY_WITH_INFO and outcome.info
+                        else outcome.name
+                    )
+                    for outcome in self.by_status[status]
+                ],
+            )
+            for status in self.statuses
+            if status != FAILED
+        ]
+        lines = [self._header()]
+        lines.extend(
+            f"{label}: {compact_names(names)}" for label, names in groups if names
+        )
+
+        failed = self.by_status.get(FAILED, [])
+        if failed:
+            shown = failed[:max_failures]
+            errors = "Errors:"
+            if len(failed) > len(shown):
+                errors = f"Errors (first {len(shown)} of {len(failed)}):"
+            lines.append(errors)
+            lines.extend(f"❌ {outcome.name}: {outcome.error}" for outcome in shown)
+        return "\n".join(lines)
+
+    def detail(self) -> str:
+        """Full per-object listing, one line per item."""
+        lines = [self._header(), ""]
+        for outcome in self.outcomes:
+            if outcome.status == FAILED:
+                continue
+            info = f" ({outcome.info})" if outcome.info else ""
+            lines.append(f"{STATUS_LABELS[outcome.status][1]} {outcome.name}{info}")
+        if self.by_status.get(FAILED):
+            lines += ["", "Errors:"]
+            lines.extend(
+                f"❌ {outcome.name}: {outcome.error}"
+                for outcome in self.by_status[FAILED]
+            )
+        return "\n".join(lines)
+
+    def to_dict(self) -> dict:
+        """
+        Return the machine-readable form of the result.
+
+        Returns:
+            Dictionary with operation, folder, counts and items (one dict per
+            item with name, status and, when set, id, info and error)
+        """
+        return {
+            "operation": self.title,
+            "folder": self.folder,
+            "counts": self.counts,
+            "items": [outcome.to_dict() for outcome in self.outcomes],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "BatchResult":
+        """Rebuild a result from to_dict() output (e.g., a stored tool artifact)."""
+        return cls(
+            data["operation"],
+            data["folder"],
+            [ItemOutcome(**item) for item in data["items"]],
+            tuple(data["counts"]),
+        )
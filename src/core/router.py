@@ -0,0 +1,118 @@
+"""
+Deterministic intent matching for the fast-path router.
+
+Recognizes a small set of simple, unambiguous requests (list tags, show an
+address, check a job) so the graph can call the tool directly instead of taking a
+full model round trip. Patterns are anchored and match the whole request; anything
+that does not match exactly falls through to the agent.
+"""
+
+import re
+from typing import NamedTuple, Optional
+
+# Folder and object names: bare words or quoted strings
+_FOLDER = (
+    r"""(?:the\s+)?(?:folder\s+)?(?P<folder>"[^"]+"|'[^']+'|[\w.-]+)(?:\s+folder)?"""
+)
+_NAME = r"""(?P<name>"[^"]+"|'[^']+'|[\w.-]+)"""
+_SHOW = r"(?:show(?:\s+me)?|get|display|describe|read)(?:\s+(?:the\s+)?details\s+(?:of|for))?"
+_LIST = r"(?:list|show(?:\s+me)?|get|display)(?:\s+all)?(?:\s+the)?"
+
+
+class Intent(NamedTuple):
+    """
+    A recognized fast-path request.
+
+    Attributes:
+        name: Intent name (e.g., "tag_list")
+        tool: Name of the tool to call
+        args: Tool arguments
+    """
+
+    name: str
+    tool: str
+    args: dict
+
+
+_PATTERNS: list[tuple[str, str, re.Pattern]] = [
+    (
+        "tag_list",
+        "tag_list",
+        re.compile(rf"^{_LIST}\s+tags\s+in\s+{_FOLDER}$", re.IGNORECASE),
+    ),
+    (
+        "address_list",
+        "address_list",
+        re.compile(
+            rf"^{_LIST}\s+(?:address(?:es)?|address\s+objects)\s+in\s+{_FOLDER}$",
+            re.IGNORECASE,
+        ),
+    ),
+    (
+        "tag_read",
+        "tag_read",
+        re.compile(
+            rf"^{_SHOW}\s+(?:the\s+)?tag\s+{_NAME}\s+in\s+{_FOLDER}$", re.IGNORECASE
+        ),
+    ),
+    (
+        "address_read",
+        "address_read",
+        re.compile(
+            rf"^{_SHOW}\s+(?:the\s+)?address(?:\s+object)?\s+{_NAME}\s+in\s+{_FOLDER}$",
+            re.IGNORECASE,
+        ),
+    ),
+    (
+        "check_job_status",
+        "check_job_status",
+        re.compile(
+            r"^(?:(?:check|get|show(?:\s+me)?)\s+)?(?:what(?:'s|\s+is)\s+)?(?:the\s+)?"
+            r"status\s+(?:of|for)\s+job(?:\s+id)?\s+(?P<job_id>[\w-]+)$",
+            re.IGNORECASE,
+        ),
+    ),
+]
+
+# List requests return up to the tool maximum
+_LIST_LIMIT = 100
+
+
+def _unquote(value: str) -> str:
+    """Strip matching surrounding quotes from a captured value."""
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    return value
+
+
+def match_intent(text: str) -> Optional[Intent]:
+    """
+    Match a user request against the fast-path patterns.
+
+    Args:
+        text: Raw user request
+
+    Returns:
+        Intent if the whole request matches one pattern, otherwise None
+
+    Example:
+        >>> match_intent("List all tags in Texas")
+        Intent(name='tag_list', tool='tag_list', args={'folder': 'Texas', 'limit': 100})
+        >>> match_intent("List all tags in Texas and commit") is None
+        True
+    """
+    cleaned = re.sub(r"\s+", " ", text).strip()
+    cleaned = re.sub(r"^(?:please\s+|can\s+you\s+)", "", cleaned, flags=re.IGNORECASE)
+    cleaned = re.sub(r"(?:\s+please)?[.!?]*$", "", cleaned, flags=re.IGNORECASE)
+
+    for intent_name, tool_name, pattern in _PATTERNS:
+        match = pattern.match(cleaned)
+        if not match:
+            continue
+
+        args = {key: _unquote(value) for key, value in match.groupdict().items()}
+        if tool_name.endswith("_list"):
+            args["limit"] = _LIST_LIMIT
+        return Intent(intent_name, tool_name, args)
+
+    return None
@@ -0,0 +1,92 @@
+"""
+Selection of SCM objects from a folder snapshot.
+
+Bulk tools pick their targets locally instead of asking the model to list
+object names: a selector combines a name glob (``fnmatch`` syntax, e.g.
+"web_*"), a tag the object must carry and a network the object's address must
+lie in. All given criteria must match.
+
+Example:
+    >>> addresses = get_folder_snapshot(client, "address", "Texas")
+    >>> select_objects(addresses.own(), name_pattern="web_*", cidr="10.0.1.0/24")
+"""
+
+import ipaddress
+from collections.abc import Iterable
+from fnmatch import fnmatchcase
+from typing import Any, Optional, Union
+
+IPNetwork = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+
+def address_bounds(obj: Any) -> Optional[tuple[Any, Any]]:
+    """
+    Return the first and last IP covered by an address object.
+
+    Args:
+        obj: Address object with ``ip_netmask``, ``ip_range`` or ``fqdn``
+
+    Returns:
+        (first, last) ip_address pair, or None for FQDN/wildcard addresses and
+        values that do not parse
+    """
+    try:
+        ip_netmask = getattr(obj, "ip_netmask", None)
+        if ip_netmask:
+            network = ipaddress.ip_network(ip_netmask, strict=False)
+            return network[0], network[-1]
+        ip_range = getattr(obj, "ip_range", None)
+        if ip_range:
+            first, last = (part.strip() for part in ip_range.split("-", 1))
+            return ipaddress.ip_address(first), ipaddress.ip_address(last)
+    except ValueError:
+        pass
+    return None
+
+
+def address_in_network(obj: Any, network: IPNetwork) -> bool:
+    """Return True if every IP of the address object lies in ``network``."""
+    bounds = address_bounds(obj)
+    if bounds is None:
+        return False
+    first, last = bounds
+    return (
+        first.version == network.version and network[0] <= first and last <= network[-1]
+    )
+
+
+def select_objects(
+    objects: Iterable[Any],
+    name_pattern: Optional[str] = None,
+    tag: Optional[str] = None,
+    cidr: Optional[str] = None,
+) -> list[Any]:
+    """
+    Select the objects that match every given criterion.
+
+    Args:
+        objects: Objects to select from; pass FolderSnapshot.own() so objects
+            inherited from parent folders, which cannot be changed from the
+            folder, are never selected
+        name_pattern: Case-sensitive glob on object names (e.g., "web_*")
+        tag: Tag the objects must carry
+        cidr: Network the objects' addresses must lie in (e.g., "10.0.1.0/24")
+
+    Returns:
+        list: Matching objects, ordered by name
+
+    Raises:
+        ValueError: If ``cidr`` is not a valid network
+    """
+    network = ipaddress.ip_network(cidr.strip(), strict=False) if cidr else None
+
+    selected = []
+    for obj in objects:
+        if name_pattern and not fnmatchcase(obj.name, name_pattern):
+            continue
+        if tag and tag not in (getattr(obj, "tag", None) or []):
+            continue
+        if network is not None and not address_in_network(obj, network):
+            continue
+        selected.append(obj)
+    return sorted(selected, key=lambda obj: obj.name)
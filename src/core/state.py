@@ -5,7 +5,7 @@ Defines the graph state used throughout the LangGraph workflow.
 """
 
 from collections.abc import Sequence
-from typing import Annotated, TypedDict
+from typing import Annotated, NotRequired, TypedDict
 
 from langchain_core.messages import BaseMessage
 from langgraph.graph.message import add_messages
@@ -19,8 +19,13 @@ class AgentState(TypedDict):
     add_messages reducer. This allows the graph to accumulate conversation history
     across multiple agent-tool cycles.
 
+    Older turns are trimmed from messages by the manage_history node and folded
+    into summary, so the history sent to the model stays under a token budget.
+
     Attributes:
         messages: Sequence of messages (user messages, AI responses, tool results)
+        summary: Rolling summary of trimmed conversation turns
     """
 
     messages: Annotated[Sequence[BaseMessage], add_messages]
+    summary: NotRequired[str]
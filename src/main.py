@@ -30,10 +30,25 @@ Example Prompts:
 - "Commit changes to Texas and California"
 """
 
-from typing import Literal
+import asyncio
+import functools
+import re
+import threading
+from collections.abc import Callable, Iterator
+from typing import Any, Literal, NamedTuple, Optional, Union
 
 from langchain_anthropic import ChatAnthropic
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+    RemoveMessage,
+    SystemMessage,
+    ToolMessage,
+)
+from langchain_core.messages.utils import count_tokens_approximately
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
+from langchain_core.runnables.config import ensure_config
 from langchain_core.tools import StructuredTool
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import END, START, StateGraph
@@ -44,7 +59,50 @@ from scm.exceptions import ObjectNotPresentError
 
 # Import from core modules
 from src.core import AgentState, get_scm_client
-from src.core.config import validate_environment
+from src.core.checkpoint import open_checkpointer
+from src.core.config import get_config, validate_environment
+from src.core.executor import BatchOutcome, arun_batch, run_batch
+from src.core.instructions import (
+    flatten_instructions,
+    parse_instructions,
+    run_instructions,
+)
+from src.core.inventory import (
+    FolderSnapshot,
+    get_folder_snapshot,
+    invalidate_folder_snapshot,
+)
+from src.core.journal import BatchJournal, batch_id, journaling_enabled
+from src.core.planning import (
+    CREATE,
+    DELETE,
+    OBJECT_LABELS,
+    PLAN_ORDER,
+    Plan,
+    PlanAction,
+    build_plan,
+    updated_object,
+)
+from src.core.preflight import format_problems, preflight
+from src.core.ranges import expand_address_range
+from src.core.results import (
+    APPLY_STATUSES,
+    CREATED,
+    DELETE_STATUSES,
+    DELETED,
+    EXISTED,
+    FAILED,
+    SKIPPED,
+    STATUSES,
+    UNCHANGED,
+    UPDATE_STATUSES,
+    UPDATED,
+    BatchResult,
+    ItemOutcome,
+    compact_names,
+)
+from src.core.router import Intent, match_intent
+from src.core.selection import select_objects
 
 # ============================================================================
 # PYDANTIC MODELS FOR BATCH OPERATIONS
@@ -63,10 +121,7 @@ class AddressConfigForBatch(BaseModel):
     """Pydantic model for address configuration in batch operations."""
 
     name: str = Field(description="Address name (e.g., 'web_server_01')")
-    ip_netmask: str = Field(
-        description="IP with CIDR notation (e.g., '10.0.1.10/32')",
-        pattern=r"^(\d{1,3}\.){3}\d{1,3}/\d{1,2}$",
-    )
+    ip_netmask: str = Field(description="IP with CIDR notation (e.g., '10.0.1.10/32')")
     description: str = Field(default="", description="Optional description")
     tag: list[str] = Field(default_factory=list, description="List of tag names")
 
@@ -96,6 +151,35 @@ class BatchAddressRequest(BaseModel):
     folder: str = Field(description="SCM folder name (e.g., 'Texas')")
 
 
+class AddressRangeRequest(BaseModel):
+    """Request model for creating addresses from an IP range spec."""
+
+    folder: str = Field(description="SCM folder name (e.g., 'Texas')")
+    start: Optional[str] = Field(
+        default=None, description="First IP of the range (e.g., '10.0.1.1')"
+    )
+    end: Optional[str] = Field(
+        default=None, description="Last IP of the range, inclusive (e.g., '10.0.1.20')"
+    )
+    cidr: Optional[str] = Field(
+        default=None,
+        description="Network to expand to its host IPs instead of start/end (e.g., '10.0.2.0/28')",
+    )
+    name_template: str = Field(
+        default="host_{ip_dashed}",
+        description=(
+            "Object name template with {ip}, {ip_dashed} and 1-based {index} "
+            "(e.g., 'web_{index:02d}' or 'srv_{ip_dashed}')"
+        ),
+    )
+    description_template: str = Field(
+        default="", description="Optional description template (same fields)"
+    )
+    tag: list[str] = Field(
+        default_factory=list, description="Tag names applied to every address"
+    )
+
+
 class BatchAddressGroupRequest(BaseModel):
     """Request model for batch address group creation."""
 
@@ -105,67 +189,391 @@ class BatchAddressGroupRequest(BaseModel):
     folder: str = Field(description="SCM folder name (e.g., 'Texas')")
 
 
+class AddressTagBulkRequest(BaseModel):
+    """Request model for adding/removing tags on every matching address."""
+
+    folder: str = Field(description="SCM folder name (e.g., 'Texas')")
+    name_pattern: Optional[str] = Field(
+        default=None,
+        description="Glob on address names, e.g. 'web_*' ('*' selects every address)",
+    )
+    has_tag: Optional[str] = Field(
+        default=None, description="Only addresses that already carry this tag"
+    )
+    cidr: Optional[str] = Field(
+        default=None,
+        description="Only addresses inside this network (e.g., '10.0.1.0/24')",
+    )
+    add_tags: list[str] = Field(default_factory=list, description="Tag names to add")
+    remove_tags: list[str] = Field(
+        default_factory=list, description="Tag names to remove"
+    )
+
+
+class BatchDeleteRequest(BaseModel):
+    """Request model for batch deletion of tags, addresses and address groups."""
+
+    folder: str = Field(description="SCM folder name (e.g., 'Texas')")
+    address_groups: list[str] = Field(
+        default_factory=list,
+        description="Address group names or globs to delete (e.g., 'old_*')",
+    )
+    addresses: list[str] = Field(
+        default_factory=list,
+        description="Address names or globs to delete (e.g., 'web_*')",
+    )
+    tags: list[str] = Field(
+        default_factory=list, description="Tag names or globs to delete"
+    )
+
+
+class DesiredStateRequest(BaseModel):
+    """Request model for planning or applying the desired objects of a folder."""
+
+    folder: str = Field(description="SCM folder name (e.g., 'Texas')")
+    tags: list[TagConfigForBatch] = Field(
+        default_factory=list, description="Desired tags"
+    )
+    addresses: list[AddressConfigForBatch] = Field(
+        default_factory=list, description="Desired addresses"
+    )
+    groups: list[AddressGroupConfigForBatch] = Field(
+        default_factory=list, description="Desired address groups"
+    )
+    prune: bool = Field(
+        default=False,
+        description="Also delete objects of the folder that the spec does not list",
+    )
+
+
 # ============================================================================
 # BATCH OPERATION TOOLS
 # ============================================================================
 
 
-def _tag_create_batch(request: BatchTagRequest) -> str:
+class BatchJob(NamedTuple):
+    """
+    A prepared batch operation.
+
+    Attributes:
+        title: Operation title (e.g., "Batch tag creation")
+        folder: SCM folder the batch runs in
+        items: Items to dispatch (pydantic configs or SCM objects with a
+            ``name`` attribute)
+        run_one: Function returning the outcome of one item (e.g., CREATED or
+            EXISTED; raises on error)
+        statuses: Statuses the operation reports (see BatchResult)
+        settled: Outcomes decided while preparing, without API calls (e.g.,
+            UNCHANGED objects of a bulk update); listed after the dispatched items
+        snapshot: Folder snapshot of the objects the batch creates or updates;
+            journaled items are only trusted while their name is still in it
     """
-    Create multiple tags in one batch operation.
+
+    title: str
+    folder: str
+    items: list
+    run_one: Callable[[Any], ItemOutcome]
+    statuses: tuple[str, ...] = STATUSES
+    settled: tuple[ItemOutcome, ...] = ()
+    snapshot: Optional[FolderSnapshot] = None
+
+
+def _collect_item_outcomes(
+    items: list, outcomes: list[BatchOutcome]
+) -> list[ItemOutcome]:
+    """Turn executor outcomes into item outcomes; items that raised are FAILED."""
+    return [
+        (
+            ItemOutcome(item.name, FAILED, error=str(outcome.error))
+            if outcome.error is not None
+            else outcome.result
+        )
+        for item, outcome in zip(items, outcomes, strict=True)
+    ]
+
+
+def _run_batch_items(items: list, run_one) -> list[ItemOutcome]:
+    """
+    Run ``run_one`` for every item on the shared batch executor.
+
+    Items are processed concurrently; outcomes are returned in input order.
 
     Args:
-        request: Batch request with list of tag configs and folder
+        items: Pydantic item configs or SCM objects with unique ``name``
+            attributes (pre-flight validation rejects repeated names)
+        run_one: Function returning the outcome of one item (raises on error)
 
     Returns:
-        Summary of created tags
+        One ItemOutcome per requested item; items that raised are FAILED with
+        the error message
+    """
+    return _collect_item_outcomes(items, run_batch(run_one, items))
 
-    This tool uses Pydantic validation to ensure the LLM generates valid JSON
-    that matches the SCM API schema. Use this for bulk tag creation.
+
+async def _arun_batch_items(items: list, run_one) -> list[ItemOutcome]:
+    """Async variant of _run_batch_items (asyncio.gather under the tenant cap)."""
+    outcomes = await arun_batch(run_one, items)
+    return _collect_item_outcomes(items, outcomes)
+
+
+class _JournaledJob(NamedTuple):
+    """A batch job split by its journal into confirmed and outstanding items."""
+
+    job: BatchJob
+    journal: Optional[BatchJournal]
+    confirmed: dict[str, ItemOutcome]
+    outstanding: list
+    run_one: Callable[[Any], ItemOutcome]
+
+
+def _start_journal(job: BatchJob) -> _JournaledJob:
+    """
+    Open the job's journal and leave out the items it already confirms.
+
+    Journal entries are only trusted for names still in the job's folder
+    snapshot, so objects deleted since are re-issued. Outstanding items are
+    recorded in the journal as they complete. Without journaling
+    (SCM_BATCH_JOURNAL=false, or outside a conversation thread, where batch
+    ids would be shared by every run) every item is outstanding.
     """
+    thread_id = ensure_config().get("configurable", {}).get("thread_id")
+    if not journaling_enabled() or not job.items or thread_id is None:
+        return _JournaledJob(job, None, {}, job.items, job.run_one)
+
+    journal = BatchJournal(batch_id(thread_id, job.title, job.folder, job.items))
+    confirmed = {
+        name: outcome
+        for name, outcome in journal.completed().items()
+        if job.snapshot is None or name in job.snapshot
+    }
+    outstanding = [item for item in job.items if item.name not in confirmed]
+
+    def run_one(item: Any) -> ItemOutcome:
+        outcome = job.run_one(item)
+        journal.record(outcome)
+        return outcome
+
+    return _JournaledJob(job, journal, confirmed, outstanding, run_one)
+
+
+def _finish_journal(
+    journaled: _JournaledJob, fresh_outcomes: list[ItemOutcome]
+) -> tuple[str, dict]:
+    """
+    Merge confirmed and fresh outcomes in request order and build the response.
+
+    The journal is removed when no item failed; otherwise it stays so that
+    running the same batch again re-issues only the failed items.
+    """
+    job, journal, confirmed = journaled.job, journaled.journal, journaled.confirmed
+    fresh = iter(fresh_outcomes)
+    item_outcomes = [
+        confirmed[item.name] if item.name in confirmed else next(fresh)
+        for item in job.items
+    ]
+    item_outcomes += job.settled
+
+    summary, artifact = _batch_response(
+        job.title, job.folder, item_outcomes, job.statuses
+    )
+    if journal is None:
+        return summary, artifact
+
+    if any(outcome.status == FAILED for outcome in fresh_outcomes):
+        journal.close()
+    else:
+        journal.remove()
+    artifact["batch_id"] = journal.batch_id
+    if confirmed:
+        resumed = len(job.items) - len(journaled.outstanding)
+        artifact["resumed"] = resumed
+        summary += (
+            f"\n↩️  Resumed batch {journal.batch_id}: {resumed} items confirmed "
+            f"earlier, {len(journaled.outstanding)} re-issued"
+        )
+    return summary, artifact
+
+
+def _run_batch_job(job: Union[BatchJob, str]) -> tuple[str, Optional[dict]]:
+    """Run a prepared batch, or pass through the error from preparing it."""
+    if isinstance(job, str):
+        return job, None
+    journaled = _start_journal(job)
+    try:
+        fresh_outcomes = _run_batch_items(journaled.outstanding, journaled.run_one)
+    finally:
+        if journaled.journal is not None:
+            journaled.journal.close()
+    return _finish_journal(journaled, fresh_outcomes)
+
+
+async def _arun_batch_job(
+    prepare: Callable[[Any], Union[BatchJob, str]], request: Any
+) -> tuple[str, Optional[dict]]:
+    """Async variant of _run_batch_job; folder listings run in a worker thread."""
+    job = await asyncio.to_thread(prepare, request)
+    if isinstance(job, str):
+        return job, None
+    journaled = await asyncio.to_thread(_start_journal, job)
+    try:
+        fresh_outcomes = await _arun_batch_items(
+            journaled.outstanding, journaled.run_one
+        )
+    finally:
+        if journaled.journal is not None:
+            journaled.journal.close()
+    return _finish_journal(journaled, fresh_outcomes)
+
+
+def _batch_response(
+    title: str,
+    folder: str,
+    item_outcomes: list[ItemOutcome],
+    statuses: tuple[str, ...] = STATUSES,
+) -> tuple[str, dict]:
+    """
+    Build the model-facing summary and the machine-readable artifact for a batch.
+
+    The summary is size-bounded (counts, name ranges, first failures) so large
+    batches do not flood the agent context. The artifact keeps every per-object
+    outcome for the CLI, the JSONL runner and traces and is never sent to the
+    model.
+
+    Args:
+        title: Operation title (e.g., "Batch tag creation")
+        folder: SCM folder the batch ran in
+        item_outcomes: Outcomes from _run_batch_items
+        statuses: Statuses the operation reports (see BatchResult)
+
+    Returns:
+        Tuple of (compact summary, BatchResult.to_dict() artifact)
+    """
+    result = BatchResult(title, folder, item_outcomes, statuses)
+    return result.summary(), result.to_dict()
+
+
+def _object_id(obj: Any) -> Optional[str]:
+    """Return an SCM object's id as a string (None if it has none)."""
+    object_id = getattr(obj, "id", None)
+    return str(object_id) if object_id is not None else None
+
+
+def _existed(obj: Any, snapshot: FolderSnapshot) -> ItemOutcome:
+    """Outcome of an item that already exists in, or is inherited by, the folder."""
+    parent = snapshot.inherited_from(obj.name)
+    info = f"exists in parent folder '{parent}'" if parent else "already exists"
+    return ItemOutcome(obj.name, EXISTED, _object_id(obj), info)
+
+
+def _prepare_tag_batch(request: BatchTagRequest) -> Union[BatchJob, str]:
+    """Validate the batch, load the tag snapshot and build the per-tag create function."""
+    # Validate the whole batch locally before any API call
+    tags, problems = preflight("tag", request.tags)
+    if problems:
+        return format_problems("Batch tag creation", problems, len(tags))
+
     client = get_scm_client()
 
-    results = []
-    errors = []
+    # One folder listing serves every existence check in the batch
+    try:
+        existing_tags = get_folder_snapshot(client, "tag", request.folder)
+    except Exception as e:
+        return f"❌ Failed to list tags in '{request.folder}': {type(e).__name__}: {str(e)}"
 
-    for tag_config in request.tags:
-        try:
-            # Check if exists
-            try:
-                client.tag.fetch(name=tag_config.name, folder=request.folder)
-                results.append(f"⏭️  {tag_config.name} (already exists)")
-                continue
-            except ObjectNotPresentError:
-                pass
+    def create_tag(tag_config: TagConfigForBatch) -> ItemOutcome:
+        # Check if exists
+        existing = existing_tags.get(tag_config.name)
+        if existing is not None:
+            return _existed(existing, existing_tags)
 
-            # Convert Pydantic model to dict and add folder
-            config_dict = tag_config.model_dump()
-            config_dict["folder"] = request.folder
+        # Convert Pydantic model to dict and add folder
+        config_dict = tag_config.model_dump()
+        config_dict["folder"] = request.folder
 
-            # Remove empty comments field to avoid API validation error
-            if not config_dict.get("comments"):
-                config_dict.pop("comments", None)
+        # Remove empty comments field to avoid API validation error
+        if not config_dict.get("comments"):
+            config_dict.pop("comments", None)
 
-            # Create
-            tag = client.tag.create(config_dict)
-            results.append(f"✅ {tag.name} ({tag.color})")
+        # Create
+        tag = client.tag.create(config_dict)
+        existing_tags.add(tag)
+        return ItemOutcome(tag.name, CREATED, _object_id(tag), tag.color or "")
 
-        except Exception as e:
-            errors.append(f"❌ {tag_config.name}: {str(e)}")
+    return BatchJob(
+        "Batch tag creation", request.folder, tags, create_tag, snapshot=existing_tags
+    )
 
-    created_count = len([r for r in results if "✅" in r])
-    existing_count = len([r for r in results if "⏭️" in r])
 
-    summary = f"Batch tag creation: {created_count} created, {existing_count} already existed\n\n"
-    summary += "\n".join(results)
+def _tag_create_batch(request: BatchTagRequest) -> tuple[str, Optional[dict]]:
+    """
+    Create multiple tags in one batch operation.
 
-    if errors:
-        summary += "\n\nErrors:\n" + "\n".join(errors)
+    Args:
+        request: Batch request with list of tag configs and folder
 
-    return summary
+    Returns:
+        Tuple of (compact summary for the model, full results artifact)
 
+    This tool uses Pydantic validation to ensure the LLM generates valid JSON
+    that matches the SCM API schema. Use this for bulk tag creation.
+    """
+    return _run_batch_job(_prepare_tag_batch(request))
+
+
+async def _atag_create_batch(request: BatchTagRequest) -> tuple[str, Optional[dict]]:
+    """Async variant of _tag_create_batch."""
+    return await _arun_batch_job(_prepare_tag_batch, request)
+
+
+def _prepare_address_batch(request: BatchAddressRequest) -> Union[BatchJob, str]:
+    """Validate the batch, load the snapshots and build the per-address create function."""
+    client = get_scm_client()
 
-def _address_create_batch(request: BatchAddressRequest) -> str:
+    # One folder listing serves every existence check in the batch
+    try:
+        existing_addresses = get_folder_snapshot(client, "address", request.folder)
+        existing_tags = get_folder_snapshot(client, "tag", request.folder)
+    except Exception as e:
+        return f"❌ Failed to list addresses in '{request.folder}': {type(e).__name__}: {str(e)}"
+
+    # Validate the whole batch locally before any create call
+    addresses, problems = preflight("address", request.addresses, existing_tags.names())
+    if problems:
+        return format_problems("Batch address creation", problems, len(addresses))
+
+    def create_address(addr_config: AddressConfigForBatch) -> ItemOutcome:
+        # Check if exists
+        existing = existing_addresses.get(addr_config.name)
+        if existing is not None:
+            return _existed(existing, existing_addresses)
+
+        # Convert Pydantic model to dict and add folder
+        config_dict = addr_config.model_dump()
+        config_dict["folder"] = request.folder
+
+        # Remove empty optional fields to avoid API validation errors
+        if not config_dict.get("description"):
+            config_dict.pop("description", None)
+        if not config_dict.get("tag"):
+            config_dict.pop("tag", None)
+
+        # Create
+        addr = client.address.create(config_dict)
+        existing_addresses.add(addr)
+        return ItemOutcome(addr.name, CREATED, _object_id(addr), addr.ip_netmask or "")
+
+    return BatchJob(
+        "Batch address creation",
+        request.folder,
+        addresses,
+        create_address,
+        snapshot=existing_addresses,
+    )
+
+
+def _address_create_batch(
+    request: BatchAddressRequest,
+) -> tuple[str, Optional[dict]]:
     """
     Create multiple address objects in one batch operation.
 
@@ -173,57 +581,152 @@ def _address_create_batch(request: BatchAddressRequest) -> str:
         request: Batch request with list of address configs and folder
 
     Returns:
-        Summary of created addresses
+        Tuple of (compact summary for the model, full results artifact)
 
     This tool uses Pydantic validation to ensure the LLM generates valid JSON.
-    The IP address format is validated via regex pattern in the Pydantic model.
+    IPs are parsed and normalized by the pre-flight check before any API call.
     Use this for bulk address creation (e.g., "create 14 addresses").
     """
-    client = get_scm_client()
+    return _run_batch_job(_prepare_address_batch(request))
 
-    results = []
-    errors = []
 
-    for addr_config in request.addresses:
-        try:
-            # Check if exists
-            try:
-                client.address.fetch(name=addr_config.name, folder=request.folder)
-                results.append(f"⏭️  {addr_config.name} (already exists)")
-                continue
-            except ObjectNotPresentError:
-                pass
+async def _aaddress_create_batch(
+    request: BatchAddressRequest,
+) -> tuple[str, Optional[dict]]:
+    """Async variant of _address_create_batch."""
+    return await _arun_batch_job(_prepare_address_batch, request)
+
+
+def _prepare_address_range_batch(
+    request: AddressRangeRequest,
+) -> Union[BatchJob, str]:
+    """Expand the range spec locally and prepare it as an address batch."""
+    try:
+        addresses = expand_address_range(
+            request.name_template,
+            start=request.start,
+            end=request.end,
+            cidr=request.cidr,
+            description_template=request.description_template,
+        )
+        batch = BatchAddressRequest(
+            folder=request.folder,
+            addresses=[
+                AddressConfigForBatch(**address, tag=request.tag)
+                for address in addresses
+            ],
+        )
+    except ValueError as e:
+        return f"❌ Failed: {type(e).__name__}: {str(e)}"
 
-            # Convert Pydantic model to dict and add folder
-            config_dict = addr_config.model_dump()
-            config_dict["folder"] = request.folder
+    job = _prepare_address_batch(batch)
+    if isinstance(job, str):
+        return job
+    return job._replace(title="Address range creation")
 
-            # Remove empty optional fields to avoid API validation errors
-            if not config_dict.get("description"):
-                config_dict.pop("description", None)
-            if not config_dict.get("tag"):
-                config_dict.pop("tag", None)
 
-            # Create
-            addr = client.address.create(config_dict)
-            results.append(f"✅ {addr.name} ({addr.ip_netmask})")
+def _address_create_range(
+    request: AddressRangeRequest,
+) -> tuple[str, Optional[dict]]:
+    """
+    Create address objects for every IP of a range or CIDR block.
 
-        except Exception as e:
-            errors.append(f"❌ {addr_config.name}: {str(e)}")
+    The range is expanded locally and created through the batch path, so the
+    request costs the same tokens for 1,000 addresses as for 10.
+
+    Args:
+        request: Range spec (start/end or cidr), name and description
+            templates, tags and folder
+
+    Returns:
+        Tuple of (compact summary for the model, full results artifact)
+
+    Example:
+        "Create addresses for IPs 10.0.1.1 through 10.0.1.20 in Texas"
+    """
+    return _run_batch_job(_prepare_address_range_batch(request))
 
-    created_count = len([r for r in results if "✅" in r])
-    existing_count = len([r for r in results if "⏭️" in r])
 
-    summary = f"Batch address creation: {created_count} created, {existing_count} already existed\n\n"
-    summary += "\n".join(results)
+async def _aaddress_create_range(
+    request: AddressRangeRequest,
+) -> tuple[str, Optional[dict]]:
+    """Async variant of _address_create_range."""
+    return await _arun_batch_job(_prepare_address_range_batch, request)
 
-    if errors:
-        summary += "\n\nErrors:\n" + "\n".join(errors)
 
-    return summary
+def _prepare_address_group_batch(
+    request: BatchAddressGroupRequest,
+) -> Union[BatchJob, str]:
+    """Validate the batch, load the snapshots and build the per-group create function."""
+    client = get_scm_client()
+
+    # One folder listing serves every existence check in the batch
+    try:
+        existing_groups = get_folder_snapshot(client, "address_group", request.folder)
+        existing_addresses = get_folder_snapshot(client, "address", request.folder)
+        existing_tags = get_folder_snapshot(client, "tag", request.folder)
+    except Exception as e:
+        return f"❌ Failed to list objects in '{request.folder}': {type(e).__name__}: {str(e)}"
+
+    # Validate the whole batch locally before any create call
+    groups, problems = preflight("address_group", request.groups, existing_tags.names())
+    if problems:
+        return format_problems("Batch address group creation", problems, len(groups))
+
+    # Resolve all distinct members of the request in a single pass
+    unknown_members = existing_addresses.missing(
+        member for group_config in request.groups for member in group_config.members
+    )
+
+    def create_group(group_config: AddressGroupConfigForBatch) -> ItemOutcome:
+        # Check if group exists
+        existing = existing_groups.get(group_config.name)
+        if existing is not None:
+            return _existed(existing, existing_groups)
+
+        # Validate members exist
+        missing_members = [
+            member for member in group_config.members if member in unknown_members
+        ]
+
+        if missing_members:
+            raise ValueError(f"Missing members: {', '.join(missing_members)}")
+
+        # Convert to dict and add folder
+        config_dict = {
+            "name": group_config.name,
+            "static": group_config.members,
+            "folder": request.folder,
+        }
+
+        # Only include optional fields if non-empty
+        if group_config.description:
+            config_dict["description"] = group_config.description
+        if group_config.tag:
+            config_dict["tag"] = group_config.tag
+
+        # Create
+        group = client.address_group.create(config_dict)
+        existing_groups.add(group)
+        return ItemOutcome(
+            group.name,
+            CREATED,
+            _object_id(group),
+            f"{len(group_config.members)} members",
+        )
+
+    return BatchJob(
+        "Batch address group creation",
+        request.folder,
+        groups,
+        create_group,
+        snapshot=existing_groups,
+    )
 
 
-def _address_group_create_batch(request: BatchAddressGroupRequest) -> str:
+def _address_group_create_batch(
+    request: BatchAddressGroupRequest,
+) -> tuple[str, Optional[dict]]:
     """
     Create multiple address groups in one batch operation.
 
@@ -231,72 +734,522 @@ def _address_group_create_batch(request: BatchAddressGroupRequest) -> str:
         request: Batch request with list of group configs and folder
 
     Returns:
-        Summary of created groups
+        Tuple of (compact summary for the model, full results artifact)
 
     This tool validates that all member addresses exist before creating groups.
+    Members of every group are resolved together against one address listing of
+    the folder, so shared members are only looked up once.
     Use this for bulk group creation.
     """
+    return _run_batch_job(_prepare_address_group_batch(request))
+
+
+async def _aaddress_group_create_batch(
+    request: BatchAddressGroupRequest,
+) -> tuple[str, Optional[dict]]:
+    """Async variant of _address_group_create_batch."""
+    return await _arun_batch_job(_prepare_address_group_batch, request)
+
+
+def _prepare_address_tag_bulk(
+    request: AddressTagBulkRequest,
+) -> Union[BatchJob, str]:
+    """Select addresses from the snapshot and keep those whose tags change."""
+    if not (request.name_pattern or request.has_tag or request.cidr):
+        return "❌ Give name_pattern, has_tag or cidr to select addresses ('*' for all)"
+    if not (request.add_tags or request.remove_tags):
+        return "❌ Give add_tags or remove_tags"
+
     client = get_scm_client()
+    try:
+        existing_addresses = get_folder_snapshot(client, "address", request.folder)
+        existing_tags = get_folder_snapshot(client, "tag", request.folder)
+        selected = select_objects(
+            existing_addresses.own(),
+            name_pattern=request.name_pattern,
+            tag=request.has_tag,
+            cidr=request.cidr,
+        )
+    except ValueError as e:
+        return f"❌ Failed: {type(e).__name__}: {str(e)}"
+    except Exception as e:
+        return f"❌ Failed to list addresses in '{request.folder}': {type(e).__name__}: {str(e)}"
 
-    results = []
-    errors = []
+    if not selected:
+        return f"No addresses in '{request.folder}' match the selection"
+    unknown_tags = existing_tags.missing(request.add_tags)
+    if unknown_tags:
+        return (
+            f"❌ Unknown tags in '{request.folder}': {', '.join(sorted(unknown_tags))} "
+            f"(create them first)"
+        )
 
-    for group_config in request.groups:
-        try:
-            # Check if group exists
-            try:
-                client.address_group.fetch(
-                    name=group_config.name, folder=request.folder
+    # Only objects whose tag set changes are sent to SCM; removal wins over add
+    remove = set(request.remove_tags)
+    add = [t for t in dict.fromkeys(request.add_tags) if t not in remove]
+    changed = []
+    unchanged = []
+    for addr in selected:
+        current = list(addr.tag or [])
+        tags = [t for t in current if t not in remove]
+        tags += [t for t in add if t not in tags]
+        if set(tags) == set(current):
+            unchanged.append(ItemOutcome(addr.name, UNCHANGED, _object_id(addr)))
+        else:
+            changed.append(addr.model_copy(update={"tag": tags}))
+
+    def update_address(addr: Any) -> ItemOutcome:
+        updated = client.address.update(addr)
+        existing_addresses.add(updated)
+        return ItemOutcome(
+            updated.name,
+            UPDATED,
+            _object_id(updated),
+            ", ".join(updated.tag or []) or "no tags",
+        )
+
+    return BatchJob(
+        "Bulk address tag update",
+        request.folder,
+        changed,
+        update_address,
+        UPDATE_STATUSES,
+        tuple(unchanged),
+        existing_addresses,
+    )
+
+
+def _address_tag_bulk(
+    request: AddressTagBulkRequest,
+) -> tuple[str, Optional[dict]]:
+    """
+    Add or remove tags on every address matching a selector.
+
+    Addresses are selected from one folder listing by name glob, current tag
+    and/or CIDR containment (all given criteria must match). Only addresses
+    whose tag set actually changes are updated, concurrently on the batch
+    executor.
+
+    Args:
+        request: Folder, selector (name_pattern, has_tag, cidr) and the tags
+            to add and remove
+
+    Returns:
+        Tuple of (compact summary for the model, full results artifact)
+
+    Example:
+        "Add Production tag to all web server addresses in Texas"
+    """
+    return _run_batch_job(_prepare_address_tag_bulk(request))
+
+
+async def _aaddress_tag_bulk(
+    request: AddressTagBulkRequest,
+) -> tuple[str, Optional[dict]]:
+    """Async variant of _address_tag_bulk."""
+    return await _arun_batch_job(_prepare_address_tag_bulk, request)
+
+
+# Deletion order: referrers before the objects they reference
+DELETE_ORDER = ("address_group", "address", "tag")
+_DELETE_LABELS = {"address_group": "address group", "address": "address", "tag": "tag"}
+
+# Quoted tag names in dynamic address group filters (e.g., "'web' and 'prod'")
+_FILTER_TAG = re.compile(r"'([^']+)'")
+
+
+class DeleteJob(NamedTuple):
+    """
+    A prepared batch deletion.
+
+    Attributes:
+        client: SCM client to delete with
+        folder: SCM folder the objects are deleted from
+        snapshots: Folder snapshots per object type (targets and referrers)
+        targets: Objects to delete per object type
+        settled: Outcomes of requested names that matched nothing
+    """
+
+    client: Any
+    folder: str
+    snapshots: dict[str, FolderSnapshot]
+    targets: dict[str, list]
+    settled: tuple[ItemOutcome, ...]
+
+
+def _references(obj: Any, object_type: str) -> list[str]:
+    """Names of ``object_type`` objects that ``obj`` refers to."""
+    if object_type == "tag":
+        names = list(getattr(obj, "tag", None) or [])
+        dynamic = getattr(obj, "dynamic", None)
+        if dynamic is not None:
+            names += _FILTER_TAG.findall(dynamic.filter)
+        return names
+    return list(getattr(obj, "static", None) or [])
+
+
+def _prepare_batch_delete(request: BatchDeleteRequest) -> Union[DeleteJob, str]:
+    """Load the snapshots and resolve the requested names and globs to objects."""
+    requested = {
+        "address_group": request.address_groups,
+        "address": request.addresses,
+        "tag": request.tags,
+    }
+    if not any(requested.values()):
+        return "❌ Give address_groups, addresses or tags to delete"
+
+    # Groups reference addresses and groups; addresses and groups reference tags
+    needed = {object_type for object_type, names in requested.items() if names}
+    needed.add("address_group")
+    if request.tags:
+        needed.add("address")
+
+    client = get_scm_client()
+    try:
+        snapshots = {
+            object_type: get_folder_snapshot(client, object_type, request.folder)
+            for object_type in DELETE_ORDER
+            if object_type in needed
+        }
+    except Exception as e:
+        return f"❌ Failed to list objects in '{request.folder}': {type(e).__name__}: {str(e)}"
+
+    targets = {}
+    settled = []
+    for object_type, patterns in requested.items():
+        selected = {}
+        for pattern in patterns:
+            snapshot = snapshots[object_type]
+            matches = select_objects(snapshot.own(), name_pattern=pattern)
+            if not matches:
+                parent = snapshot.inherited_from(pattern)
+                info = (
+                    f"defined in parent folder '{parent}'"
+                    if parent
+                    else f"no {_DELETE_LABELS[object_type]} found"
                 )
-                results.append(f"⏭️  {group_config.name} (already exists)")
-                continue
-            except ObjectNotPresentError:
-                pass
-
-            # Validate members exist
-            missing_members = []
-            for member in group_config.members:
-                try:
-                    client.address.fetch(name=member, folder=request.folder)
-                except ObjectNotPresentError:
-                    missing_members.append(member)
+                settled.append(ItemOutcome(pattern, SKIPPED, info=info))
+            selected.update((obj.name, obj) for obj in matches)
+        targets[object_type] = list(selected.values())
 
-            if missing_members:
-                errors.append(
-                    f"❌ {group_config.name}: Missing members: {', '.join(missing_members)}"
+    return DeleteJob(client, request.folder, snapshots, targets, tuple(settled))
+
+
+def _split_delete_wave(
+    job: DeleteJob, object_type: str, pending: list
+) -> tuple[list, list, list[ItemOutcome]]:
+    """
+    Split pending deletions into the next wave and the rest.
+
+    Objects nothing references are ready. Objects referenced only by pending
+    objects of the same type (nested groups) wait for a later wave. Objects
+    referenced by anything that stays are skipped.
+
+    Returns:
+        Tuple of (ready objects, waiting objects, SKIPPED outcomes)
+    """
+    pending_names = {obj.name for obj in pending}
+    referrer_types = (
+        ("address", "address_group") if object_type == "tag" else ("address_group",)
+    )
+
+    # One pass over the referring objects builds the reverse index
+    referrers: dict[str, list[tuple[str, str]]] = {}
+    for referrer_type in referrer_types:
+        for obj in job.snapshots[referrer_type]:
+            for name in _references(obj, object_type):
+                if name in pending_names:
+                    referrers.setdefault(name, []).append((referrer_type, obj.name))
+
+    ready, waiting, skipped = [], [], []
+    for obj in pending:
+        refs = referrers.get(obj.name)
+        if not refs:
+            ready.append(obj)
+        elif all(t == object_type and n in pending_names for t, n in refs):
+            waiting.append(obj)
+        else:
+            names = sorted({n for _, n in refs})
+            skipped.append(
+                ItemOutcome(
+                    obj.name,
+                    SKIPPED,
+                    _object_id(obj),
+                    f"referenced by {compact_names(names, max_items=3)}",
                 )
-                continue
+            )
+
+    if waiting and not ready:
+        # Only a reference cycle can leave nothing deletable
+        skipped += [
+            ItemOutcome(obj.name, SKIPPED, _object_id(obj), "reference cycle")
+            for obj in waiting
+        ]
+        waiting = []
+    return ready, waiting, skipped
 
-            # Convert to dict and add folder
-            config_dict = {
-                "name": group_config.name,
-                "static": group_config.members,
-                "folder": request.folder,
-            }
 
-            # Only include optional fields if non-empty
-            if group_config.description:
-                config_dict["description"] = group_config.description
-            if group_config.tag:
-                config_dict["tag"] = group_config.tag
+def _delete_object(job: DeleteJob, object_type: str, obj: Any) -> ItemOutcome:
+    """Delete one object and drop it from the folder snapshot."""
+    getattr(job.client, object_type).delete(str(obj.id))
+    job.snapshots[object_type].discard(obj.name)
+    return ItemOutcome(obj.name, DELETED, _object_id(obj), _DELETE_LABELS[object_type])
 
-            # Create
-            group = client.address_group.create(config_dict)
-            results.append(f"✅ {group.name} ({len(group_config.members)} members)")
 
-        except Exception as e:
-            errors.append(f"❌ {group_config.name}: {str(e)}")
+def _plan_delete_waves(
+    job: DeleteJob,
+) -> Iterator[tuple[str, list, list[ItemOutcome]]]:
+    """
+    Yield the job's deletion waves in reference order.
+
+    Each wave is planned after the previous one has run, since its deletions
+    (dropped from the snapshots) free the objects they referenced.
+
+    Yields:
+        Tuple of (object type, objects to delete concurrently, SKIPPED outcomes)
+    """
+    for object_type in DELETE_ORDER:
+        pending = job.targets.get(object_type, [])
+        while pending:
+            ready, pending, skipped = _split_delete_wave(job, object_type, pending)
+            yield object_type, ready, skipped
 
-    created_count = len([r for r in results if "✅" in r])
-    existing_count = len([r for r in results if "⏭️" in r])
 
-    summary = f"Batch address group creation: {created_count} created, {existing_count} already existed\n\n"
-    summary += "\n".join(results)
+def _run_delete_job(job: DeleteJob) -> list[ItemOutcome]:
+    """Delete the job's targets in reference order, one concurrent wave at a time."""
+    item_outcomes = []
+    for object_type, ready, skipped in _plan_delete_waves(job):
+        delete_one = functools.partial(_delete_object, job, object_type)
+        item_outcomes += skipped + _run_batch_items(ready, delete_one)
+    return item_outcomes
 
-    if errors:
-        summary += "\n\nErrors:\n" + "\n".join(errors)
 
-    return summary
+async def _arun_delete_job(job: DeleteJob) -> list[ItemOutcome]:
+    """Async variant of _run_delete_job."""
+    item_outcomes = []
+    for object_type, ready, skipped in _plan_delete_waves(job):
+        delete_one = functools.partial(_delete_object, job, object_type)
+        item_outcomes += skipped + await _arun_batch_items(ready, delete_one)
+    return item_outcomes
+
+
+def _object_delete_batch(request: BatchDeleteRequest) -> tuple[str, Optional[dict]]:
+    """
+    Delete address groups, addresses and tags in one batch operation.
+
+    Names may be globs (e.g., "old_*") and are resolved against folder
+    snapshots. Deletion runs in reference order (groups, then addresses, then
+    tags), concurrently within each step under the batch executor's limits.
+    Objects still referenced by something that stays (e.g., an address in a
+    group that is not deleted, a tag on a remaining address) are skipped and
+    reported with their referrers.
+
+    Args:
+        request: Folder and the group, address and tag names or globs
+
+    Returns:
+        Tuple of (compact summary for the model, full results artifact)
+
+    Example:
+        "Delete all web_* addresses and the web_servers group in Texas"
+    """
+    job = _prepare_batch_delete(request)
+    if isinstance(job, str):
+        return job, None
+    item_outcomes = _run_delete_job(job) + list(job.settled)
+    return _batch_response("Batch delete", job.folder, item_outcomes, DELETE_STATUSES)
+
+
+async def _aobject_delete_batch(
+    request: BatchDeleteRequest,
+) -> tuple[str, Optional[dict]]:
+    """Async variant of _object_delete_batch."""
+    job = await asyncio.to_thread(_prepare_batch_delete, request)
+    if isinstance(job, str):
+        return job, None
+    item_outcomes = await _arun_delete_job(job) + list(job.settled)
+    return _batch_response("Batch delete", job.folder, item_outcomes, DELETE_STATUSES)
+
+
+def _desired_objects(specs: dict[str, list]) -> dict[str, list[dict]]:
+    """Desired configs per object type in SCM field names (only fields the spec sets)."""
+    groups = []
+    for group_config in specs["address_group"]:
+        config = group_config.model_dump(exclude_unset=True)
+        config["static"] = config.pop("members")
+        groups.append(config)
+    return {
+        "tag": [tag.model_dump(exclude_unset=True) for tag in specs["tag"]],
+        "address": [addr.model_dump(exclude_unset=True) for addr in specs["address"]],
+        "address_group": groups,
+    }
+
+
+def _build_folder_plan(
+    request: DesiredStateRequest,
+) -> Union[tuple[Plan, dict[str, FolderSnapshot]], str]:
+    """Validate the spec and diff it against one snapshot of each object type."""
+    client = get_scm_client()
+    try:
+        snapshots = {
+            object_type: get_folder_snapshot(client, object_type, request.folder)
+            for object_type in PLAN_ORDER
+        }
+    except Exception as e:
+        return f"❌ Failed to list objects in '{request.folder}': {type(e).__name__}: {str(e)}"
+
+    # Validate the whole spec locally; tags the spec creates count as known
+    known_tags = snapshots["tag"].names() | {tag.name for tag in request.tags}
+    specs = {}
+    problems = []
+    for object_type, configs in (
+        ("tag", request.tags),
+        ("address", request.addresses),
+        ("address_group", request.groups),
+    ):
+        offset = sum(len(checked) for checked in specs.values())
+        specs[object_type], found = preflight(
+            object_type, configs, None if object_type == "tag" else known_tags
+        )
+        problems += [
+            p._replace(
+                index=p.index + offset, name=f"{OBJECT_LABELS[object_type]} {p.name}"
+            )
+            for p in found
+        ]
+    if problems:
+        total = sum(len(checked) for checked in specs.values())
+        return format_problems("Desired state", problems, total)
+
+    desired = _desired_objects(specs)
+    return (
+        build_plan(request.folder, desired, snapshots, prune=request.prune),
+        snapshots,
+    )
+
+
+def _apply_action(
+    client: Any,
+    snapshots: dict[str, FolderSnapshot],
+    folder: str,
+    action: PlanAction,
+) -> ItemOutcome:
+    """Apply one create or update action and record the result in the snapshot."""
+    service = getattr(client, action.object_type)
+    if action.action == CREATE:
+        # Remove empty optional fields to avoid API validation errors
+        config = {k: v for k, v in action.config.items() if v not in ("", [], None)}
+        obj = service.create({**config, "folder": folder})
+        info = OBJECT_LABELS[action.object_type]
+        status = CREATED
+    else:
+        obj = service.update(updated_object(action))
+        info = f"{', '.join(action.config)} changed"
+        status = UPDATED
+    snapshots[action.object_type].add(obj)
+    return ItemOutcome(obj.name, status, _object_id(obj), info)
+
+
+def _settled_plan_outcomes(plan: Plan) -> list[ItemOutcome]:
+    """Outcomes decided by the plan alone: unchanged objects and invalid actions."""
+    outcomes = [
+        ItemOutcome(name, UNCHANGED)
+        for object_type in PLAN_ORDER
+        for name in plan.unchanged.get(object_type, [])
+    ]
+    outcomes += [ItemOutcome(a.name, FAILED, error=a.error) for a in plan.invalid]
+    return outcomes
+
+
+def _plan_delete_job(plan: Plan, snapshots: dict[str, FolderSnapshot]) -> DeleteJob:
+    """Delete job for the plan's prune actions (reference checks included)."""
+    targets: dict[str, list] = {}
+    for action in plan.of(DELETE):
+        targets.setdefault(action.object_type, []).append(action.current)
+    return DeleteJob(get_scm_client(), plan.folder, snapshots, targets, ())
+
+
+def _folder_plan(request: DesiredStateRequest) -> tuple[str, Optional[dict]]:
+    """
+    Show the changes needed to bring a folder to a desired state.
+
+    The desired tags, addresses and groups are diffed against one listing of
+    each object type; nothing is changed. Only the fields the spec sets are
+    compared, and objects not in the spec are deleted only with prune.
+
+    Args:
+        request: Folder, desired tags, addresses and groups, and prune
+
+    Returns:
+        Tuple of (plan summary with API-call estimate, plan artifact)
+
+    Example:
+        "What would change in Texas if it should have exactly these objects?"
+    """
+    planned = _build_folder_plan(request)
+    if isinstance(planned, str):
+        return planned, None
+    plan, _ = planned
+    return plan.summary(), plan.to_dict()
+
+
+async def _afolder_plan(request: DesiredStateRequest) -> tuple[str, Optional[dict]]:
+    """Async variant of _folder_plan."""
+    return await asyncio.to_thread(_folder_plan, request)
+
+
+def _folder_apply(request: DesiredStateRequest) -> tuple[str, Optional[dict]]:
+    """
+    Bring a folder to a desired state with the minimal set of changes.
+
+    Builds the same plan as folder_plan and applies it: creates and updates
+    run concurrently per object type in dependency order (tags, addresses,
+    groups, nested groups after their members), then prune deletes run in
+    reverse order with the reference checks of object_delete_batch. Applying
+    an unchanged spec costs only the folder listings.
+
+    Args:
+        request: Folder, desired tags, addresses and groups, and prune
+
+    Returns:
+        Tuple of (compact summary for the model, full results artifact)
+    """
+    planned = _build_folder_plan(request)
+    if isinstance(planned, str):
+        return planned, None
+    plan, snapshots = planned
+
+    apply_one = functools.partial(
+        _apply_action, get_scm_client(), snapshots, plan.folder
+    )
+    item_outcomes = []
+    for wave in plan.waves():
+        item_outcomes += _run_batch_items(wave, apply_one)
+    item_outcomes += _run_delete_job(_plan_delete_job(plan, snapshots))
+    item_outcomes += _settled_plan_outcomes(plan)
+    return _batch_response(
+        "Desired state apply", plan.folder, item_outcomes, APPLY_STATUSES
+    )
+
+
+async def _afolder_apply(request: DesiredStateRequest) -> tuple[str, Optional[dict]]:
+    """Async variant of _folder_apply."""
+    planned = await asyncio.to_thread(_build_folder_plan, request)
+    if isinstance(planned, str):
+        return planned, None
+    plan, snapshots = planned
+
+    apply_one = functools.partial(
+        _apply_action, get_scm_client(), snapshots, plan.folder
+    )
+    item_outcomes = []
+    for wave in plan.waves():
+        item_outcomes += await _arun_batch_items(wave, apply_one)
+    item_outcomes += await _arun_delete_job(_plan_delete_job(plan, snapshots))
+    item_outcomes += _settled_plan_outcomes(plan)
+    return _batch_response(
+        "Desired state apply", plan.folder, item_outcomes, APPLY_STATUSES
+    )
 
 
 # ============================================================================
@@ -320,6 +1273,8 @@ def _tag_create(name: str, color: str, folder: str, comments: str = "") -> str:
             config["comments"] = comments
 
         tag = client.tag.create(config)
+        # Child folders inherit the object, so their snapshots change too
+        invalidate_folder_snapshot(client, "tag")
         return f"✅ Created tag '{tag.name}' ({tag.color}) in '{folder}' (ID: {tag.id})"
     except Exception as e:
         return f"❌ Failed: {type(e).__name__}: {str(e)}"
@@ -377,6 +1332,8 @@ def _address_create(
             config["tag"] = tag_list
 
         addr = client.address.create(config)
+        # Child folders inherit the object, so their snapshots change too
+        invalidate_folder_snapshot(client, "address")
         return f"✅ Created address '{addr.name}' ({addr.ip_netmask}) in '{folder}' (ID: {addr.id})"
     except Exception as e:
         return f"❌ Failed: {type(e).__name__}: {str(e)}"
@@ -426,6 +1383,8 @@ def _address_update(
             addr.tag = list(current_tags - tags_to_remove)
 
         updated = client.address.update(addr)
+        # Child folders inherit the object, so their snapshots change too
+        invalidate_folder_snapshot(client, "address")
         return f"✅ Updated address '{updated.name}' in '{folder}' (ID: {updated.id})"
     except ObjectNotPresentError:
         return f"❌ Address '{name}' not found in folder '{folder}'"
@@ -632,6 +1591,21 @@ def _commit_changes(
             return f"❌ Commit failed\nError: {error_type}: {error_msg}"
 
 
+def _in_thread(func: Callable[..., str]) -> Callable[..., Any]:
+    """
+    Wrap a synchronous tool function as a coroutine.
+
+    The SCM SDK is synchronous, so async tool calls run the function in a worker
+    thread and keep the event loop free for other sessions.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> str:
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+    return wrapper
+
+
 # ============================================================================
 # CREATE TOOL INSTANCES
 # ============================================================================
@@ -640,7 +1614,9 @@ tools = [
     # BATCH OPERATIONS
     StructuredTool.from_function(
         func=_tag_create_batch,
+        coroutine=_atag_create_batch,
         name="tag_create_batch",
+        response_format="content_and_artifact",
         description=(
             "Create multiple tags in one batch operation. "
             "Use this for bulk tag creation to avoid recursion limits. "
@@ -649,60 +1625,128 @@ tools = [
     ),
     StructuredTool.from_function(
         func=_address_create_batch,
+        coroutine=_aaddress_create_batch,
         name="address_create_batch",
+        response_format="content_and_artifact",
         description=(
             "Create multiple address objects in one batch operation. "
             "Use this for bulk address creation (e.g., '14 addresses'). "
             "Validates IP format via Pydantic."
         ),
     ),
+    StructuredTool.from_function(
+        func=_address_create_range,
+        coroutine=_aaddress_create_range,
+        name="address_create_range",
+        response_format="content_and_artifact",
+        description=(
+            "Create one address object per IP of a range (start/end) or CIDR block. "
+            "Names and descriptions come from templates, so never list the "
+            "addresses individually. Use this for IP ranges of any size."
+        ),
+    ),
     StructuredTool.from_function(
         func=_address_group_create_batch,
+        coroutine=_aaddress_group_create_batch,
         name="address_group_create_batch",
+        response_format="content_and_artifact",
         description=(
             "Create multiple address groups in one batch operation. "
             "Validates all members exist before creating."
         ),
     ),
+    StructuredTool.from_function(
+        func=_address_tag_bulk,
+        coroutine=_aaddress_tag_bulk,
+        name="address_tag_bulk",
+        response_format="content_and_artifact",
+        description=(
+            "Add and/or remove tags on every address matching a selector "
+            "(name glob, existing tag and/or CIDR). Selection happens on one "
+            "folder listing and only changed addresses are updated, so never "
+            "call address_update per address for bulk tag changes."
+        ),
+    ),
+    StructuredTool.from_function(
+        func=_object_delete_batch,
+        coroutine=_aobject_delete_batch,
+        name="object_delete_batch",
+        response_format="content_and_artifact",
+        description=(
+            "Delete address groups, addresses and tags (names or globs) in one "
+            "batch. Deletes in reference order (groups, addresses, tags) and "
+            "skips objects that something else still references."
+        ),
+    ),
+    StructuredTool.from_function(
+        func=_folder_plan,
+        coroutine=_afolder_plan,
+        name="folder_plan",
+        response_format="content_and_artifact",
+        description=(
+            "Preview the create/update/delete changes (with an API-call "
+            "estimate) that would bring a folder's tags, addresses and groups "
+            "to a desired state. Changes nothing."
+        ),
+    ),
+    StructuredTool.from_function(
+        func=_folder_apply,
+        coroutine=_afolder_apply,
+        name="folder_apply",
+        response_format="content_and_artifact",
+        description=(
+            "Bring a folder's tags, addresses and groups to a desired state: "
+            "creates missing objects, updates drifted ones and, with prune, "
+            "deletes unlisted ones. Objects already in sync cost no API calls."
+        ),
+    ),
     # INDIVIDUAL OPERATIONS
     StructuredTool.from_function(
         func=_tag_create,
+        coroutine=_in_thread(_tag_create),
         name="tag_create",
         description="Create a single tag",
     ),
     StructuredTool.from_function(
         func=_tag_read,
+        coroutine=_in_thread(_tag_read),
         name="tag_read",
         description="Get details of a specific tag",
     ),
     StructuredTool.from_function(
         func=_tag_list,
+        coroutine=_in_thread(_tag_list),
         name="tag_list",
         description="List all tags in a folder",
     ),
     StructuredTool.from_function(
         func=_address_create,
+        coroutine=_in_thread(_address_create),
         name="address_create",
         description="Create a single address object",
     ),
     StructuredTool.from_function(
         func=_address_read,
+        coroutine=_in_thread(_address_read),
         name="address_read",
         description="Get details of a specific address",
     ),
     StructuredTool.from_function(
         func=_address_update,
+        coroutine=_in_thread(_address_update),
         name="address_update",
         description="Update an existing address (add/remove tags, change description)",
     ),
     StructuredTool.from_function(
         func=_address_list,
+        coroutine=_in_thread(_address_list),
         name="address_list",
         description="List all addresses in a folder",
     ),
     # COMMIT AND JOB MANAGEMENT
     StructuredTool.from_function(
         func=_commit_changes,
+        coroutine=_in_thread(_commit_changes),
         name="commit_changes",
         description=(
             "Commit configuration changes to Strata Cloud Manager. "
@@ -713,6 +1757,7 @@ tools = [
     ),
     StructuredTool.from_function(
         func=_check_job_status,
+        coroutine=_in_thread(_check_job_status),
         name="check_job_status",
         description=(
             "Check the status of an SCM job by job ID. "
@@ -728,34 +1773,49 @@ tools = [
 # ============================================================================
 
 
-def call_agent(state: AgentState) -> AgentState:
-    """Agent node that reasons about requests and decides which tools to use."""
-    llm = ChatAnthropic(model="claude-haiku-4-5-20251001", temperature=0)
-    model_with_tools = llm.bind_tools(tools)
+AGENT_MODEL = "claude-haiku-4-5-20251001"
 
-    system_prompt = SystemMessage(
-        content="""You are an expert Strata Cloud Manager (SCM) automation assistant with CRUD + Batch capabilities.
+SYSTEM_PROMPT = SystemMessage(
+    content="""You are an expert Strata Cloud Manager (SCM) automation assistant with CRUD + Batch capabilities.
 
 BATCH OPERATIONS (Use these for bulk requests!):
 ✅ tag_create_batch - Create multiple tags at once
 ✅ address_create_batch - Create multiple addresses at once
+✅ address_create_range - Create addresses for an IP range or CIDR block
 ✅ address_group_create_batch - Create multiple groups at once
+✅ address_tag_bulk - Add/remove tags on all addresses matching a selector
+✅ object_delete_batch - Delete groups, addresses and tags (names or globs)
+✅ folder_plan / folder_apply - Preview or apply a desired state for a folder
 
 WHEN TO USE BATCH TOOLS:
 - User asks for "14 addresses" → use address_create_batch
 - User asks for "multiple tags" → use tag_create_batch
-- User says "create addresses for IPs 1-20" → use address_create_batch
+- User says "create addresses for IPs 10.0.1.1 through 10.0.1.20" or "for every
+  host in 10.0.2.0/28" → use address_create_range with a name_template (e.g.,
+  "web_{index:02d}"); do NOT list the addresses one by one
+- User says "add Production tag to all web server addresses" or "remove the old
+  tag from everything in 10.0.1.0/24" → use address_tag_bulk with name_pattern
+  (e.g., "web_*"), has_tag and/or cidr; do NOT call address_update per address
+- User asks to delete or clean up objects → use object_delete_batch with names
+  or globs; always confirm with the user before deleting, and report any
+  skipped objects with what still references them
+- User describes what a folder should contain ("Texas should have exactly these
+  tags, addresses and groups", "fix any drift") → call folder_plan with the
+  full spec, show the plan, and call folder_apply with the same spec once the
+  user agrees; use prune=True only when the user wants unlisted objects removed
 - ANY request for more than 3-5 objects → use batch tools
 
 VALIDATION:
 ✅ Batch tools use Pydantic models for strict schema validation
-✅ IP addresses are validated via regex pattern
+✅ Batches are pre-flight checked (names, IPs, duplicates, colors, tag
+  references) before any API call; a failed check lists every problem at once
+  and nothing is created, so fix all listed items and retry the whole batch
 ✅ All fields match SCM API schema exactly
 ✅ Double validation: Pydantic + SDK
 
 INDIVIDUAL OPERATIONS:
 - Use individual tools for single objects or updates
-- Use address_update to add/remove tags from existing objects
+- Use address_update to add/remove tags or change the description of one address
 - Use _read tools to check current state before updates
 
 COMMIT OPERATIONS:
@@ -794,6 +1854,257 @@ Your action:
   Then inform user about job ID and how to check status
 
 Always explain what you're doing and confirm success!"""
+)
+
+SUMMARY_PROMPT = """You maintain a running summary of a conversation between a user and an
+SCM automation assistant. Extend the existing summary with the new messages below.
+Keep every detail needed to continue the work: folders, object names, IPs, tags,
+job IDs, what was created or committed, and anything still pending. Be concise and
+write plain prose without preamble."""
+
+
+def build_system_prompt(
+    prompt_caching: bool = False, summary: str = ""
+) -> SystemMessage:
+    """
+    Build the system message for an agent step.
+
+    With prompt caching, the static prompt carries a cache breakpoint. Anthropic
+    caches the whole prefix up to the breakpoint, which covers the tool schemas as
+    well as the system prompt. The rolling conversation summary, if any, is added
+    after the breakpoint so it never invalidates the cached prefix.
+
+    Args:
+        prompt_caching: Mark the static prompt as cacheable
+        summary: Rolling summary of trimmed conversation history
+
+    Returns:
+        SystemMessage: System prompt for call_agent
+    """
+    summary_text = f"SUMMARY OF EARLIER CONVERSATION:\n{summary}" if summary else ""
+
+    if not prompt_caching:
+        if not summary_text:
+            return SYSTEM_PROMPT
+        return SystemMessage(content=f"{SYSTEM_PROMPT.content}\n\n{summary_text}")
+
+    content = [
+        {
+            "type": "text",
+            "text": SYSTEM_PROMPT.content,
+            "cache_control": {"type": "ephemeral"},
+        }
+    ]
+    if summary_text:
+        content.append({"type": "text", "text": summary_text})
+    return SystemMessage(content=content)
+
+
+# Chat models keyed by model name, tool-bound models by (model name, tool names)
+_chat_models: dict[str, ChatAnthropic] = {}
+_bound_models: dict[tuple[str, tuple[str, ...]], Runnable] = {}
+_models_lock = threading.Lock()
+
+
+def get_chat_model(model: str = AGENT_MODEL) -> ChatAnthropic:
+    """
+    Get or create the plain chat model for ``model`` (cached, thread-safe).
+
+    Args:
+        model: Anthropic model name
+
+    Returns:
+        ChatAnthropic: Shared chat model without tools
+    """
+    llm = _chat_models.get(model)
+    if llm is None:
+        with _models_lock:
+            llm = _chat_models.get(model)
+            if llm is None:
+                llm = ChatAnthropic(model=model, temperature=0)
+                _chat_models[model] = llm
+    return llm
+
+
+def get_bound_model(
+    model: str = AGENT_MODEL, tool_list: Optional[list[StructuredTool]] = None
+) -> Runnable:
+    """
+    Get or create the chat model with tools bound (cached per model and tool set).
+
+    Building ChatAnthropic and converting every tool schema happens once; the
+    bound model is then shared by all graph steps, threads and sessions.
+
+    Args:
+        model: Anthropic model name
+        tool_list: Tools to bind (default: all workflow tools)
+
+    Returns:
+        Runnable: Chat model with tools bound
+    """
+    if tool_list is None:
+        tool_list = tools
+    key = (model, tuple(tool.name for tool in tool_list))
+
+    bound = _bound_models.get(key)
+    if bound is None:
+        llm = get_chat_model(model)
+        with _models_lock:
+            bound = _bound_models.get(key)
+            if bound is None:
+                bound = llm.bind_tools(tool_list)
+                _bound_models[key] = bound
+    return bound
+
+
+def prompt_caching_enabled(config: Optional[RunnableConfig] = None) -> bool:
+    """
+    Check whether Anthropic prompt caching is enabled for a run.
+
+    Enabled per run with ``configurable.prompt_caching`` or globally with the
+    ANTHROPIC_PROMPT_CACHING environment variable (default: off).
+    """
+    configurable = (config or {}).get("configurable", {})
+    if "prompt_caching" in configurable:
+        return bool(configurable["prompt_caching"])
+    return get_config("ANTHROPIC_PROMPT_CACHING", default="false").lower() == "true"
+
+
+def get_turn_usage(messages: list[BaseMessage]) -> dict[str, int]:
+    """
+    Sum token usage of the model calls made since the last user message.
+
+    Args:
+        messages: Conversation messages (e.g., result["messages"] of an invoke)
+
+    Returns:
+        Dictionary with input_tokens, cache_read, cache_creation, uncached_input
+        and output_tokens for the latest turn
+    """
+    usage = {
+        "input_tokens": 0,
+        "cache_read": 0,
+        "cache_creation": 0,
+        "uncached_input": 0,
+        "output_tokens": 0,
+    }
+
+    for message in reversed(messages):
+        if isinstance(message, HumanMessage):
+            break
+        metadata = getattr(message, "usage_metadata", None)
+        if not metadata:
+            continue
+
+        details = metadata.get("input_token_details") or {}
+        cache_read = details.get("cache_read") or 0
+        cache_creation = (
+            (details.get("cache_creation") or 0)
+            + (details.get("ephemeral_5m_input_tokens") or 0)
+            + (details.get("ephemeral_1h_input_tokens") or 0)
+        )
+
+        # input_tokens already includes cache reads and writes
+        usage["input_tokens"] += metadata.get("input_tokens", 0)
+        usage["cache_read"] += cache_read
+        usage["cache_creation"] += cache_creation
+        usage["output_tokens"] += metadata.get("output_tokens", 0)
+
+    usage["uncached_input"] = (
+        usage["input_tokens"] - usage["cache_read"] - usage["cache_creation"]
+    )
+    return usage
+
+
+def get_turn_artifacts(messages: list[BaseMessage]) -> list[dict]:
+    """
+    Collect tool artifacts produced since the last user message.
+
+    Batch tools return their full per-object results as artifacts, which stay
+    in state for the CLI and traces but are never sent to the model.
+
+    Args:
+        messages: Conversation messages (e.g., result["messages"] of an invoke)
+
+    Returns:
+        Artifacts of the latest turn, oldest first
+    """
+    artifacts = []
+    for message in reversed(messages):
+        if isinstance(message, HumanMessage):
+            break
+        artifact = getattr(message, "artifact", None)
+        if isinstance(message, ToolMessage) and artifact:
+            artifacts.append(artifact)
+    return list(reversed(artifacts))
+
+
+def get_turn_tool_calls(messages: list[BaseMessage]) -> list[dict]:
+    """
+    Collect the tool calls made since the last user message.
+
+    Args:
+        messages: Conversation messages (e.g., result["messages"] of an invoke)
+
+    Returns:
+        One dict per call with name, args and status ("success" or "error"),
+        oldest first
+    """
+    turn = []
+    for message in reversed(messages):
+        if isinstance(message, HumanMessage):
+            break
+        turn.append(message)
+    turn.reverse()
+
+    statuses = {
+        message.tool_call_id: message.status
+        for message in turn
+        if isinstance(message, ToolMessage)
+    }
+    return [
+        {
+            "name": call["name"],
+            "args": call["args"],
+            "status": statuses.get(call["id"], "pending"),
+        }
+        for message in turn
+        if isinstance(message, AIMessage)
+        for call in message.tool_calls
+    ]
+
+
+def describe_turn(messages: list[BaseMessage]) -> dict:
+    """
+    Summarize the latest turn as JSON-serializable fields.
+
+    Used by the JSONL runner and the HTTP server to report a turn.
+
+    Args:
+        messages: Conversation messages (e.g., result["messages"] of an invoke)
+
+    Returns:
+        Dictionary with final_message, tool_calls, batches (per-item batch
+        results, see BatchResult.to_dict()), usage and fast_path (the fast-path
+        intent name, or None if the model answered)
+    """
+    return {
+        "final_message": messages[-1].content,
+        "tool_calls": get_turn_tool_calls(messages),
+        "batches": get_turn_artifacts(messages),
+        "usage": get_turn_usage(messages),
+        "fast_path": get_fast_path_intent(messages),
+    }
+
+
+def call_agent(
+    state: AgentState, config: Optional[RunnableConfig] = None
+) -> AgentState:
+    """Agent node that reasons about requests and decides which tools to use."""
+    model_with_tools = get_bound_model()
+
+    system_prompt = build_system_prompt(
+        prompt_caching_enabled(config), state.get("summary", "")
     )
 
     messages = state["messages"]
@@ -802,11 +2113,295 @@ Always explain what you're doing and confirm success!"""
     return {"messages": [response]}
 
 
+async def acall_agent(
+    state: AgentState, config: Optional[RunnableConfig] = None
+) -> AgentState:
+    """Async variant of call_agent (model call via ainvoke)."""
+    model_with_tools = get_bound_model()
+
+    system_prompt = build_system_prompt(
+        prompt_caching_enabled(config), state.get("summary", "")
+    )
+
+    response = await model_with_tools.ainvoke([system_prompt] + state["messages"])
+    return {"messages": [response]}
+
+
+# ============================================================================
+# FAST-PATH ROUTER NODE
+# ============================================================================
+
+tools_by_name = {tool.name: tool for tool in tools}
+
+
+def fast_path_enabled(config: Optional[RunnableConfig] = None) -> bool:
+    """
+    Check whether the fast-path router is enabled for a run.
+
+    Set per run with ``configurable.fast_path`` or globally with the
+    SCM_FAST_PATH environment variable (default: on).
+    """
+    configurable = (config or {}).get("configurable", {})
+    if configurable.get("fast_path") is not None:
+        return bool(configurable["fast_path"])
+    return get_config("SCM_FAST_PATH", default="true").lower() == "true"
+
+
+def get_fast_path_intent(messages: list[BaseMessage]) -> Optional[str]:
+    """
+    Return the fast-path intent that answered the latest turn, if any.
+
+    Args:
+        messages: Conversation messages (e.g., result["messages"] of an invoke)
+
+    Returns:
+        Intent name (e.g., "tag_list"), or None if the agent answered
+    """
+    if not messages:
+        return None
+    return getattr(messages[-1], "response_metadata", {}).get("fast_path")
+
+
+def _match_fast_path(
+    state: AgentState, config: Optional[RunnableConfig] = None
+) -> Optional[Intent]:
+    """Return the fast-path intent of the latest user message, if any."""
+    last_message = state["messages"][-1]
+    if not fast_path_enabled(config) or not isinstance(last_message, HumanMessage):
+        return None
+    return match_intent(_message_text(last_message))
+
+
+def _fast_path_messages(intent: Intent, output: str) -> AgentState:
+    """Build the tool-call, tool-result and answer messages of a fast-path turn."""
+    tool_call_id = f"fast_path_{uuid7().hex}"
+    metadata = {"fast_path": intent.name}
+    return {
+        "messages": [
+            AIMessage(
+                content="",
+                tool_calls=[
+                    {"name": intent.tool, "args": intent.args, "id": tool_call_id}
+                ],
+                response_metadata=metadata,
+            ),
+            ToolMessage(content=output, name=intent.tool, tool_call_id=tool_call_id),
+            AIMessage(content=output, response_metadata=metadata),
+        ]
+    }
+
+
+def fast_path(state: AgentState, config: Optional[RunnableConfig] = None) -> AgentState:
+    """
+    Answer simple, unambiguous requests without calling the model.
+
+    Recognized requests call their tool directly and record the same
+    tool-call / tool-result / answer messages the agent would have produced,
+    so later turns see a consistent history. Anything else falls through.
+    """
+    intent = _match_fast_path(state, config)
+    if intent is None:
+        return {}
+
+    try:
+        output = tools_by_name[intent.tool].invoke(intent.args)
+    except Exception:
+        # Let the agent handle anything the tool could not
+        return {}
+
+    return _fast_path_messages(intent, output)
+
+
+async def afast_path(
+    state: AgentState, config: Optional[RunnableConfig] = None
+) -> AgentState:
+    """Async variant of fast_path."""
+    intent = _match_fast_path(state, config)
+    if intent is None:
+        return {}
+
+    try:
+        output = await tools_by_name[intent.tool].ainvoke(intent.args)
+    except Exception:
+        return {}
+
+    return _fast_path_messages(intent, output)
+
+
+def route_fast_path(state: AgentState) -> Literal["answered", "agent"]:
+    """Finish the turn if the fast path answered it, otherwise run the agent."""
+    if get_fast_path_intent(state["messages"]):
+        return "answered"
+    return "agent"
+
+
+# ============================================================================
+# HISTORY MANAGEMENT NODE
+# ============================================================================
+
+
+def _history_token_budget(config: Optional[RunnableConfig] = None) -> int:
+    """
+    Get the history token budget for a run (0 disables trimming).
+
+    Set per run with ``configurable.history_token_budget`` or globally with the
+    SCM_HISTORY_TOKEN_BUDGET environment variable (default: 30000).
+    """
+    configurable = (config or {}).get("configurable", {})
+    if configurable.get("history_token_budget") is not None:
+        return int(configurable["history_token_budget"])
+    return int(get_config("SCM_HISTORY_TOKEN_BUDGET", default="30000"))
+
+
+def _split_turns(messages: list[BaseMessage]) -> list[list[BaseMessage]]:
+    """
+    Split messages into turns, each starting at a user message.
+
+    A turn holds the user message plus every AI message and tool result that
+    followed it, so tool calls always stay together with their results.
+    """
+    turns: list[list[BaseMessage]] = []
+    for message in messages:
+        if isinstance(message, HumanMessage) or not turns:
+            turns.append([])
+        turns[-1].append(message)
+    return turns
+
+
+def _message_text(message: BaseMessage) -> str:
+    """Return the text content of a message (``.text`` is a method on older langchain-core)."""
+    text = message.text
+    return text if isinstance(text, str) else text()
+
+
+def _format_for_summary(messages: list[BaseMessage], max_chars: int = 2000) -> str:
+    """Render messages as plain text transcript lines for summarization."""
+    lines = []
+    for message in messages:
+        if isinstance(message, HumanMessage):
+            role = "User"
+        elif isinstance(message, ToolMessage):
+            role = f"Tool result ({message.name})"
+        else:
+            role = "Assistant"
+
+        text = _message_text(message)
+        for tool_call in getattr(message, "tool_calls", None) or []:
+            text += f"\n[called {tool_call['name']} with {tool_call['args']}]"
+
+        if len(text) > max_chars:
+            text = text[:max_chars] + " ...(truncated)"
+        lines.append(f"{role}: {text}")
+    return "\n".join(lines)
+
+
+def _history_to_summarize(
+    state: AgentState, config: Optional[RunnableConfig] = None
+) -> Optional[tuple[list[BaseMessage], list[BaseMessage]]]:
+    """
+    Select the oldest whole turns that no longer fit the history budget.
+
+    Returns:
+        (messages to remove, summarization prompt), or None if the history fits
+    """
+    budget = _history_token_budget(config)
+    messages = list(state["messages"])
+
+    if budget <= 0 or count_tokens_approximately(messages) <= budget:
+        return None
+
+    # Keep the newest turns that fit the budget
+    turns = _split_turns(messages)
+    kept_tokens = count_tokens_approximately(turns[-1])
+    split = len(turns) - 1
+    while split > 0:
+        turn_tokens = count_tokens_approximately(turns[split - 1])
+        if kept_tokens + turn_tokens > budget:
+            break
+        kept_tokens += turn_tokens
+        split -= 1
+
+    old_messages = [message for turn in turns[:split] for message in turn]
+    if not old_messages:
+        return None
+
+    existing_summary = state.get("summary", "")
+    prompt = [
+        SystemMessage(content=SUMMARY_PROMPT),
+        HumanMessage(
+            content=(
+                f"Existing summary:\n{existing_summary or '(none)'}\n\n"
+                f"New messages:\n{_format_for_summary(old_messages)}"
+            )
+        ),
+    ]
+    return old_messages, prompt
+
+
+def manage_history(
+    state: AgentState, config: Optional[RunnableConfig] = None
+) -> AgentState:
+    """
+    Keep conversation history under the token budget before an agent step.
+
+    Runs before the first agent step of a turn and, via route_history, after
+    any tool round that pushes the history over budget. When the history
+    exceeds the budget, the oldest whole turns are folded into
+    the rolling summary and removed from state. The newest turn is always kept,
+    and turns are never split, so tool calls stay paired with their results.
+    """
+    selection = _history_to_summarize(state, config)
+    if selection is None:
+        return {}
+    old_messages, prompt = selection
+
+    try:
+        response = get_chat_model().invoke(prompt)
+    except Exception:
+        # Keep the full history this turn; trimming is retried on the next one
+        return {}
+
+    return {
+        "summary": _message_text(response),
+        "messages": [RemoveMessage(id=message.id) for message in old_messages],
+    }
+
+
+async def amanage_history(
+    state: AgentState, config: Optional[RunnableConfig] = None
+) -> AgentState:
+    """Async variant of manage_history (summary via ainvoke)."""
+    selection = _history_to_summarize(state, config)
+    if selection is None:
+        return {}
+    old_messages, prompt = selection
+
+    try:
+        response = await get_chat_model().ainvoke(prompt)
+    except Exception:
+        return {}
+
+    return {
+        "summary": _message_text(response),
+        "messages": [RemoveMessage(id=message.id) for message in old_messages],
+    }
+
+
 # ============================================================================
 # ROUTING & GRAPH
 # ============================================================================
 
 
+def route_history(
+    state: AgentState, config: Optional[RunnableConfig] = None
+) -> Literal["manage_history", "agent"]:
+    """Route tool results through manage_history only when over the history budget."""
+    budget = _history_token_budget(config)
+    if budget > 0 and count_tokens_approximately(list(state["messages"])) > budget:
+        return "manage_history"
+    return "agent"
+
+
 def should_continue(state: AgentState) -> Literal["tools", "end"]:
     """Determine if agent should continue using tools."""
     last_message = state["messages"][-1]
@@ -819,29 +2414,82 @@ def build_nlp_workflow() -> StateGraph:
     """Build the ReAct workflow with batch operations."""
     graph = StateGraph(AgentState)
 
-    graph.add_node("agent", call_agent)
+    # Each node has a sync and an async implementation, so the same graph serves
+    # invoke/stream and ainvoke/astream
+    graph.add_node("fast_path", RunnableLambda(fast_path, afunc=afast_path))
+    graph.add_node(
+        "manage_history", RunnableLambda(manage_history, afunc=amanage_history)
+    )
+    graph.add_node("agent", RunnableLambda(call_agent, afunc=acall_agent))
     graph.add_node("tools", ToolNode(tools))
 
-    graph.add_edge(START, "agent")
+    graph.add_edge(START, "fast_path")
+    graph.add_conditional_edges(
+        "fast_path", route_fast_path, {"answered": END, "agent": "manage_history"}
+    )
+    graph.add_edge("manage_history", "agent")
     graph.add_conditional_edges(
         "agent", should_continue, {"tools": "tools", "end": END}
     )
-    graph.add_edge("tools", "agent")
+    # Long tool loops (batch results, plans) can outgrow the budget mid-turn
+    graph.add_conditional_edges(
+        "tools",
+        route_history,
+        {"manage_history": "manage_history", "agent": "agent"},
+    )
 
     return graph
 
 
-_compiled_app = None
+# Compiled apps keyed by checkpoint database path (None = in-memory)
+_compiled_apps: dict[Optional[str], Runnable] = {}
+_compiled_apps_lock = threading.Lock()
+
+
+def get_compiled_app(checkpoint_db: Optional[str] = None):
+    """
+    Get or create the compiled workflow app (singleton pattern).
+
+    Args:
+        checkpoint_db: SQLite database for persistent, pruned checkpoints
+            (default: SCM_CHECKPOINT_DB, or in-memory checkpoints if unset)
+
+    Returns:
+        Compiled LangGraph app, one per checkpoint database
+    """
+    checkpoint_db = checkpoint_db or get_config("SCM_CHECKPOINT_DB") or None
+    app = _compiled_apps.get(checkpoint_db)
+    if app is not None:
+        return app
+
+    with _compiled_apps_lock:
+        app = _compiled_apps.get(checkpoint_db)
+        if app is None:
+            if checkpoint_db:
+                checkpointer = open_checkpointer(checkpoint_db)
+            else:
+                checkpointer = MemorySaver()
+            app = build_nlp_workflow().compile(checkpointer=checkpointer)
+            _compiled_apps[checkpoint_db] = app
+    return app
+
+
+async def astream_turn(app, inputs: dict, config: RunnableConfig) -> dict:
+    """
+    Run one turn with astream and return the final graph state.
 
+    Args:
+        app: Compiled workflow app
+        inputs: Graph input (e.g., {"messages": [HumanMessage(...)]})
+        config: Run config with thread_id
 
-def get_compiled_app():
-    """Get or create the compiled workflow app (singleton pattern)."""
-    global _compiled_app
-    if _compiled_app is None:
-        graph = build_nlp_workflow()
-        checkpointer = MemorySaver()
-        _compiled_app = graph.compile(checkpointer=checkpointer)
-    return _compiled_app
+    Returns:
+        Final state, as app.invoke() would return it
+    """
+    result = None
+    async for state in app.astream(inputs, config=config, stream_mode="values"):
+        result = state
+    return result
 
 
 # ============================================================================
@@ -868,6 +2516,9 @@ Examples:
   # File input (execute instructions from file)
   python -m src.main --file instructions.txt
 
+  # Independent file instructions in parallel
+  python -m src.main --file reports.txt --parallel 4
+
 Batch Operation Examples:
   "Create 14 address objects with different IPs and the langgraph tag in Texas"
   "Create tags: Production (Red), Staging (Blue), Development (Green) in Texas"
@@ -914,6 +2565,13 @@ Single Operation Examples:
         default=50,
         help="Recursion limit (default: 50)",
     )
+    parser.add_argument(
+        "--parallel",
+        "-P",
+        type=int,
+        default=None,
+        help="Run file instructions concurrently, at most N at a time",
+    )
 
     args = parser.parse_args()
 
@@ -993,9 +2651,36 @@ Single Operation Examples:
             }
 
             # Check if file has multiple lines (execute each separately) or single instruction
-            lines = [line.strip() for line in content.split("\n") if line.strip()]
+            units = parse_instructions(content)
+            lines = flatten_instructions(units)
+
+            if args.parallel and len(lines) > 1:
+                # Independent units run concurrently, each on its own thread
+                print(
+                    f"📝 Found {len(lines)} instructions, up to {args.parallel} at a time\n"
+                )
+                base_thread = config["configurable"]["thread_id"]
+
+                def run_line(text: str, unit_number: int) -> dict:
+                    return app.invoke(
+                        {"messages": [HumanMessage(content=text)]},
+                        config={
+                            **config,
+                            "configurable": {
+                                "thread_id": f"{base_thread}-{unit_number}"
+                            },
+                        },
+                    )
 
-            if len(lines) == 1:
+                for outcome in run_instructions(units, run_line, args.parallel):
+                    number = outcome.instruction.number
+                    print(f"[{number}/{len(lines)}] {outcome.instruction.text}")
+                    if outcome.error is not None:
+                        print(f"❌ {type(outcome.error).__name__}: {outcome.error}\n")
+                    else:
+                        final_message = outcome.result["messages"][-1]
+                        print(f"✅ {final_message.content} ({outcome.elapsed:.2f}s)\n")
+            elif len(lines) == 1:
                 # Single instruction
                 print(f"📝 Instruction: {lines[0]}\n")
                 result = app.invoke(
@@ -0,0 +1,422 @@
+"""
+Local HTTP API over the compiled workflow graph.
+
+`scm-agent serve` keeps one process alive so the agent stack is imported, the
+graph compiled and SCM authenticated once. The pooled SCM client and its folder
+snapshots stay warm across requests. The server binds to the loopback interface
+only.
+
+Since any local process or web page can reach the loopback interface, every
+request is checked before it runs the agent with the user's SCM credentials:
+
+- ``Host`` must be ``127.0.0.1:<port>`` or ``localhost:<port>`` (blocks DNS
+  rebinding) and browser requests (with an ``Origin`` header) are refused: 403
+- Every endpoint except ``/health`` requires ``Authorization: Bearer <token>``
+  with the per-process token `scm-agent serve` prints (or SCM_SERVER_TOKEN): 401
+- ``POST`` bodies must be sent as ``Content-Type: application/json``: 415
+
+Endpoints (JSON in, JSON out):
+
+- ``GET /health``: server status
+- ``POST /v1/messages``: run a prompt on a new thread
+- ``POST /v1/threads/{thread_id}/messages``: run a prompt on a thread
+- ``GET /v1/threads/{thread_id}``: conversation messages of a thread
+- ``DELETE /v1/threads/{thread_id}``: delete a thread's checkpoints
+
+Message bodies take ``prompt``, optional ``options`` (as in JSONL records) and
+``stream``. With ``"stream": true`` the response is NDJSON: one ``update`` event per
+graph node as it finishes, then a ``result`` event.
+
+Requests on different threads run concurrently (up to --max-concurrency);
+requests on the same thread wait for each other and run one at a time. With
+--async, graph runs use astream on one shared event loop instead of occupying a
+request thread each.
+"""
+
+import hmac
+import json
+import logging
+import secrets
+import threading
+import time
+from collections.abc import Iterator
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+from urllib.parse import unquote
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+from langsmith import uuid7
+
+from src.core.aio import iterate_async
+from src.core.config import get_config
+from src.core.jsonl import RecordError, record_config, validate_record
+from src.main import describe_turn
+
+logger = logging.getLogger(__name__)
+
+LOOPBACK_HOST = "127.0.0.1"
+
+# Largest accepted request body
+MAX_BODY_BYTES = 1024 * 1024
+
+
+def message_to_dict(message: BaseMessage) -> dict:
+    """Convert a conversation message to a JSON-serializable dict."""
+    data = {"type": message.type, "content": message.content}
+    if isinstance(message, AIMessage) and message.tool_calls:
+        data["tool_calls"] = [
+            {"name": call["name"], "args": call["args"]} for call in message.tool_calls
+        ]
+    if isinstance(message, ToolMessage):
+        data["name"] = message.name
+        data["status"] = message.status
+    return data
+
+
+class AgentServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server that runs requests against one compiled graph.
+
+    Attributes:
+        app: Compiled LangGraph app
+        base_config: Run config applied to every request
+        token: Bearer token clients must send
+        started_at: Server start time (epoch seconds)
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        app,
+        base_config: dict,
+        port: int,
+        max_concurrency: int = 16,
+        use_async: bool = False,
+        token: Optional[str] = None,
+    ) -> None:
+        super().__init__((LOOPBACK_HOST, port), AgentRequestHandler)
+        self.app = app
+        self.base_config = base_config
+        self.token = (
+            token or get_config("SCM_SERVER_TOKEN") or secrets.token_urlsafe(32)
+        )
+        bound_port = self.server_address[1]
+        self.allowed_hosts = {
+            f"{LOOPBACK_HOST}:{bound_port}",
+            f"localhost:{bound_port}",
+        }
+        self.started_at = time.time()
+        self.use_async = use_async
+        self._runs = threading.BoundedSemaphore(max(max_concurrency, 1))
+        self._active = 0
+        self._served = 0
+        self._stats_lock = threading.Lock()
+        # Per-thread locks with reference counts, dropped when no request holds them
+        self._thread_locks: dict[str, list] = {}
+        self._thread_locks_lock = threading.Lock()
+
+    def is_authorized(self, header: Optional[str]) -> bool:
+        """Return True if an Authorization header carries the server token."""
+        scheme, _, credentials = (header or "").partition(" ")
+        return scheme.lower() == "bearer" and hmac.compare_digest(
+            credentials.strip().encode(), self.token.encode()
+        )
+
+    def delete_thread(self, thread_id: str) -> None:
+        """Delete a thread's checkpoints once no request is running on it."""
+        self._acquire_thread(thread_id)
+        try:
+            self.app.checkpointer.delete_thread(thread_id)
+        finally:
+            self._release_thread(thread_id)
+
+    def _acquire_thread(self, thread_id: str) -> None:
+        """Wait until no other request is running on the thread."""
+        with self._thread_locks_lock:
+            entry = self._thread_locks.setdefault(thread_id, [threading.Lock(), 0])
+            entry[1] += 1
+        entry[0].acquire()
+
+    def _release_thread(self, thread_id: str) -> None:
+        """Release the thread and drop its lock once no request is waiting."""
+        with self._thread_locks_lock:
+            entry = self._thread_locks[thread_id]
+            entry[0].release()
+            entry[1] -= 1
+            if not entry[1]:
+                del self._thread_locks[thread_id]
+
+    def run_turn(
+        self, thread_id: str, record: dict, stream: bool = False
+    ) -> Iterator[dict]:
+        """
+        Run one prompt on a thread.
+
+        Args:
+            thread_id: Conversation thread
+            record: Validated request (prompt and optional options)
+            stream: Yield an update event per graph node before the result
+
+        Yields:
+            dict: ``update`` events (if streaming), then one ``result`` event
+        """
+        config = record_config(record, self.base_config, thread_id)
+        inputs = {"messages": [HumanMessage(content=record["prompt"])]}
+
+        self._acquire_thread(thread_id)
+        try:
+            with self._runs:
+                with self._stats_lock:
+                    self._active += 1
+                started = time.perf_counter()
+                try:
+                    messages: list[BaseMessage] = []
+                    for mode, chunk in self._stream(inputs, config):
+                        if mode == "values":
+                            messages = chunk["messages"]
+                            continue
+                        if not stream:
+                            continue
+                        for node, update in chunk.items():
+                            yield {
+                                "event": "update",
+                                "node": node,
+                                "messages": [
+                                    message_to_dict(m)
+                                    for m in (update or {}).get("messages", [])
+                                    if isinstance(m, BaseMessage)
+                                ],
+                                "elapsed": round(time.perf_counter() - started, 3),
+                            }
+                    yield {
+                        "event": "result",
+                        "thread_id": thread_id,
+                        "status": "ok",
+                        **describe_turn(messages),
+                        "wall_time": round(time.perf_counter() - started, 3),
+                    }
+                finally:
+                    with self._stats_lock:
+                        self._active -= 1
+                        self._served += 1
+        finally:
+            self._release_thread(thread_id)
+
+    def _stream(self, inputs: dict, config: dict) -> Iterator[tuple[str, Any]]:
+        """Stream graph updates and values, on the shared event loop if async."""
+        stream_mode = ["updates", "values"]
+        if self.use_async:
+            return iterate_async(
+                self.app.astream(inputs, config=config, stream_mode=stream_mode)
+            )
+        return self.app.stream(inputs, config=config, stream_mode=stream_mode)
+
+    def health(self) -> dict:
+        """Return server status."""
+        with self._stats_lock:
+            return {
+                "status": "ok",
+                "async": self.use_async,
+                "uptime": round(time.time() - self.started_at, 1),
+                "active_requests": self._active,
+                "requests_served": self._served,
+            }
+
+
+class AgentRequestHandler(BaseHTTPRequestHandler):
+    """Routes HTTP requests to the AgentServer."""
+
+    server: AgentServer
+    protocol_version = "HTTP/1.1"
+    server_version = "scm-agent"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.info("%s - %s", self.address_string(), format % args)
+
+    # ------------------------------------------------------------------ helpers
+
+    def _send_json(self, status: HTTPStatus, payload: dict) -> None:
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: HTTPStatus, message: str) -> None:
+        self._send_json(status, {"error": message})
+
+    def _reject(self, status: HTTPStatus, message: str) -> bool:
+        """
+        Refuse the request and close the connection.
+
+        Used for every error sent before the request body is read, so a leftover
+        body is never parsed as the next request on a kept-alive connection.
+        """
+        self.close_connection = True
+        self._send_error(status, message)
+        return False
+
+    def _check_request(self, route: str) -> bool:
+        """
+        Refuse requests that did not come from a local client holding the token.
+
+        Returns:
+            True if the request may proceed (otherwise the error is sent)
+        """
+        if self.headers.get("Host") not in self.server.allowed_hosts:
+            return self._reject(HTTPStatus.FORBIDDEN, "Host not allowed")
+        if self.headers.get("Origin") is not None:
+            return self._reject(
+                HTTPStatus.FORBIDDEN, "Cross-origin requests not allowed"
+            )
+        if route == "health":
+            return True
+        if not self.server.is_authorized(self.headers.get("Authorization")):
+            return self._reject(
+                HTTPStatus.UNAUTHORIZED, "Missing or invalid bearer token"
+            )
+        if self.command == "POST":
+            content_type = self.headers.get("Content-Type") or ""
+            if content_type.split(";", 1)[0].strip().lower() != "application/json":
+                return self._reject(
+                    HTTPStatus.UNSUPPORTED_MEDIA_TYPE,
+                    "Content-Type must be application/json",
+                )
+        return True
+
+    def _send_stream(self, events: Iterator[dict]) -> None:
+        """Send events as chunked NDJSON, one chunk per event."""
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for event in events:
+                self._write_chunk(event)
+        except Exception as e:
+            # Headers are gone; report the failure in-band
+            self._write_chunk(
+                {"event": "result", "status": "error", "error": _error_text(e)}
+            )
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _write_chunk(self, event: dict) -> None:
+        data = (json.dumps(event, ensure_ascii=False, default=str) + "\n").encode()
+        self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def _read_json(self) -> Any:
+        header = (self.headers.get("Content-Length") or "0").strip()
+        if not header.isdigit():
+            # Also rejects negative values, which would make read() block
+            raise RecordError(f"Invalid Content-Length: {header!r}")
+        length = int(header)
+        if length > MAX_BODY_BYTES:
+            raise RecordError(f"Request body larger than {MAX_BODY_BYTES} bytes")
+        raw = self.rfile.read(length) if length else b""
+        try:
+            return json.loads(raw or b"{}")
+        except json.JSONDecodeError as e:
+            raise RecordError(f"Invalid JSON: {e}") from e
+
+    def _route(self) -> tuple[str, Optional[str]]:
+        """
+        Match the request path.
+
+        Returns:
+            (route, thread_id) where route is "health", "messages", "thread",
+            "thread_messages" or "" for unknown paths
+        """
+        parts = [unquote(p) for p in self.path.split("?", 1)[0].strip("/").split("/")]
+        if parts == ["health"]:
+            return "health", None
+        if parts == ["v1", "messages"]:
+            return "messages", None
+        if len(parts) in (3, 4) and parts[:2] == ["v1", "threads"] and parts[2]:
+            if len(parts) == 3:
+                return "thread", parts[2]
+            if parts[3] == "messages":
+                return "thread_messages", parts[2]
+        return "", None
+
+    # ------------------------------------------------------------------ routes
+
+    def do_GET(self) -> None:
+        route, thread_id = self._route()
+        if not self._check_request(route):
+            return
+        if route == "health":
+            self._send_json(HTTPStatus.OK, self.server.health())
+            return
+        if route != "thread":
+            self._send_error(HTTPStatus.NOT_FOUND, f"Unknown path: {self.path}")
+            return
+
+        state = self.server.app.get_state({"configurable": {"thread_id": thread_id}})
+        messages = state.values.get("messages", []) if state.values else []
+        if not messages:
+            self._send_error(HTTPStatus.NOT_FOUND, f"Unknown thread: {thread_id}")
+            return
+        self._send_json(
+            HTTPStatus.OK,
+            {
+                "thread_id": thread_id,
+                "summary": state.values.get("summary", ""),
+                "messages": [message_to_dict(m) for m in messages],
+            },
+        )
+
+    def do_POST(self) -> None:
+        route, thread_id = self._route()
+        if not self._check_request(route):
+            return
+        if route == "messages":
+            thread_id = str(uuid7())
+        elif route != "thread_messages":
+            # The body is still unread, so the connection cannot be reused
+            self._reject(HTTPStatus.NOT_FOUND, f"Unknown path: {self.path}")
+            return
+
+        try:
+            body = self._read_json()
+            stream = isinstance(body, dict) and bool(body.pop("stream", False))
+            record = validate_record(body)
+        except RecordError as e:
+            # An oversized body is left unread; close rather than parse it as a request
+            self._reject(HTTPStatus.BAD_REQUEST, str(e))
+            return
+
+        events = self.server.run_turn(thread_id, record, stream=stream)
+        if stream:
+            self._send_stream(events)
+            return
+
+        try:
+            result = list(events)[-1]
+        except Exception as e:
+            logger.exception("Request on thread %s failed", thread_id)
+            self._send_json(
+                HTTPStatus.INTERNAL_SERVER_ERROR,
+                {"thread_id": thread_id, "status": "error", "error": _error_text(e)},
+            )
+            return
+        result.pop("event")
+        self._send_json(HTTPStatus.OK, result)
+
+    def do_DELETE(self) -> None:
+        route, thread_id = self._route()
+        if not self._check_request(route):
+            return
+        if route != "thread":
+            self._reject(HTTPStatus.NOT_FOUND, f"Unknown path: {self.path}")
+            return
+        self.server.delete_thread(thread_id)
+        self._send_json(HTTPStatus.OK, {"thread_id": thread_id, "deleted": True})
+
+
+def _error_text(error: BaseException) -> str:
+    """Format an exception the way tools report failures."""
+    return f"{type(error).__name__}: {error}"